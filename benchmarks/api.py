@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+#
+#  api.py
+"""
+Benchmark the methods of OctoAPI against a local server with large synthetic datasets.
+
+Years of half-hourly consumption, a year of half-hourly (Agile-style) unit rates
+and a catalogue of products with tariffs in all 14 regions are served by :class:`benchmarks.server.StubServer`.
+For each method the throughput in pages (requests) and objects per second is reported,
+along with the peak memory allocated while calling it and the time taken to import :mod:`octo_api`.
+
+Run with::
+
+	python3 -m benchmarks.api [--repeat N] [--only NAME] [--json FILE]
+
+Results written with ``--json`` can be compared between revisions to catch regressions.
+"""
+
+# stdlib
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+# this package
+from benchmarks.server import Dataset, StubServer, synthetic_postcode
+from octo_api.api import OctoAPI
+from octo_api.catalogue import ProductCatalogue
+from octo_api.utils import RateType, _parse_iso_zulu, _parse_iso_zulu_epoch
+
+#: A benchmark, which makes requests with the given client and returns the number of objects retrieved.
+Benchmark = Callable[[OctoAPI], int]
+
+_IMPORT_TIME = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+
+
+class Result(NamedTuple):
+	"""
+	The result of one benchmark.
+	"""
+
+	name: str
+	seconds: float
+	pages: int
+	objects: int
+	peak_memory: int
+
+	@property
+	def pages_per_second(self) -> float:
+		"""
+		The number of requests made per second.
+		"""
+
+		return self.pages / self.seconds
+
+	@property
+	def objects_per_second(self) -> float:
+		"""
+		The number of objects retrieved per second.
+		"""
+
+		return self.objects / self.seconds
+
+
+def benchmarks(dataset: Dataset, meters: int, lookups: int) -> Iterator[Tuple[str, Benchmark]]:
+	"""
+	Returns the benchmarks to run, as ``(name, function)`` pairs.
+
+	:param dataset: The data served by the server.
+	:param meters: The number of meters to retrieve consumption for in ``get_consumption_many``.
+	:param lookups: The number of meter points and postcodes to look up.
+	"""
+
+	def get_products(api: OctoAPI) -> int:
+		return sum(1 for _ in api.get_products())
+
+	def get_product_info(api: OctoAPI) -> int:
+		tariffs = 0
+		for code in dataset.product_codes:
+			product = api.get_product_info(code)
+			for regional_tariffs in (
+					product.single_register_electricity_tariffs,
+					product.dual_register_electricity_tariffs,
+					product.single_register_gas_tariffs,
+					):
+				tariffs += sum(map(len, regional_tariffs.values()))
+		return tariffs
+
+	def catalogue(api: OctoAPI) -> int:
+		product_catalogue = ProductCatalogue(api)
+		return sum(len(product_catalogue.tariffs_for_region(region)) for region in product_catalogue.regions)
+
+	def get_tariff_charges(page_size: int, **kwargs: Any) -> Benchmark:
+
+		def benchmark(api: OctoAPI) -> int:
+			rates = api.get_tariff_charges(
+					"AGILE-18-02-21",
+					"E-1R-AGILE-18-02-21-C",
+					fuel="electricity",
+					rate_type=RateType.StandardUnitRate,
+					page_size=page_size,
+					**kwargs,
+					)
+			return sum(1 for _ in rates)
+
+		return benchmark
+
+	def get_consumption(page_size: int, **kwargs: Any) -> Benchmark:
+
+		def benchmark(api: OctoAPI) -> int:
+			consumption = api.get_consumption(
+					"1000000000000",
+					"SYNTHETIC",
+					fuel="electricity",
+					page_size=page_size,
+					**kwargs,
+					)
+			return sum(1 for _ in consumption)
+
+		return benchmark
+
+	def get_consumption_many(api: OctoAPI) -> int:
+		meter_list = [(f"10000000{idx:05d}", "SYNTHETIC", "electricity") for idx in range(meters)]
+		results = list(api.get_consumption_many(meter_list, rows="tuple"))
+
+		for result in results:
+			if result.error is not None:
+				raise result.error
+
+		return sum(len(result.consumption) for result in results)  # type: ignore[arg-type]
+
+	def get_meter_point_details_many(api: OctoAPI) -> int:
+		mpans = [f"20000000{idx:05d}" for idx in range(lookups)]
+		return len(api.get_meter_point_details_many(mpans))
+
+	def get_grid_supply_points(api: OctoAPI) -> int:
+		return len(api.get_grid_supply_points(map(synthetic_postcode, range(lookups))))
+
+	yield "get_products", get_products
+	yield "get_product_info", get_product_info
+	yield "ProductCatalogue", catalogue
+	yield "get_tariff_charges", get_tariff_charges(1500)
+	yield "get_tariff_charges (4 workers)", get_tariff_charges(1500, max_workers=4)
+	yield "get_tariff_charges (tuples)", get_tariff_charges(1500, rows="tuple")
+	yield "get_consumption", get_consumption(25000)
+	yield "get_consumption (page size 100)", get_consumption(100)
+	yield "get_consumption (4 workers)", get_consumption(1000, max_workers=4)
+	yield "get_consumption (stream)", get_consumption(1000, stream=True)
+	yield "get_consumption_many", get_consumption_many
+	yield "get_meter_point_details_many", get_meter_point_details_many
+	yield "get_grid_supply_points", get_grid_supply_points
+
+
+def _clear_caches() -> None:
+	# Start each run with cold caches, as a fresh process would.
+	_parse_iso_zulu.cache_clear()
+	_parse_iso_zulu_epoch.cache_clear()
+
+
+def measure(name: str, benchmark: Benchmark, server: StubServer, repeat: int) -> Result:
+	"""
+	Returns the fastest of ``repeat`` runs of ``benchmark``, and the peak memory allocated by a further run.
+
+	Each run uses a new :class:`~octo_api.api.OctoAPI`, so nothing is cached between runs.
+
+	:param name:
+	:param benchmark:
+	:param server:
+	:param repeat:
+	"""
+
+	times = []
+	pages = objects = 0
+
+	# The first run serialises the responses on the server, and is not counted.
+	for run in range(repeat + 1):
+		_clear_caches()
+		with OctoAPI("token", base_url=server.base_url) as api:
+			requests = server.requests
+			gc.collect()
+			start = time.perf_counter()
+			objects = benchmark(api)
+			elapsed = time.perf_counter() - start
+			pages = server.requests - requests
+
+		if run:
+			times.append(elapsed)
+
+	_clear_caches()
+	with OctoAPI("token", base_url=server.base_url) as api:
+		gc.collect()
+		tracemalloc.start()
+		benchmark(api)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+
+	return Result(name, min(times), pages, objects, peak)
+
+
+def import_time(module: str, repeat: int) -> float:
+	"""
+	Returns the fastest time taken to import ``module`` in a new interpreter, in seconds.
+
+	:param module:
+	:param repeat:
+	"""
+
+	times = []
+
+	for _ in range(repeat):
+		process = subprocess.run(
+				[sys.executable, "-c", _IMPORT_TIME.format(module)],
+				check=True,
+				stdout=subprocess.PIPE,
+				universal_newlines=True,
+				)
+		times.append(float(process.stdout))
+
+	return min(times)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--repeat", type=int, default=3, help="The number of times to repeat each benchmark.")
+	parser.add_argument("--years", type=int, default=2, help="The number of years of consumption for each meter.")
+	parser.add_argument("--products", type=int, default=40, help="The number of products in the catalogue.")
+	parser.add_argument("--meters", type=int, default=8, help="The number of meters for get_consumption_many.")
+	parser.add_argument("--lookups", type=int, default=500, help="The number of meter points and postcodes.")
+	parser.add_argument("--only", help="Only run benchmarks whose names contain the given string.")
+	parser.add_argument("--json", help="Write the results to the given file as JSON.")
+	args = parser.parse_args()
+
+	dataset = Dataset(consumption_days=args.years * 365, products=args.products)
+	results: List[Result] = []
+
+	print(
+			f"{len(dataset.consumption):,} readings, {len(dataset.rates):,} unit rates, "
+			f"{len(dataset.product_codes)} products (best of {args.repeat})"
+			)
+	print(f"  {'':<32} {'time':>10}  {'pages/s':>10}  {'objects/s':>12}  {'peak':>9}")
+
+	with StubServer(dataset) as server:
+		for name, benchmark in benchmarks(dataset, args.meters, args.lookups):
+			if args.only and args.only not in name:
+				continue
+
+			result = measure(name, benchmark, server, args.repeat)
+			results.append(result)
+			print(
+					f"  {name:<32} {result.seconds * 1000:7.1f} ms  {result.pages_per_second:10,.0f}  "
+					f"{result.objects_per_second:12,.0f}  {result.peak_memory / 1024 / 1024:5.1f} MiB"
+					)
+
+	import_times: Dict[str, float] = {}
+	for module in ("octo_api", "octo_api.api", "octo_api.catalogue", "octo_api.costs"):
+		import_times[module] = import_time(module, args.repeat)
+		print(f"  import {module:<25} {import_times[module] * 1000:7.1f} ms")
+
+	if args.json:
+		output = {
+				"python": sys.version,
+				"results": [{
+						**result._asdict(),
+						"pages_per_second": result.pages_per_second,
+						"objects_per_second": result.objects_per_second,
+						} for result in results],
+				"import_times": import_times,
+				}
+
+		with open(args.json, 'w', encoding="UTF-8") as fp:
+			json.dump(output, fp, indent=2)
+
+
+if __name__ == "__main__":
+	main()
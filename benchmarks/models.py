@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+#  models.py
+"""
+Benchmark constructing model objects from pages of API results.
+
+Compares constructing each object with keyword arguments (running the attrs converters for every field)
+with the ``_from_rows`` constructors used by :class:`~octo_api.pagination.PaginatedResponse`.
+
+Run with::
+
+	python3 -m benchmarks.models [--rows N] [--repeat N]
+
+"""
+
+# stdlib
+import argparse
+import gc
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Type
+
+# this package
+from octo_api.consumption import Consumption
+from octo_api.products import Product, RateInfo
+from octo_api.utils import _parse_iso_zulu
+
+
+def _timestamps(count: int) -> List[str]:
+	start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+	return [(start + idx * timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%M:%SZ") for idx in range(count + 1)]
+
+
+def consumption_rows(count: int) -> List[Dict[str, Any]]:
+	timestamps = _timestamps(count)
+	return [{
+			"consumption": idx * 0.001,
+			"interval_start": timestamps[idx],
+			"interval_end": timestamps[idx + 1],
+			} for idx in range(count)]
+
+
+def rate_rows(count: int) -> List[Dict[str, Any]]:
+	timestamps = _timestamps(count)
+	return [{
+			"value_exc_vat": 10 + idx % 20,
+			"value_inc_vat": (10 + idx % 20) * 1.05,
+			"valid_from": timestamps[idx],
+			"valid_to": timestamps[idx + 1],
+			} for idx in range(count)]
+
+
+def product_rows(count: int) -> List[Dict[str, Any]]:
+	return [{
+			"code": f"VAR-{idx}",
+			"direction": "IMPORT",
+			"full_name": f"Product {idx}",
+			"display_name": f"Product {idx}",
+			"description": "A product",
+			"is_variable": True,
+			"is_green": False,
+			"is_tracker": False,
+			"is_prepay": False,
+			"is_business": False,
+			"is_restricted": False,
+			"term": 12,
+			"available_from": "2017-01-01T00:00:00Z",
+			"available_to": None,
+			"brand": "OCTOPUS_ENERGY",
+			"links": [{"href": f"https://api.octopus.energy/v1/products/VAR-{idx}/", "method": "GET", "rel": "self"}],
+			} for idx in range(count)]
+
+
+def keyword_arguments(obj_type: Type, rows: List[Dict[str, Any]]) -> List[Any]:
+	return [obj_type(**row) for row in rows]
+
+
+def from_rows(obj_type: Type, rows: List[Dict[str, Any]]) -> List[Any]:
+	return obj_type._from_rows(rows)
+
+
+def best_of(
+		func: Callable[[Type, List[Dict[str, Any]]], List[Any]],
+		obj_type: Type,
+		rows: List[Dict[str, Any]],
+		repeat: int,
+		cold: bool,
+		) -> float:
+	times = []
+
+	for _ in range(repeat):
+		if cold:
+			_parse_iso_zulu.cache_clear()
+		else:
+			func(obj_type, rows)
+
+		# As with timeit, garbage collection is disabled while timing.
+		gc.disable()
+		start = time.perf_counter()
+		func(obj_type, rows)
+		times.append(time.perf_counter() - start)
+		gc.enable()
+
+	return min(times)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--rows", type=int, default=25000, help="The number of rows in each page.")
+	parser.add_argument("--repeat", type=int, default=5, help="The number of times to repeat each benchmark.")
+	args = parser.parse_args()
+
+	print(f"Constructing {args.rows:,} objects (best of {args.repeat})")
+
+	for obj_type, rows in [
+			(Consumption, consumption_rows(args.rows)),
+			(RateInfo, rate_rows(args.rows)),
+			(Product, product_rows(args.rows)),
+			]:
+		assert from_rows(obj_type, rows) == keyword_arguments(obj_type, rows)
+
+		# A cold timestamp cache corresponds to the first page seen by a process,
+		# and a warm one to subsequent pages (or meters) covering the same periods.
+		for cold in (True, False):
+			baseline = best_of(keyword_arguments, obj_type, rows, args.repeat, cold)
+			fast = best_of(from_rows, obj_type, rows, args.repeat, cold)
+			print(
+					f"  {obj_type.__name__:<12} {'cold' if cold else 'warm'}  "
+					f"{baseline / len(rows) * 1e9:7.0f} ns/object -> {fast / len(rows) * 1e9:7.0f} ns/object  "
+					f"{baseline / fast:5.1f}x"
+					)
+
+
+if __name__ == "__main__":
+	main()
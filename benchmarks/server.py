@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+#
+#  server.py
+"""
+A local stand-in for the Octopus Energy API, serving large synthetic datasets.
+
+The data is generated up front and each page is serialised the first time it is requested,
+so the time taken by the server is small compared to that taken by the client.
+
+Only the endpoints used by :class:`~octo_api.api.OctoAPI` are implemented,
+and query parameters other than ``page``, ``page_size`` and ``postcode`` are ignored.
+"""
+
+# stdlib
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# this package
+from octo_api.utils import Region
+
+__all__ = ["Dataset", "StubServer"]
+
+#: The GSP region codes, without the aliases.
+REGIONS: List[str] = sorted({str(region) for region in Region})
+
+PAYMENT_METHODS: Tuple[str, ...] = ("direct_debit_monthly", "direct_debit_quarterly")
+
+HALF_HOUR = timedelta(minutes=30)
+
+# Large enough that every benchmark asking for the API's maximum page size gets it.
+MAX_PAGE_SIZE = 25000
+
+
+def _zulu(value: datetime) -> str:
+	return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def half_hours(end: datetime, count: int) -> List[str]:
+	"""
+	Returns the ``count + 1`` boundaries of ``count`` consecutive half hours ending at ``end``, most recent first.
+	"""
+
+	return [_zulu(end - idx * HALF_HOUR) for idx in range(count + 1)]
+
+
+def consumption_results(count: int, end: datetime) -> List[Dict[str, Any]]:
+	"""
+	Returns ``count`` half-hourly consumption readings ending at ``end``, most recent first.
+	"""
+
+	boundaries = half_hours(end, count)
+	return [{
+			"consumption": round((idx % 48) * 0.013 + 0.05, 3),
+			"interval_start": boundaries[idx + 1],
+			"interval_end": boundaries[idx],
+			} for idx in range(count)]
+
+
+def rate_results(count: int, end: datetime) -> List[Dict[str, Any]]:
+	"""
+	Returns ``count`` half-hourly (Agile-style) unit rates ending at ``end``, most recent first.
+	"""
+
+	boundaries = half_hours(end, count)
+	results = []
+
+	for idx in range(count):
+		value_exc_vat = round(5 + (idx * 7919 % 3000) / 100, 2)
+		results.append({
+				"value_exc_vat": value_exc_vat,
+				"value_inc_vat": round(value_exc_vat * 1.05, 4),
+				"valid_from": boundaries[idx + 1],
+				"valid_to": boundaries[idx],
+				})
+
+	return results
+
+
+def _tariff(base_url: str, product_code: str, prefix: str, fuel: str, gsp: str, rates: List[str]) -> Dict[str, Any]:
+	tariff_code = f"{prefix}-{product_code}-{gsp[1]}"
+	tariff_url = f"{base_url}/products/{product_code}/{fuel}-tariffs/{tariff_code}"
+
+	tariff: Dict[str, Any] = {
+			"code": tariff_code,
+			"standing_charge_exc_vat": 20.0,
+			"standing_charge_inc_vat": 21.0,
+			"online_discount_exc_vat": 0,
+			"online_discount_inc_vat": 0,
+			"dual_fuel_discount_exc_vat": 0,
+			"dual_fuel_discount_inc_vat": 0,
+			"exit_fees_exc_vat": 0,
+			"exit_fees_inc_vat": 0,
+			"links": [{"href": f"{tariff_url}/standing-charges/", "method": "GET", "rel": "standing_charges"}],
+			}
+
+	for rate in rates:
+		tariff["links"].append({"href": f"{tariff_url}/{rate.replace('_', '-')}s/", "method": "GET", "rel": f"{rate}s"})
+		tariff[f"{rate}_exc_vat"] = 15.0
+		tariff[f"{rate}_inc_vat"] = 15.75
+
+	return tariff
+
+
+def product_row(base_url: str, product_code: str) -> Dict[str, Any]:
+	"""
+	Returns the summary of a product, as listed by the ``/products/`` endpoint.
+	"""
+
+	return {
+			"code": product_code,
+			"direction": "IMPORT",
+			"full_name": f"Synthetic Octopus {product_code}",
+			"display_name": "Synthetic Octopus",
+			"description": "A synthetic product for benchmarking.",
+			"is_variable": True,
+			"is_green": False,
+			"is_tracker": False,
+			"is_prepay": False,
+			"is_business": False,
+			"is_restricted": False,
+			"term": 12,
+			"available_from": "2017-01-11T10:00:00Z",
+			"available_to": None,
+			"brand": "OCTOPUS_ENERGY",
+			"links": [{"href": f"{base_url}/products/{product_code}/", "method": "GET", "rel": "self"}],
+			}
+
+
+def product_detail(base_url: str, product_code: str) -> Dict[str, Any]:
+	"""
+	Returns the details of a product, with tariffs for every region and payment method.
+	"""
+
+	detail = product_row(base_url, product_code)
+	del detail["direction"]
+	detail["tariffs_active_at"] = "2021-01-01T00:00:00Z"
+
+	for key, prefix, fuel, rates in [
+			("single_register_electricity_tariffs", "E-1R", "electricity", ["standard_unit_rate"]),
+			("dual_register_electricity_tariffs", "E-2R", "electricity", ["day_unit_rate", "night_unit_rate"]),
+			("single_register_gas_tariffs", "G-1R", "gas", ["standard_unit_rate"]),
+			]:
+		detail[key] = {
+				gsp: {method: _tariff(base_url, product_code, prefix, fuel, gsp, rates) for method in PAYMENT_METHODS}
+				for gsp in REGIONS
+				}
+
+	quote = {"annual_cost_inc_vat": 52080, "annual_cost_exc_vat": 49600}
+	detail["sample_quotes"] = {
+			gsp: {
+					method: {
+							"electricity_single_rate": quote,
+							"electricity_dual_rate": quote,
+							"dual_fuel_single_rate": quote,
+							"dual_fuel_dual_rate": quote,
+							}
+					for method in PAYMENT_METHODS
+					}
+			for gsp in REGIONS
+			}
+	detail["sample_consumption"] = {
+			"electricity_single_rate": {"electricity_standard": 2900},
+			"electricity_dual_rate": {"electricity_day": 2436, "electricity_night": 1764},
+			"dual_fuel_single_rate": {"electricity_standard": 2900, "gas_standard": 12000},
+			"dual_fuel_dual_rate": {"electricity_day": 2436, "electricity_night": 1764, "gas_standard": 12000},
+			}
+
+	return detail
+
+
+def synthetic_postcode(idx: int) -> str:
+	"""
+	Returns a synthetic postcode, with 20 postcodes sharing each outward code.
+	"""
+
+	outward, inward = divmod(idx, 20)
+	return f"B{outward % 100}{chr(ord('A') + outward // 100 % 26)} {inward % 10}AA"
+
+
+class Dataset:
+	"""
+	The synthetic data served by a :class:`~.StubServer`.
+
+	:param consumption_days: The number of days of half-hourly consumption for each meter.
+	:param rate_days: The number of days of half-hourly unit rates for each tariff.
+	:param products: The number of products in the catalogue.
+	"""
+
+	#: The time the consumption and rates end at.
+	end: datetime = datetime(2021, 1, 1, tzinfo=timezone.utc)
+
+	def __init__(self, consumption_days: int = 730, rate_days: int = 365, products: int = 40):
+		self.consumption: List[Dict[str, Any]] = consumption_results(consumption_days * 48, self.end)
+		self.rates: List[Dict[str, Any]] = rate_results(rate_days * 48, self.end)
+		self.product_codes: List[str] = [f"SYN-{idx:02d}-01-01" for idx in range(products)]
+
+	def gsp_for(self, postcode: str) -> str:
+		"""
+		Returns the GSP region of a synthetic postcode.
+		"""
+
+		return REGIONS[sum(map(ord, postcode.partition(' ')[0])) % len(REGIONS)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+	server: "StubServer"
+	protocol_version = "HTTP/1.1"
+
+	# Otherwise the body of each response waits for the client to acknowledge the headers.
+	disable_nagle_algorithm = True
+
+	def do_GET(self) -> None:  # noqa: N802
+		url = urlsplit(self.path)
+		query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+		body = self.server.respond(url.path, query)
+
+		if body is None:
+			self._send(404, b'{"detail": "Not found."}')
+		else:
+			self._send(200, body)
+
+	def _send(self, status: int, body: bytes) -> None:
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format: str, *args: Any) -> None:  # noqa: A002  # pylint: disable=redefined-builtin
+		pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+	"""
+	Serves a :class:`~.Dataset` over HTTP on ``localhost``, from a background thread.
+
+	:param dataset:
+
+	The server can be used as a context manager, which starts it on entry and shuts it down on exit.
+	"""
+
+	daemon_threads = True
+
+	def __init__(self, dataset: Dataset):
+		super().__init__(("127.0.0.1", 0), _Handler)
+
+		#: The data served by the server.
+		self.dataset: Dataset = dataset
+
+		#: The number of requests handled, including those which returned a 404.
+		self.requests: int = 0
+
+		self._lock = threading.Lock()
+		self._bodies: Dict[Tuple[str, str], bytes] = {}
+		self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+	@property
+	def base_url(self) -> str:
+		"""
+		The URL to pass as the ``base_url`` of :class:`~octo_api.api.OctoAPI`.
+		"""
+
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}/v1"
+
+	def respond(self, path: str, query: Dict[str, str]) -> Optional[bytes]:
+		"""
+		Returns the body of the response to a request, or :py:obj:`None` if the path is not found.
+
+		:param path: The path of the request, e.g. ``/v1/products/``.
+		:param query: The query parameters of the request.
+		"""
+
+		with self._lock:
+			self.requests += 1
+
+		parts = path.strip('/').split('/')[1:]
+		key = (path, json.dumps(query, sort_keys=True))
+
+		body = self._bodies.get(key)
+		if body is None:
+			data = self._route(parts, query)
+			if data is None:
+				return None
+
+			body = json.dumps(data).encode("UTF-8")
+			self._bodies[key] = body
+
+		return body
+
+	def _route(self, parts: List[str], query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+		dataset = self.dataset
+
+		if parts == ["products"]:
+			rows = [product_row(self.base_url, code) for code in dataset.product_codes]
+			return self._page(rows, query, default_page_size=100)
+
+		elif len(parts) == 2 and parts[0] == "products" and parts[1] in dataset.product_codes:
+			return product_detail(self.base_url, parts[1])
+
+		elif len(parts) == 5 and parts[0] == "products" and parts[4].endswith("unit-rates"):
+			return self._page(dataset.rates, query, default_page_size=100)
+
+		elif len(parts) == 5 and parts[0].endswith("-meter-points") and parts[4] == "consumption":
+			return self._page(dataset.consumption, query, default_page_size=100)
+
+		elif len(parts) == 2 and parts[0] == "electricity-meter-points":
+			mpan = parts[1]
+			return {"gsp": REGIONS[int(mpan) % len(REGIONS)], "mpan": mpan, "profile_class": 1}
+
+		elif parts == ["industry", "grid-supply-points"]:
+			results = [{"group_id": dataset.gsp_for(query.get("postcode", ''))}]
+			return {"count": 1, "next": None, "previous": None, "results": results}
+
+		return None
+
+	def _page(self, rows: List[Dict[str, Any]], query: Dict[str, str], default_page_size: int) -> Dict[str, Any]:
+		page_size = min(int(query.get("page_size", default_page_size)), MAX_PAGE_SIZE)
+		page = int(query.get("page", 1))
+		start = (page - 1) * page_size
+
+		return {
+				"count": len(rows),
+				"next": f"{self.base_url}/?page={page + 1}" if start + page_size < len(rows) else None,
+				"previous": f"{self.base_url}/?page={page - 1}" if page > 1 else None,
+				"results": rows[start:start + page_size],
+				}
+
+	def __enter__(self) -> "StubServer":
+		self._thread.start()
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		self.shutdown()
+		self.server_close()
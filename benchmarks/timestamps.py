@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+#  timestamps.py
+"""
+Benchmark the parsing of the timestamps in half-hourly consumption data.
+
+Compares the original ``datetime.fromisoformat(value.replace('Z', "+00:00"))`` implementation
+of :func:`octo_api.utils.from_iso_zulu` with the current (memoised) implementation
+and with :func:`octo_api.utils.parse_iso_zulu_batch`.
+The memoised implementation mainly saves memory, by sharing repeated timestamps;
+:func:`~octo_api.utils.parse_iso_zulu_batch` is the faster way to parse a page of results.
+
+Run with::
+
+	python3 -m benchmarks.timestamps [--meters N] [--repeat N]
+
+"""
+
+# stdlib
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Tuple
+
+# this package
+from octo_api.utils import _parse_iso_zulu, _parse_iso_zulu_epoch, from_iso_zulu, parse_iso_zulu_batch
+
+
+def half_hourly_timestamps(meters: int) -> List[str]:
+	"""
+	Returns the ``interval_start`` and ``interval_end`` strings for a year of half-hourly readings for ``meters`` meters.
+	"""
+
+	start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+	half_hour = timedelta(minutes=30)
+	boundaries = [(start + idx * half_hour).strftime("%Y-%m-%dT%H:%M:%SZ") for idx in range(17521)]
+
+	timestamps = []
+	for _ in range(meters):
+		for interval_start, interval_end in zip(boundaries, boundaries[1:]):
+			timestamps.append(interval_start)
+			timestamps.append(interval_end)
+
+	return timestamps
+
+
+def original(timestamps: List[str]) -> List[datetime]:
+	return [datetime.fromisoformat(timestamp.replace('Z', "+00:00")) for timestamp in timestamps]
+
+
+def original_epoch(timestamps: List[str]) -> List[float]:
+	return [datetime.fromisoformat(timestamp.replace('Z', "+00:00")).timestamp() for timestamp in timestamps]
+
+
+def memoised(timestamps: List[str]) -> List[Optional[datetime]]:
+	return [from_iso_zulu(timestamp) for timestamp in timestamps]
+
+
+def batch(timestamps: List[str]) -> List[Optional[datetime]]:
+	return parse_iso_zulu_batch(timestamps)
+
+
+def batch_epoch(timestamps: List[str]) -> List[Optional[float]]:
+	return parse_iso_zulu_batch(timestamps, epoch=True)
+
+
+def measure(func: Callable[[List[str]], List[Any]], timestamps: List[str], repeat: int) -> Tuple[float, int]:
+	"""
+	Returns the fastest of ``repeat`` runs of ``func``, in seconds, and the peak memory used by it, in bytes.
+	"""
+
+	times = []
+
+	for _ in range(repeat):
+		# Start each run with a cold cache, as a fresh process would.
+		_parse_iso_zulu.cache_clear()
+		_parse_iso_zulu_epoch.cache_clear()
+		start = time.perf_counter()
+		func(timestamps)
+		times.append(time.perf_counter() - start)
+
+	_parse_iso_zulu.cache_clear()
+	_parse_iso_zulu_epoch.cache_clear()
+	tracemalloc.start()
+	func(timestamps)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return min(times), peak
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--meters", type=int, default=4, help="The number of meters' worth of data to parse.")
+	parser.add_argument("--repeat", type=int, default=5, help="The number of times to repeat each benchmark.")
+	args = parser.parse_args()
+
+	timestamps = half_hourly_timestamps(args.meters)
+	print(f"Parsing {len(timestamps):,} timestamps (best of {args.repeat})")
+
+	for baseline_func, funcs in [
+			(original, [memoised, batch]),
+			(original_epoch, [batch_epoch]),
+			]:
+		baseline, _ = measure(baseline_func, timestamps, args.repeat)
+
+		for func in [baseline_func, *funcs]:
+			elapsed, peak = measure(func, timestamps, args.repeat)
+			rate = len(timestamps) / elapsed
+			print(
+					f"  {func.__name__:<16} {elapsed * 1000:8.1f} ms  {rate:12,.0f} /s  "
+					f"{baseline / elapsed:5.1f}x  {peak / 1024 / 1024:7.1f} MiB peak"
+					)
+
+
+if __name__ == "__main__":
+	main()
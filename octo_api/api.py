@@ -34,40 +34,135 @@ The primary interface to the Octopus Energy API.
 #
 
 # stdlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, MutableMapping, Optional, Union
+from types import TracebackType
+from typing import (
+		Any,
+		Callable,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		MutableMapping,
+		Optional,
+		Set,
+		Tuple,
+		Type,
+		TypeVar,
+		Union,
+		overload
+		)
 
 # 3rd party
-from apeye.slumber_url import SlumberURL
+from apeye.slumber_url import HttpNotFoundError
 from domdf_python_tools.secrets import Secret
 from typing_extensions import Literal
 
 # this package
-from octo_api.consumption import Consumption
+from octo_api.cache import ResponseCache, TTLCache
+from octo_api.consumption import Consumption, ConsumptionResult, ConsumptionRow, Meter
+from octo_api.decoders import Decoder, get_decoder
+from octo_api.gsp import GSPCache, normalise_postcode
 from octo_api.pagination import PaginatedResponse
-from octo_api.products import DetailedProduct, Product, RateInfo
-from octo_api.utils import MeterPointDetails, RateType, Region
+from octo_api.products import DetailedProduct, Product, RateInfo, RateInfoRow
+from octo_api.ratelimit import RateLimiter
+from octo_api.session import OctoSession, OctoURL
+from octo_api.utils import MeterPointDetails, RateType, Region, TariffCode
 
 __all__ = ["OctoAPI"]
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 class OctoAPI:
 	"""
 	The primary interface to the Octopus Energy API.
 
 	:param api_key: API key to access the Octopus Energy API.
+	:param base_url: The base URL of the Octopus Energy API.
+	:param pool_connections: The number of hosts to keep connection pools for.
+	:param pool_maxsize: The maximum number of connections to keep open to each host.
+		This should be at least as large as the ``max_workers`` used for fetching pages concurrently.
+	:param timeout: How long to wait for the server to send data before giving up, in seconds.
+		May also be a ``(connect timeout, read timeout)`` tuple.
+	:param cache: An optional on-disk cache to serve infrequently changing responses,
+		such as product details, from.
+	:param rate_limiter: An optional rate limiter shared by every request to the API,
+		which also retries throttled requests and transient errors.
+	:param gsp_cache: An optional cache of the grid supply points of postcodes,
+		used by :meth:`~.OctoAPI.get_grid_supply_point`.
+	:param meter_point_cache: An optional cache of meter-point details,
+		used by :meth:`~.OctoAPI.get_meter_point_details`.
+	:param decoder: The decoder for JSON responses. See :func:`~octo_api.decoders.get_decoder`.
 
 	If you are an Octopus Energy customer, you can generate an API key from your
 	`online dashboard <https://octopus.energy/dashboard/developer/>`_.
+
+	Every endpoint (and every page of a :class:`~octo_api.pagination.PaginatedResponse`) is requested
+	through a single :class:`~octo_api.session.OctoSession`, which keeps connections to the API alive between requests.
+	The session can be closed with :meth:`~.OctoAPI.close`, or by using the :class:`~.OctoAPI` as a context manager.
 	"""
 
-	def __init__(self, api_key: str):
+	def __init__(
+			self,
+			api_key: str,
+			*,
+			base_url: str = "https://api.octopus.energy/v1",
+			pool_connections: int = 10,
+			pool_maxsize: int = 10,
+			timeout: Union[None, float, Tuple[float, float]] = None,
+			cache: Optional[ResponseCache] = None,
+			rate_limiter: Optional[RateLimiter] = None,
+			gsp_cache: Optional[GSPCache] = None,
+			meter_point_cache: Optional[TTLCache[str, MeterPointDetails]] = None,
+			decoder: Union[str, Decoder] = "json",
+			):
 
 		#: The API key to access the Octopus Energy API.
 		self.API_KEY: Secret = Secret(api_key)
 
+		#: The HTTP session shared by every request to the API.
+		self.session: OctoSession = OctoSession(
+				pool_connections=pool_connections,
+				pool_maxsize=pool_maxsize,
+				cache=cache,
+				rate_limiter=rate_limiter,
+				)
+
 		#: The base URL of the Octopus Energy API.
-		self.API_BASE: SlumberURL = SlumberURL("https://api.octopus.energy/v1", auth=(self.API_KEY.value, ''))
+		self.API_BASE: OctoURL = OctoURL(
+				base_url,
+				auth=(self.API_KEY.value, ''),
+				session=self.session,
+				timeout=timeout,
+				decoder=get_decoder(decoder),
+				)
+
+		#: The cache of the grid supply points of postcodes, if any.
+		self.gsp_cache: Optional[GSPCache] = gsp_cache
+
+		#: The cache of meter-point details, if any.
+		self.meter_point_cache: Optional[TTLCache[str, MeterPointDetails]] = meter_point_cache
+
+	def close(self) -> None:
+		"""
+		Close the underlying HTTP session and its connections.
+		"""
+
+		self.session.close()
+
+	def __enter__(self) -> "OctoAPI":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.close()
 
 	def get_products(
 			self,
@@ -127,19 +222,7 @@ class OctoAPI:
 
 		"""
 
-		parameters: Dict[str, Any] = {}
-
-		if is_variable is not None:
-			parameters["is_variable"] = is_variable
-		if is_green is not None:
-			parameters["is_green"] = is_green
-		if is_tracker is not None:
-			parameters["is_tracker"] = is_tracker
-		if is_prepay is not None:
-			parameters["is_prepay"] = is_prepay
-		parameters["is_business"] = is_business
-		if available_at is not None:
-			parameters["available_at"] = available_at.isoformat()
+		parameters = _products_parameters(is_variable, is_green, is_tracker, is_prepay, is_business, available_at)
 
 		query_url = self.API_BASE / "products"
 		return PaginatedResponse(query_url, parameters, obj_type=Product)
@@ -212,24 +295,71 @@ class OctoAPI:
 			)
 		"""
 
-		parameters = {}
-
-		if tariffs_active_at is not None:
-			parameters["tariffs_active_at"] = tariffs_active_at.isoformat()
+		parameters = _product_info_parameters(tariffs_active_at)
 
 		query_url = self.API_BASE / "products" / product_code
 		return DetailedProduct(**query_url.get(**parameters))
 
+	@overload
+	def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			rows: Literal["object"] = ...,
+			) -> PaginatedResponse[RateInfo]: ...
+
+	@overload
+	def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			*,
+			rows: Literal["tuple"],
+			) -> PaginatedResponse[RateInfoRow]: ...
+
+	@overload
+	def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			*,
+			rows: Literal["dict"],
+			) -> PaginatedResponse[Dict[str, Any]]: ...
+
 	def get_tariff_charges(
 			self,
 			product_code: str,
-			tariff_code: str,
+			tariff_code: Union[str, TariffCode],
 			fuel: Literal["electricity", "gas"],
 			rate_type: RateType,
 			period_from: Optional[datetime] = None,
 			period_to: Optional[datetime] = None,
 			page_size: int = 100,
-			) -> PaginatedResponse[RateInfo]:
+			max_workers: Optional[int] = None,
+			stream: bool = False,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> PaginatedResponse[Any]:
 		"""
 		Returns a list of time periods and their associated unit rates charges.
 
@@ -237,10 +367,7 @@ class OctoAPI:
 
 		:param product_code: The code of the product to be retrieved, for example ``VAR-17-01-11``.
 		:param tariff_code: The code of the tariff to be retrieved, for example ``E-1R-VAR-17-01-11-A``.
-			From what I can tell the format is::
-
-				<E for electricity><optional hyphen><1R for single rate?><the product code>-<the grid supply point>
-
+			Tariff codes can be parsed and constructed offline with :class:`~octo_api.utils.TariffCode`.
 		:param fuel:
 		:param rate_type:
 		:param period_from: Show charges active from the given datetime (inclusive).
@@ -250,6 +377,17 @@ class OctoAPI:
 		:param page_size: Page size of returned results.
 			Default is ``100``, maximum is ``1,500`` to give up to a month of half-hourly prices.
 		:no-default page_size:
+		:param max_workers: The maximum number of pages to fetch concurrently when iterating over the results.
+			By default the pages are fetched one after another.
+		:no-default max_workers:
+		:param stream: If :py:obj:`True`, pages fetched while iterating over the results are discarded
+			once their items have been yielded, keeping memory usage bounded for large responses.
+		:no-default stream:
+		:param rows: The representation of each time period in the results.
+			``'object'`` gives :class:`~octo_api.products.RateInfo` objects,
+			``'tuple'`` the more lightweight :class:`~octo_api.products.RateInfoRow`,
+			and ``'dict'`` the raw data returned by the API.
+		:no-default rows:
 
 		.. https://developer.octopus.energy/docs/api/#list-tariff-charges
 
@@ -262,20 +400,16 @@ class OctoAPI:
 			Hence, if you query today's unit rates before 4pm, you'll get 46 results back rather than 48.
 		"""
 
-		parameters: MutableMapping[str, Union[str, int]] = {}
-
-		if period_from is not None:
-			parameters["period_from"] = period_from.isoformat()
-		if period_to is not None:
-			parameters["period_to"] = period_to.isoformat()
-
-		if page_size > 1500:
-			raise ValueError("'page_size' may not be greater than 1,500")
-
-		parameters["page_size"] = int(page_size)
+		parameters = _tariff_charges_parameters(period_from, period_to, page_size)
 
-		query_url = self.API_BASE / "products" / product_code / f"{fuel}-tariffs" / tariff_code / str(rate_type)
-		return PaginatedResponse(query_url, query_params=parameters, obj_type=RateInfo)
+		query_url = self.API_BASE / "products" / product_code / f"{fuel}-tariffs" / str(tariff_code) / str(rate_type)
+		return PaginatedResponse(
+				query_url,
+				query_params=parameters,
+				obj_type=_row_type(rows, RateInfo, RateInfoRow),
+				max_workers=max_workers,
+				stream=stream,
+				)
 
 	def get_meter_point_details(self, mpan: str) -> MeterPointDetails:
 		"""
@@ -286,9 +420,54 @@ class OctoAPI:
 		:param mpan: The electricity meter-point's MPAN.
 
 		:return:
+
+		If the :class:`~.OctoAPI` has a :attr:`~.OctoAPI.meter_point_cache` the details are cached.
+		"""
+
+		if self.meter_point_cache is not None:
+			details = self.meter_point_cache.get(mpan)
+			if details is not None:
+				return details
+
+		details = MeterPointDetails._from_dict((self.API_BASE / "electricity-meter-points" / mpan).get())
+
+		if self.meter_point_cache is not None:
+			self.meter_point_cache.set(mpan, details)
+
+		return details
+
+	def get_meter_point_details_many(
+			self,
+			mpans: Iterable[str],
+			max_workers: int = 8,
+			) -> Dict[str, Optional[MeterPointDetails]]:
+		"""
+		Retrieve the details of many meter-points, fetching them concurrently.
+
+		Each MPAN is only requested once, however many times it is given,
+		and MPANs in the :attr:`~.OctoAPI.meter_point_cache` are not requested at all.
+
+		:param mpans: The electricity meter-points' MPANs.
+		:param max_workers: The maximum number of meter-points to fetch at once.
+
+		:returns: A mapping of each MPAN to its details, or to :py:obj:`None` if the meter-point was not found.
 		"""
 
-		return MeterPointDetails._from_dict((self.API_BASE / "electricity-meter-points" / mpan).get())
+		def fetch(mpan: str) -> Tuple[str, Optional[MeterPointDetails]]:
+			try:
+				return mpan, self.get_meter_point_details(mpan)
+			except HttpNotFoundError:
+				return mpan, None
+
+		details: Dict[str, Optional[MeterPointDetails]] = dict.fromkeys(mpans)
+		cache = self.meter_point_cache
+
+		if cache is not None:
+			for mpan in details:
+				details[mpan] = cache.get(mpan)
+
+		details.update(_as_completed(fetch, [mpan for mpan, value in details.items() if value is None], max_workers))
+		return details
 
 	def get_grid_supply_point(self, postcode: str) -> Region:
 		"""
@@ -297,15 +476,106 @@ class OctoAPI:
 		:param postcode:
 
 		:raises: :exc:`ValueError` if the postcode cannot be mapped to a GSP.
+
+		If the :class:`~.OctoAPI` has a :attr:`~.OctoAPI.gsp_cache` the postcode is normalised,
+		and the result (including a failure to map the postcode) is cached.
 		"""
 
+		if self.gsp_cache is None:
+			return self._get_grid_supply_point(postcode)
+
+		postcode = normalise_postcode(postcode)
+		region = self.gsp_cache.get(postcode)
+		if region is not None:
+			return region
+
+		try:
+			region = self._get_grid_supply_point(postcode)
+		except ValueError:
+			self.gsp_cache.set(postcode, None)
+			raise
+
+		self.gsp_cache.set(postcode, region)
+		return region
+
+	def _get_grid_supply_point(self, postcode: str) -> Region:
 		query_url = self.API_BASE / "industry" / "grid-supply-points"
+		return _grid_supply_point(postcode, query_url.get(postcode=postcode)["results"])
+
+	def get_grid_supply_points(self, postcodes: Iterable[str], max_workers: int = 8) -> Dict[str, Optional[Region]]:
+		"""
+		Returns the grid supply points for many postcodes, looking them up concurrently.
+
+		Postcodes which normalise to the same value, such as ``SW1A 1AA`` and ``sw1a1aa``, are only looked up once.
+
+		:param postcodes:
+		:param max_workers: The maximum number of postcodes to look up at once.
+
+		:returns: A mapping of each of the given postcodes to its grid supply point,
+			or to :py:obj:`None` if it cannot be mapped to one.
+		"""
+
+		postcodes = list(postcodes)
+		unique = list(dict.fromkeys(map(normalise_postcode, postcodes)))
 
-		results = query_url.get(postcode=postcode)["results"]
-		if results:
-			return Region(results[0]["group_id"])
-		else:
-			raise ValueError(f"Cannot map the postcode {postcode!r} to a GSP.")
+		def lookup(postcode: str) -> Tuple[str, Optional[Region]]:
+			try:
+				return postcode, self.get_grid_supply_point(postcode)
+			except ValueError:
+				return postcode, None
+
+		regions = dict(_as_completed(lookup, unique, max_workers))
+		return {postcode: regions[normalise_postcode(postcode)] for postcode in postcodes}
+
+	@overload
+	def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			rows: Literal["object"] = ...,
+			) -> PaginatedResponse[Consumption]: ...
+
+	@overload
+	def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			*,
+			rows: Literal["tuple"],
+			) -> PaginatedResponse[ConsumptionRow]: ...
+
+	@overload
+	def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: Optional[int] = ...,
+			stream: bool = ...,
+			*,
+			rows: Literal["dict"],
+			) -> PaginatedResponse[Dict[str, Any]]: ...
 
 	def get_consumption(
 			self,
@@ -317,7 +587,10 @@ class OctoAPI:
 			page_size: int = 100,
 			reverse: bool = False,
 			group_by: Optional[str] = None,
-			) -> PaginatedResponse[Consumption]:
+			max_workers: Optional[int] = None,
+			stream: bool = False,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> PaginatedResponse[Any]:
 		r"""
 		Return a list of consumption values for half-hour periods for a given meter-point and meter.
 
@@ -355,24 +628,248 @@ class OctoAPI:
 			* ``'month'``
 			* ``'quarter'``
 		:no-default group_by:
+		:param max_workers: The maximum number of pages to fetch concurrently when iterating over the results.
+			By default the pages are fetched one after another.
+		:no-default max_workers:
+		:param stream: If :py:obj:`True`, pages fetched while iterating over the results are discarded
+			once their items have been yielded, keeping memory usage bounded for large responses.
+		:no-default stream:
+		:param rows: The representation of each half-hour period in the results.
+			``'object'`` gives :class:`~octo_api.consumption.Consumption` objects,
+			``'tuple'`` the more lightweight :class:`~octo_api.consumption.ConsumptionRow`,
+			and ``'dict'`` the raw data returned by the API.
+		:no-default rows:
+		"""
+
+		parameters = _consumption_parameters(period_from, period_to, page_size, reverse, group_by)
+
+		query_url = self.API_BASE / f"{fuel}-meter-points" / mpan / "meters" / serial_number / "consumption"
+		return PaginatedResponse(
+				query_url,
+				query_params=parameters,
+				obj_type=_row_type(rows, Consumption, ConsumptionRow),
+				max_workers=max_workers,
+				stream=stream,
+				)
+
+	def get_consumption_many(
+			self,
+			meters: Iterable[Union[Meter, Tuple[str, str, Literal["electricity", "gas"]]]],
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			page_size: int = 25000,
+			reverse: bool = False,
+			group_by: Optional[str] = None,
+			max_workers: int = 8,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> Iterator[ConsumptionResult]:
 		"""
+		Retrieve the consumption for many meters concurrently,
+		yielding the results for each meter as soon as they have been retrieved.
 
-		parameters: MutableMapping[str, Union[str, int]] = {}
+		An error retrieving the consumption for one meter does not affect the others;
+		it is reported in the :attr:`~.ConsumptionResult.error` attribute of that meter's result.
 
-		if period_from is not None:
-			parameters["period_from"] = period_from.isoformat()
-		if period_to is not None:
-			parameters["period_to"] = period_to.isoformat()
+		:param meters: The meters to retrieve consumption for, as :class:`~octo_api.consumption.Meter` objects
+			or ``(mpan, serial_number, fuel)`` tuples.
+		:param period_from: Show consumption for periods which start at or after the given datetime.
+		:param period_to: Show consumption for periods which start at or before the given datetime.
+		:param page_size: Page size of returned results.
+		:param reverse: Returns the results ordered from most oldest to newest.
+		:param group_by: The grouping of the consumption data.
+		:param max_workers: The maximum number of meters to retrieve consumption for at once.
+			This should be no larger than the ``pool_maxsize`` of the :class:`~.OctoAPI`.
+		:param rows: The representation of each half-hour period in the results;
+			one of ``'object'``, ``'tuple'`` or ``'dict'``.
+
+		The meters are read from ``meters`` as capacity becomes available,
+		so it may be a generator over a large number of meters.
+
+		.. seealso:: :meth:`~.OctoAPI.get_consumption` for details of the other arguments.
+		"""  # noqa: D400
+
+		# Check the arguments now, rather than when the first result is requested.
+		_consumption_parameters(period_from, period_to, page_size, reverse, group_by)
+		_row_type(rows, Consumption, ConsumptionRow)
+
+		def fetch(meter: Meter) -> ConsumptionResult:
+			try:
+				consumption = self.get_consumption(
+						*meter,
+						period_from=period_from,
+						period_to=period_to,
+						page_size=page_size,
+						reverse=reverse,
+						group_by=group_by,
+						rows=rows,
+						)
+				return ConsumptionResult(meter, list(consumption), None)
+			except Exception as e:
+				return ConsumptionResult(meter, None, e)
+
+		return _as_completed(fetch, (Meter(*meter) for meter in meters), max_workers)
+
+
+def _row_type(rows: str, obj_type: Type, row_type: Type) -> Type:
+	"""
+	Returns the type to convert each item in a paginated response to.
 
-		if page_size > 25000:
-			raise ValueError("'page_size' may not be greater than 25,000")
+	:param rows: The requested representation; one of ``'object'``, ``'tuple'`` or ``'dict'``.
+	:param obj_type: The type to use for ``'object'``.
+	:param row_type: The type to use for ``'tuple'``.
+	"""
 
-		parameters["page_size"] = int(page_size)
+	if rows == "object":
+		return obj_type
+	elif rows == "tuple":
+		return row_type
+	elif rows == "dict":
+		return dict
+	else:
+		raise ValueError(f"'rows' must be one of 'object', 'tuple' or 'dict', not {rows!r}")
+
+
+def _products_parameters(
+		is_variable: Optional[bool],
+		is_green: Optional[bool],
+		is_tracker: Optional[bool],
+		is_prepay: Optional[bool],
+		is_business: bool,
+		available_at: Optional[datetime],
+		) -> Dict[str, Any]:
+	"""
+	Construct the query parameters for :meth:`OctoAPI.get_products`.
+	"""
 
-		if reverse:
-			parameters["order_by"] = "period"
-		if group_by is not None:
-			parameters["group_by"] = str(group_by)
+	parameters: Dict[str, Any] = {}
 
-		query_url = self.API_BASE / f"{fuel}-meter-points" / mpan / "meters" / serial_number / "consumption"
-		return PaginatedResponse(query_url, query_params=parameters, obj_type=Consumption)
+	if is_variable is not None:
+		parameters["is_variable"] = is_variable
+	if is_green is not None:
+		parameters["is_green"] = is_green
+	if is_tracker is not None:
+		parameters["is_tracker"] = is_tracker
+	if is_prepay is not None:
+		parameters["is_prepay"] = is_prepay
+	parameters["is_business"] = is_business
+	if available_at is not None:
+		parameters["available_at"] = available_at.isoformat()
+
+	return parameters
+
+
+def _product_info_parameters(tariffs_active_at: Optional[datetime]) -> Dict[str, Any]:
+	"""
+	Construct the query parameters for :meth:`OctoAPI.get_product_info`.
+	"""
+
+	parameters = {}
+
+	if tariffs_active_at is not None:
+		parameters["tariffs_active_at"] = tariffs_active_at.isoformat()
+
+	return parameters
+
+
+def _tariff_charges_parameters(
+		period_from: Optional[datetime],
+		period_to: Optional[datetime],
+		page_size: int,
+		) -> MutableMapping[str, Union[str, int]]:
+	"""
+	Construct the query parameters for :meth:`OctoAPI.get_tariff_charges`.
+	"""
+
+	parameters: MutableMapping[str, Union[str, int]] = {}
+
+	if period_from is not None:
+		parameters["period_from"] = period_from.isoformat()
+	if period_to is not None:
+		parameters["period_to"] = period_to.isoformat()
+
+	if page_size > 1500:
+		raise ValueError("'page_size' may not be greater than 1,500")
+
+	parameters["page_size"] = int(page_size)
+
+	return parameters
+
+
+def _consumption_parameters(
+		period_from: Optional[datetime],
+		period_to: Optional[datetime],
+		page_size: int,
+		reverse: bool,
+		group_by: Optional[str],
+		) -> MutableMapping[str, Union[str, int]]:
+	"""
+	Construct the query parameters for :meth:`OctoAPI.get_consumption`.
+	"""
+
+	parameters: MutableMapping[str, Union[str, int]] = {}
+
+	if period_from is not None:
+		parameters["period_from"] = period_from.isoformat()
+	if period_to is not None:
+		parameters["period_to"] = period_to.isoformat()
+
+	if page_size > 25000:
+		raise ValueError("'page_size' may not be greater than 25,000")
+
+	parameters["page_size"] = int(page_size)
+
+	if reverse:
+		parameters["order_by"] = "period"
+	if group_by is not None:
+		parameters["group_by"] = str(group_by)
+
+	return parameters
+
+
+def _grid_supply_point(postcode: str, results: List[Dict[str, Any]]) -> Region:
+	"""
+	Returns the grid supply point from the results of a ``industry/grid-supply-points`` query.
+
+	:param postcode:
+	:param results:
+	"""
+
+	if results:
+		return Region(results[0]["group_id"])
+	else:
+		raise ValueError(f"Cannot map the postcode {postcode!r} to a GSP.")
+
+
+def _as_completed(func: Callable[[_T], _R], items: Iterable[_T], max_workers: int) -> Iterator[_R]:
+	"""
+	Call ``func`` for each of ``items`` on a pool of threads, yielding the results in the order they complete.
+
+	No more than ``max_workers`` calls are in flight at once,
+	and ``items`` is only consumed as capacity becomes available.
+
+	:param func:
+	:param items:
+	:param max_workers:
+	"""
+
+	pending: Set["Future[_R]"] = set()
+	max_workers = max(max_workers, 1)
+
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		try:
+			for item in items:
+				pending.add(executor.submit(func, item))
+
+				if len(pending) >= max_workers:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					for future in done:
+						yield future.result()
+
+			while pending:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					yield future.result()
+
+		finally:
+			for future in pending:
+				future.cancel()
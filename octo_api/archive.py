@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+#
+#  archive.py
+"""
+Compact, memory-mapped on-disk archive of half-hourly consumption.
+
+Each archive file holds the consumption for a single meter, and consists of a small header followed by two columns:
+the ``int32`` index of each half-hour slot since the Unix epoch, in ascending order,
+and the consumption for each slot as a ``float32`` or ``float64``.
+Both columns are little-endian.
+
+The columns are exposed without parsing or copying as :class:`memoryview`\\s of the mapped file,
+and range queries use a binary search over the slot column.
+
+.. code-block:: python
+
+	readings = api.get_consumption(mpan, serial_number, "electricity", page_size=25000, rows="tuple")
+	ConsumptionArchive.write("meter.oca", readings)
+
+	with ConsumptionArchive("meter.oca") as archive:
+		january = archive.between(datetime(2021, 1, 1), datetime(2021, 2, 1))
+		total = sum(january.values)
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from types import TracebackType
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Type, Union, overload
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+from typing_extensions import Literal
+
+# this package
+from octo_api.consumption import Consumption, ConsumptionRow, Meter
+
+__all__ = ["ConsumptionArchive", "ConsumptionSequence", "archive_filename"]
+
+_MAGIC = b"OCTA"
+_VERSION = 1
+_SLOT = timedelta(minutes=30)
+_SLOT_SECONDS = 1800
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# magic, version, value typecode, slot length (seconds), epoch (Unix seconds), number of slots.
+_HEADER = struct.Struct("<4sHcxIqI8x")
+
+_Reading = Union[Consumption, ConsumptionRow]
+
+
+def archive_filename(meter: Meter) -> str:
+	"""
+	Returns the filename of the archive for the given meter.
+
+	:param meter:
+	"""
+
+	return f"{meter.fuel}-{meter.mpan}-{meter.serial_number}.oca"
+
+
+def _to_slot(value: datetime) -> int:
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=timezone.utc)
+
+	slot, remainder = divmod(value - _EPOCH, _SLOT)
+	if remainder:
+		raise ValueError(f"{value} is not the start of a half-hour period.")
+
+	return slot
+
+
+def _bisect(slots: Sequence[int], value: Optional[datetime], default: int) -> int:
+	if value is None:
+		return default
+
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=timezone.utc)
+
+	# Round up, so a partial half-hour is excluded.
+	return bisect_left(slots, -((_EPOCH - value) // _SLOT))
+
+
+class ConsumptionSequence(Sequence[Consumption]):
+	"""
+	Lazy, read-only sequence of half-hourly :class:`~octo_api.consumption.Consumption`,
+	backed by columns of slot indices and values.
+
+	:class:`~octo_api.consumption.Consumption` objects are only constructed when items are accessed;
+	slicing returns another :class:`~.ConsumptionSequence` sharing the same columns.
+
+	:param slots: The index of each half-hour slot since the Unix epoch, in ascending order.
+	:param values: The consumption for each slot.
+	"""  # noqa: D400
+
+	def __init__(self, slots: Sequence[int], values: Sequence[float]):
+		#: The index of each half-hour slot since the Unix epoch, in ascending order.
+		self.slots: Sequence[int] = slots
+
+		#: The consumption for each slot.
+		self.values: Sequence[float] = values
+
+	def __len__(self) -> int:
+		return len(self.slots)
+
+	@overload
+	def __getitem__(self, item: int) -> Consumption: ...
+
+	@overload
+	def __getitem__(self, item: slice) -> "ConsumptionSequence": ...
+
+	def __getitem__(self, item: Union[int, slice]) -> Union[Consumption, "ConsumptionSequence"]:
+		if isinstance(item, slice):
+			if item.step not in {None, 1}:
+				raise ValueError("Slices with a step are not supported.")
+			return ConsumptionSequence(self.slots[item], self.values[item])
+
+		start = _EPOCH + self.slots[item] * _SLOT
+		return Consumption(self.values[item], start, start + _SLOT)
+
+	def between(
+			self,
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			) -> "ConsumptionSequence":
+		"""
+		Returns the consumption for periods starting at or after ``period_from`` and before ``period_to``.
+
+		:param period_from: Naïve datetimes are assumed to be in UTC.
+		:param period_to: Naïve datetimes are assumed to be in UTC.
+		"""
+
+		start = _bisect(self.slots, period_from, 0)
+		stop = _bisect(self.slots, period_to, len(self.slots))
+		return self[start:max(start, stop)]
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} of {len(self)} periods>"
+
+
+class ConsumptionArchive(ConsumptionSequence):
+	"""
+	Memory-mapped archive of the half-hourly consumption for a single meter.
+
+	:param filename:
+
+	The archive can be used as a context manager, which closes the file on exit.
+	If slices of the archive are still in use when it is closed, the file remains mapped until they are released.
+	"""
+
+	def __init__(self, filename: PathLike):
+		#: The filename of the archive.
+		self.filename: str = os.fspath(filename)
+
+		with open(self.filename, "rb") as fp:
+			self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+		magic, version, typecode, slot_seconds, epoch, count = _HEADER.unpack_from(self._mmap)
+
+		if magic != _MAGIC:
+			raise ValueError(f"{self.filename!r} is not a consumption archive.")
+		if version != _VERSION or slot_seconds != _SLOT_SECONDS or epoch != 0:
+			raise ValueError(f"Unsupported consumption archive format in {self.filename!r}.")
+
+		#: The type of the values in the archive; either ``'f'`` (``float32``) or ``'d'`` (``float64``).
+		self.typecode: str = typecode.decode("ASCII")
+
+		buffer = memoryview(self._mmap)
+		slots_offset, values_offset = _offsets(count, self.typecode)
+		slots = buffer[slots_offset:slots_offset + 4 * count]
+		values = buffer[values_offset:values_offset + array(self.typecode).itemsize * count]
+
+		self._buffers = [buffer, slots, values]
+
+		if sys.byteorder == "little":
+			self._buffers += [slots.cast('i'), values.cast(self.typecode)]
+			super().__init__(*self._buffers[-2:])
+		else:  # pragma: no cover
+			swapped_slots, swapped_values = array('i', slots), array(self.typecode, values)
+			swapped_slots.byteswap()
+			swapped_values.byteswap()
+			super().__init__(swapped_slots, swapped_values)
+
+	@classmethod
+	def write(
+			cls,
+			filename: PathLike,
+			readings: Iterable[_Reading],
+			typecode: Literal['f', 'd'] = 'd',
+			merge: bool = True,
+			) -> int:
+		"""
+		Write half-hourly consumption to an archive.
+
+		:param filename:
+		:param readings: Half-hourly consumption, such as the results of
+			:meth:`OctoAPI.get_consumption <.OctoAPI.get_consumption>`, in any order.
+		:param typecode: The type to store values as; either ``'f'`` (``float32``) or ``'d'`` (``float64``).
+		:param merge: Whether to merge ``readings`` with any existing consumption in the archive.
+			Where both contain the same period, the value in ``readings`` is kept.
+
+		:returns: The number of periods in the archive.
+		"""
+
+		if typecode not in {'f', 'd'}:
+			raise ValueError("'typecode' must be one of 'f' or 'd'")
+
+		filename = os.fspath(filename)
+		by_slot: Dict[int, float] = {}
+
+		if merge and os.path.isfile(filename):
+			with cls(filename) as existing:
+				by_slot.update(zip(existing.slots, existing.values))
+
+		for reading in readings:
+			by_slot[_to_slot(reading.interval_start)] = reading.consumption
+
+		slots = array('i', sorted(by_slot))
+		values = array(typecode, map(by_slot.__getitem__, slots))
+
+		if sys.byteorder != "little":  # pragma: no cover
+			slots.byteswap()
+			values.byteswap()
+
+		count = len(slots)
+		slots_offset, values_offset = _offsets(count, typecode)
+
+		directory = os.path.dirname(os.path.abspath(filename))
+		fd, tmpfile = tempfile.mkstemp(dir=directory, prefix=".tmp")
+
+		try:
+			with os.fdopen(fd, "wb") as fp:
+				fp.write(_HEADER.pack(_MAGIC, _VERSION, typecode.encode("ASCII"), _SLOT_SECONDS, 0, count))
+				fp.write(slots.tobytes())
+				fp.write(b'\0' * (values_offset - slots_offset - 4 * count))
+				fp.write(values.tobytes())
+			os.replace(tmpfile, filename)
+		except BaseException:
+			if os.path.exists(tmpfile):
+				os.unlink(tmpfile)
+			raise
+
+		return count
+
+	def close(self) -> None:
+		"""
+		Close the archive.
+		"""
+
+		self.slots = self.values = ()
+		for buffer in reversed(self._buffers):
+			buffer.release()
+
+		try:
+			self._mmap.close()
+		except BufferError:
+			# Slices of the columns are still in use; the file is unmapped once they are released.
+			pass
+
+	def __enter__(self) -> "ConsumptionArchive":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.close()
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__}({self.filename!r}) of {len(self)} periods>"
+
+
+def _offsets(count: int, typecode: str) -> Tuple[int, int]:
+	"""
+	Returns the offsets of the slot and value columns in an archive with ``count`` periods.
+
+	The value column is aligned to the size of its items.
+	"""
+
+	itemsize = array(typecode).itemsize
+	values_offset = _HEADER.size + 4 * count
+	values_offset += -values_offset % itemsize
+	return _HEADER.size, values_offset
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+#
+#  async_api.py
+"""
+Asynchronous interface to the Octopus Energy API, for use with :mod:`asyncio`.
+
+.. extras-require:: async
+	:pyproject:
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import asyncio
+import base64
+import functools
+from datetime import datetime
+from types import TracebackType
+from typing import (
+		Any,
+		AsyncGenerator,
+		Awaitable,
+		Callable,
+		Dict,
+		Iterable,
+		Optional,
+		Set,
+		Tuple,
+		Type,
+		TypeVar,
+		Union,
+		overload
+		)
+from urllib.parse import unquote, urlencode
+
+# 3rd party
+import aiohttp
+import yarl
+from apeye.slumber_url import HttpClientError, HttpNotFoundError, HttpServerError
+from apeye.url import URL
+from domdf_python_tools.secrets import Secret
+from typing_extensions import Literal
+
+# this package
+from octo_api.api import (
+		_consumption_parameters,
+		_grid_supply_point,
+		_product_info_parameters,
+		_products_parameters,
+		_row_type,
+		_tariff_charges_parameters
+		)
+from octo_api.consumption import Consumption, ConsumptionResult, ConsumptionRow, Meter
+from octo_api.decoders import Decoder, get_decoder
+from octo_api.pagination import AsyncPaginatedResponse
+from octo_api.products import DetailedProduct, Product, RateInfo, RateInfoRow
+from octo_api.ratelimit import RateLimiter
+from octo_api.utils import MeterPointDetails, RateType, Region, TariffCode
+
+__all__ = ["AsyncOctoAPI"]
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class _Retry(Exception):
+	"""
+	Raised by :meth:`AsyncOctoAPI._request <.AsyncOctoAPI._request>` when the rate limiter
+	wants a failed request to be retried.
+
+	:param delay: How long to wait before retrying, in seconds.
+	"""  # noqa: D400
+
+	def __init__(self, delay: float):
+		super().__init__(delay)
+		self.delay: float = delay
+
+
+class AsyncOctoAPI:
+	"""
+	Asynchronous interface to the Octopus Energy API.
+
+	The methods mirror those of :class:`~octo_api.api.OctoAPI`, but must be awaited.
+	Paginated results are returned as an :class:`~octo_api.pagination.AsyncPaginatedResponse`,
+	which can be iterated over with ``async for``.
+
+	The underlying connection pool is created on first use and should be closed
+	with :meth:`~.AsyncOctoAPI.close` when no longer required,
+	or by using the :class:`~.AsyncOctoAPI` as an asynchronous context manager.
+
+	:param api_key: API key to access the Octopus Energy API.
+	:param base_url: The base URL of the Octopus Energy API.
+	:param max_connections: The maximum number of simultaneous connections to the API.
+	:param rate_limiter: An optional rate limiter shared by every request to the API,
+		which also retries throttled requests and transient errors.
+		The same limiter may be shared with an :class:`~octo_api.api.OctoAPI`.
+	:param decoder: The decoder for JSON responses. See :func:`~octo_api.decoders.get_decoder`.
+
+	**Example**
+
+	.. code-block:: python
+
+		>>> async with AsyncOctoAPI(api_key) as api:
+		... 	consumption = await api.get_consumption(mpan, serial_number, fuel="electricity")
+		... 	async for reading in consumption:
+		... 		print(reading.consumption)
+
+	"""
+
+	def __init__(
+			self,
+			api_key: str,
+			*,
+			base_url: str = "https://api.octopus.energy/v1",
+			max_connections: int = 10,
+			rate_limiter: Optional[RateLimiter] = None,
+			decoder: Union[str, Decoder] = "json",
+			):
+
+		#: The API key to access the Octopus Energy API.
+		self.API_KEY: Secret = Secret(api_key)
+
+		#: The base URL of the Octopus Energy API.
+		self.API_BASE: URL = URL(base_url)
+
+		#: The maximum number of simultaneous connections to the API.
+		self.max_connections: int = max_connections
+
+		#: The rate limiter requests are paced with, if any.
+		self.rate_limiter: Optional[RateLimiter] = rate_limiter
+
+		#: The function used to decode JSON responses.
+		self.decoder: Decoder = get_decoder(decoder)
+
+		self._session: Optional[aiohttp.ClientSession] = None
+
+	@property
+	def session(self) -> aiohttp.ClientSession:
+		"""
+		The underlying :class:`aiohttp.ClientSession`.
+		"""
+
+		if self._session is None or self._session.closed:
+			credentials = base64.b64encode(f"{self.API_KEY.value}:".encode("UTF-8")).decode("latin1")
+			self._session = aiohttp.ClientSession(
+					headers={"Authorization": f"Basic {credentials}"},
+					connector=aiohttp.TCPConnector(limit=self.max_connections),
+					)
+
+		return self._session
+
+	async def close(self) -> None:
+		"""
+		Close the underlying connection pool.
+		"""
+
+		if self._session is not None:
+			await self._session.close()
+			self._session = None
+
+	async def __aenter__(self) -> "AsyncOctoAPI":
+		return self
+
+	async def __aexit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		await self.close()
+
+	async def _get(self, query_url: URL, **params: Any) -> Any:
+		"""
+		Perform a GET request to the given URL and return the decoded JSON response.
+
+		:param query_url:
+		:param params: Parameters to send in the query string.
+		"""
+
+		url = str(query_url)
+		if not url.endswith('/'):
+			url = f"{url}/"
+
+		# Encode the parameters the same way as :mod:`requests`, which drops parameters with a value of None.
+		query = urlencode({name: value for name, value in params.items() if value is not None})
+		if query:
+			url = f"{url}?{query}"
+
+		limiter = self.rate_limiter
+
+		if limiter is None:
+			return await self._request(url)
+
+		attempt = 0
+
+		while True:
+			await limiter.acquire_async()
+
+			try:
+				return await self._request(url, attempt)
+			except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+				if not limiter.should_retry(attempt):
+					raise
+				delay = limiter.retry_delay(attempt)
+			except _Retry as e:
+				delay = e.delay
+
+			await asyncio.sleep(delay)
+			attempt += 1
+
+	async def _request(self, url: str, attempt: Optional[int] = None) -> Any:
+		"""
+		Perform a single GET request to the given URL and return the decoded JSON response.
+
+		:param url: The URL, including the query string.
+		:param attempt: The number of retries made so far, if the request may be retried by the :attr:`~.rate_limiter`.
+		"""
+
+		async with self.session.get(yarl.URL(url, encoded=True), headers={"accept": "application/json"}) as resp:
+			content = await resp.read()
+
+			limiter = self.rate_limiter
+			if resp.status >= 400 and attempt is not None and limiter is not None:
+				if limiter.should_retry(attempt, resp.status):
+					raise _Retry(limiter.retry_delay(attempt, resp.headers.get("Retry-After")))
+
+			if 400 <= resp.status <= 499:
+				exception_class = HttpNotFoundError if resp.status == 404 else HttpClientError
+				raise exception_class(
+						f"Client Error {resp.status}: {unquote(str(resp.url))}",
+						response=resp,
+						content=content,
+						)
+
+			elif 500 <= resp.status <= 599:
+				raise HttpServerError(
+						f"Server Error {resp.status}: {unquote(str(resp.url))}",
+						response=resp,
+						content=content,
+						)
+
+		return self.decoder(content)
+
+	async def get_products(
+			self,
+			is_variable: Optional[bool] = None,
+			is_green: Optional[bool] = None,
+			is_tracker: Optional[bool] = None,
+			is_prepay: Optional[bool] = None,
+			is_business: bool = False,
+			available_at: Optional[datetime] = None,
+			max_workers: int = 4,
+			) -> AsyncPaginatedResponse[Product]:
+		"""
+		Returns a list of energy products.
+
+		:param is_variable: Show only variable products.
+		:param is_green: Show only green products.
+		:param is_tracker: Show only tracker products.
+		:param is_prepay: Show only pre-pay products.
+		:param is_business: Show only business products.
+		:param available_at: Show products available for new agreements on the given datetime.
+			Defaults to the current datetime, effectively showing products that are currently available.
+		:no-default available_at:
+		:param max_workers: The maximum number of pages to fetch concurrently.
+
+		.. seealso:: :meth:`OctoAPI.get_products <octo_api.api.OctoAPI.get_products>`
+		"""
+
+		parameters = _products_parameters(is_variable, is_green, is_tracker, is_prepay, is_business, available_at)
+
+		query_url = self.API_BASE / "products"
+		return await AsyncPaginatedResponse.fetch(
+				functools.partial(self._get, query_url),
+				parameters,
+				obj_type=Product,
+				max_workers=max_workers,
+				)
+
+	async def get_product_info(
+			self,
+			product_code: str,
+			tariffs_active_at: Optional[datetime] = None,
+			) -> DetailedProduct:
+		"""
+		Retrieve the details of a product (including all its tariffs) for a particular point in time.
+
+		:param product_code: The code of the product to be retrieved, for example ``VAR-17-01-11``.
+		:param tariffs_active_at: The point in time in which to show the active charges. Defaults to current datetime.
+		:no-default available_at:
+
+		.. seealso:: :meth:`OctoAPI.get_product_info <octo_api.api.OctoAPI.get_product_info>`
+		"""
+
+		parameters = _product_info_parameters(tariffs_active_at)
+
+		query_url = self.API_BASE / "products" / product_code
+		return DetailedProduct(**await self._get(query_url, **parameters))
+
+	@overload
+	async def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: int = ...,
+			rows: Literal["object"] = ...,
+			) -> AsyncPaginatedResponse[RateInfo]: ...
+
+	@overload
+	async def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: int = ...,
+			*,
+			rows: Literal["tuple"],
+			) -> AsyncPaginatedResponse[RateInfoRow]: ...
+
+	@overload
+	async def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			max_workers: int = ...,
+			*,
+			rows: Literal["dict"],
+			) -> AsyncPaginatedResponse[Dict[str, Any]]: ...
+
+	async def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: Union[str, TariffCode],
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			page_size: int = 100,
+			max_workers: int = 4,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> AsyncPaginatedResponse[Any]:
+		"""
+		Returns a list of time periods and their associated unit rates charges.
+
+		:param product_code: The code of the product to be retrieved, for example ``VAR-17-01-11``.
+		:param tariff_code: The code of the tariff to be retrieved, for example ``E-1R-VAR-17-01-11-A``.
+		:param fuel:
+		:param rate_type:
+		:param period_from: Show charges active from the given datetime (inclusive).
+		:param period_to: Show charges active up to the given datetime (exclusive).
+		:param page_size: Page size of returned results.
+			Default is ``100``, maximum is ``1,500`` to give up to a month of half-hourly prices.
+		:no-default page_size:
+		:param max_workers: The maximum number of pages to fetch concurrently.
+		:param rows: The representation of each time period in the results;
+			one of ``'object'``, ``'tuple'`` or ``'dict'``.
+		:no-default rows:
+
+		.. seealso:: :meth:`OctoAPI.get_tariff_charges <octo_api.api.OctoAPI.get_tariff_charges>`
+		"""
+
+		parameters = _tariff_charges_parameters(period_from, period_to, page_size)
+
+		query_url = self.API_BASE / "products" / product_code / f"{fuel}-tariffs" / str(tariff_code) / str(rate_type)
+		return await AsyncPaginatedResponse.fetch(
+				functools.partial(self._get, query_url),
+				parameters,
+				obj_type=_row_type(rows, RateInfo, RateInfoRow),
+				max_workers=max_workers,
+				)
+
+	async def get_meter_point_details(self, mpan: str) -> MeterPointDetails:
+		"""
+		Retrieve the details of a meter-point.
+
+		:param mpan: The electricity meter-point's MPAN.
+
+		.. seealso:: :meth:`OctoAPI.get_meter_point_details <octo_api.api.OctoAPI.get_meter_point_details>`
+		"""
+
+		return MeterPointDetails._from_dict(await self._get(self.API_BASE / "electricity-meter-points" / mpan))
+
+	async def get_grid_supply_point(self, postcode: str) -> Region:
+		"""
+		Returns the grid supply point for the given postcode.
+
+		:param postcode:
+
+		:raises: :exc:`ValueError` if the postcode cannot be mapped to a GSP.
+
+		.. seealso:: :meth:`OctoAPI.get_grid_supply_point <octo_api.api.OctoAPI.get_grid_supply_point>`
+		"""
+
+		query_url = self.API_BASE / "industry" / "grid-supply-points"
+		return _grid_supply_point(postcode, (await self._get(query_url, postcode=postcode))["results"])
+
+	@overload
+	async def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: int = ...,
+			rows: Literal["object"] = ...,
+			) -> AsyncPaginatedResponse[Consumption]: ...
+
+	@overload
+	async def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: int = ...,
+			*,
+			rows: Literal["tuple"],
+			) -> AsyncPaginatedResponse[ConsumptionRow]: ...
+
+	@overload
+	async def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = ...,
+			period_to: Optional[datetime] = ...,
+			page_size: int = ...,
+			reverse: bool = ...,
+			group_by: Optional[str] = ...,
+			max_workers: int = ...,
+			*,
+			rows: Literal["dict"],
+			) -> AsyncPaginatedResponse[Dict[str, Any]]: ...
+
+	async def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			page_size: int = 100,
+			reverse: bool = False,
+			group_by: Optional[str] = None,
+			max_workers: int = 4,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> AsyncPaginatedResponse[Any]:
+		"""
+		Return a list of consumption values for half-hour periods for a given meter-point and meter.
+
+		:param mpan: The electricity meter-point's MPAN or gas meter-point's MPRN.
+		:param serial_number: The meter's serial number.
+		:param fuel:
+		:param period_from: Show consumption for periods which start at or after the given datetime.
+		:param period_to: Show consumption for periods which start at or before the given datetime.
+		:param page_size: Page size of returned results.
+			Default is ``100``, maximum is ``25,000`` to give a full year of half-hourly consumption details.
+		:no-default page_size:
+		:param reverse: Returns the results ordered from most oldest to newest. By default the results are from most recent backwards.
+		:no-default reverse:
+		:param group_by: The grouping of the consumption data.
+			By default the consumption is returned in half-hour periods.
+		:no-default group_by:
+		:param max_workers: The maximum number of pages to fetch concurrently.
+		:param rows: The representation of each half-hour period in the results;
+			one of ``'object'``, ``'tuple'`` or ``'dict'``.
+		:no-default rows:
+
+		.. seealso:: :meth:`OctoAPI.get_consumption <octo_api.api.OctoAPI.get_consumption>`
+		"""
+
+		parameters = _consumption_parameters(period_from, period_to, page_size, reverse, group_by)
+
+		query_url = self.API_BASE / f"{fuel}-meter-points" / mpan / "meters" / serial_number / "consumption"
+		return await AsyncPaginatedResponse.fetch(
+				functools.partial(self._get, query_url),
+				parameters,
+				obj_type=_row_type(rows, Consumption, ConsumptionRow),
+				max_workers=max_workers,
+				)
+
+	def get_consumption_many(
+			self,
+			meters: Iterable[Union[Meter, Tuple[str, str, Literal["electricity", "gas"]]]],
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			page_size: int = 25000,
+			reverse: bool = False,
+			group_by: Optional[str] = None,
+			max_workers: int = 8,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> AsyncGenerator[ConsumptionResult, None]:
+		"""
+		Retrieve the consumption for many meters concurrently,
+		yielding the results for each meter as soon as they have been retrieved.
+
+		The results are iterated over with ``async for``.
+
+		:param meters: The meters to retrieve consumption for, as :class:`~octo_api.consumption.Meter` objects
+			or ``(mpan, serial_number, fuel)`` tuples.
+		:param period_from: Show consumption for periods which start at or after the given datetime.
+		:param period_to: Show consumption for periods which start at or before the given datetime.
+		:param page_size: Page size of returned results.
+		:param reverse: Returns the results ordered from most oldest to newest.
+		:param group_by: The grouping of the consumption data.
+		:param max_workers: The maximum number of meters to retrieve consumption for at once.
+		:param rows: The representation of each half-hour period in the results;
+			one of ``'object'``, ``'tuple'`` or ``'dict'``.
+
+		.. seealso:: :meth:`OctoAPI.get_consumption_many <octo_api.api.OctoAPI.get_consumption_many>`
+		"""  # noqa: D400
+
+		# Check the arguments now, rather than when the first result is requested.
+		_consumption_parameters(period_from, period_to, page_size, reverse, group_by)
+		_row_type(rows, Consumption, ConsumptionRow)
+
+		async def fetch(meter: Meter) -> ConsumptionResult:
+			try:
+				consumption = await self.get_consumption(
+						*meter,
+						period_from=period_from,
+						period_to=period_to,
+						page_size=page_size,
+						reverse=reverse,
+						group_by=group_by,
+						max_workers=1,
+						rows=rows,
+						)
+				return ConsumptionResult(meter, [item async for item in consumption], None)
+			except Exception as e:
+				return ConsumptionResult(meter, None, e)
+
+		return _as_completed(fetch, (Meter(*meter) for meter in meters), max_workers)
+
+
+async def _as_completed(
+		func: Callable[[_T], Awaitable[_R]],
+		items: Iterable[_T],
+		max_workers: int,
+		) -> AsyncGenerator[_R, None]:
+	"""
+	Await ``func`` for each of ``items`` concurrently, yielding the results in the order they complete.
+
+	No more than ``max_workers`` calls are in flight at once,
+	and ``items`` is only consumed as capacity becomes available.
+
+	:param func:
+	:param items:
+	:param max_workers:
+	"""
+
+	pending: Set["asyncio.Future[_R]"] = set()
+	max_workers = max(max_workers, 1)
+
+	try:
+		for item in items:
+			pending.add(asyncio.ensure_future(func(item)))
+
+			if len(pending) >= max_workers:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for future in done:
+					yield future.result()
+
+		while pending:
+			done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+			for future in done:
+				yield future.result()
+
+	finally:
+		for future in pending:
+			future.cancel()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+Caches for responses from the Octopus Energy API.
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatchcase
+from typing import Dict, Generic, Hashable, Mapping, NamedTuple, Optional, Tuple, TypeVar, Union
+from urllib.parse import parse_qsl, urlsplit
+
+# 3rd party
+import requests
+from domdf_python_tools.typing import PathLike
+from requests.structures import CaseInsensitiveDict
+
+# this package
+from octo_api.utils import from_iso_zulu
+
+__all__ = ["CachedResponse", "ResponseCache", "TTLCache", "DEFAULT_TTLS"]
+
+_HOUR = 60 * 60
+_DAY = 24 * _HOUR
+
+#: The default time-to-live, in seconds, for responses from each endpoint.
+#:
+#: The keys are :func:`fnmatch <fnmatch.fnmatchcase>`-style patterns matched against the path of the URL;
+#: the first matching pattern is used. A value of :py:obj:`None` means responses are never cached.
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+		"*/products/*/*-tariffs/*/*/": _HOUR,
+		"*/products/*/": _DAY,
+		"*/products/": _HOUR,
+		"*/industry/grid-supply-points/": 7 * _DAY,
+		}
+
+# Response headers which are not stored, as the cached body is already decoded.
+_SKIP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+class CachedResponse(NamedTuple):
+	"""
+	A response stored in a :class:`~.ResponseCache`.
+	"""
+
+	#: The URL the response was retrieved from.
+	url: str
+
+	#: The HTTP status code of the response.
+	status_code: int
+
+	#: The headers of the response.
+	headers: Dict[str, str]
+
+	#: The (decoded) body of the response.
+	content: bytes
+
+	#: The Unix timestamp after which the response must be revalidated with the server.
+	expires: float
+
+	@property
+	def fresh(self) -> bool:
+		"""
+		Returns whether the response can be used without revalidating it with the server.
+		"""
+
+		return time.time() < self.expires
+
+	@property
+	def etag(self) -> Optional[str]:
+		"""
+		The value of the ``ETag`` header of the response, if any.
+		"""
+
+		return CaseInsensitiveDict(self.headers).get("ETag")
+
+	@property
+	def last_modified(self) -> Optional[str]:
+		"""
+		The value of the ``Last-Modified`` header of the response, if any.
+		"""
+
+		return CaseInsensitiveDict(self.headers).get("Last-Modified")
+
+	def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+		"""
+		Construct a :class:`requests.Response` from the cached response.
+
+		:param request: The request the response is for.
+		"""
+
+		response = requests.Response()
+		response.status_code = self.status_code
+		response.reason = "OK"
+		response.headers = CaseInsensitiveDict(self.headers)
+		response._content = self.content
+		response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+		response.url = self.url
+		response.request = request
+		response.from_cache = True  # type: ignore
+		return response
+
+
+class ResponseCache:
+	"""
+	Persistent, size-bounded cache of responses from the Octopus Energy API, stored in a directory on disk.
+
+	Responses are keyed by their URL (including the query parameters) and the credentials used to request them.
+	Once a response's time-to-live has elapsed it is revalidated with the server using the
+	``ETag`` and ``Last-Modified`` headers, if the server sent them, and is only downloaded again if it has changed.
+
+	:param directory: The directory to store responses in. Created if it does not exist.
+	:param ttls: Mapping of :func:`fnmatch <fnmatch.fnmatchcase>`-style patterns, matched against the path of the URL,
+		to the time-to-live of responses from those endpoints in seconds. The first matching pattern is used.
+		A time-to-live of :py:obj:`None` means responses from that endpoint are never cached.
+		A time-to-live of ``0`` means responses are always revalidated.
+	:no-default ttls:
+	:param default_ttl: The time-to-live of responses from endpoints which do not match any of ``ttls``.
+	:param historical_ttl: The time-to-live of cacheable responses whose ``period_to`` parameter is in the past,
+		such as historical tariff charges, which are unlikely to change.
+	:param max_size: The maximum total size of the cache, in bytes.
+		When exceeded, the least recently used responses are evicted.
+
+	The cache can be used with :class:`~octo_api.api.OctoAPI` like so:
+
+	.. code-block:: python
+
+		api = OctoAPI(api_key, cache=ResponseCache("~/.cache/octo_api"))
+	"""
+
+	def __init__(
+			self,
+			directory: PathLike,
+			ttls: Optional[Mapping[str, Optional[float]]] = None,
+			default_ttl: Optional[float] = None,
+			historical_ttl: Optional[float] = 30 * _DAY,
+			max_size: int = 256 * 1024 * 1024,
+			):
+
+		#: The directory responses are stored in.
+		self.directory: str = os.path.abspath(os.path.expanduser(os.fspath(directory)))
+
+		#: Mapping of URL path patterns to the time-to-live of responses from those endpoints.
+		self.ttls: Dict[str, Optional[float]] = dict(DEFAULT_TTLS if ttls is None else ttls)
+
+		#: The time-to-live of responses from endpoints which do not match any of :attr:`~.ResponseCache.ttls`.
+		self.default_ttl: Optional[float] = default_ttl
+
+		#: The time-to-live of cacheable responses whose ``period_to`` parameter is in the past.
+		self.historical_ttl: Optional[float] = historical_ttl
+
+		#: The maximum total size of the cache, in bytes.
+		self.max_size: int = max_size
+
+		os.makedirs(self.directory, exist_ok=True)
+		self._lock = threading.Lock()
+		self._size = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+	def ttl_for(self, url: str) -> Optional[float]:
+		"""
+		Returns the time-to-live for responses from the given URL, or :py:obj:`None` if they should not be cached.
+
+		:param url:
+		"""
+
+		parts = urlsplit(url)
+
+		for pattern, ttl in self.ttls.items():
+			if fnmatchcase(parts.path, pattern):
+				break
+		else:
+			ttl = self.default_ttl
+
+		if ttl is not None and self.historical_ttl is not None:
+			period_to = dict(parse_qsl(parts.query)).get("period_to")
+			if period_to and _is_past(period_to):
+				ttl = max(ttl, self.historical_ttl)
+
+		return ttl
+
+	@staticmethod
+	def key(url: str, authorization: Optional[Union[str, bytes]] = None) -> str:
+		"""
+		Returns the key used to store the response for the given URL.
+
+		:param url: The URL, including the query string.
+		:param authorization: The value of the ``Authorization`` header sent with the request, if any.
+		"""
+
+		sha = hashlib.sha256(url.encode("UTF-8"))
+
+		if authorization:
+			if isinstance(authorization, str):
+				authorization = authorization.encode("UTF-8")
+			sha.update(b'\0')
+			sha.update(authorization)
+
+		return sha.hexdigest()
+
+	def _path(self, key: str) -> str:
+		return os.path.join(self.directory, key)
+
+	def get(self, key: str) -> Optional[CachedResponse]:
+		"""
+		Returns the response stored under ``key``, or :py:obj:`None` if there isn't one.
+
+		:param key:
+		"""
+
+		filename = self._path(key)
+
+		try:
+			with open(filename, "rb") as fp:
+				metadata = json.loads(fp.readline())
+				content = fp.read()
+			os.utime(filename)
+		except (OSError, ValueError):
+			return None
+
+		return CachedResponse(content=content, **metadata)
+
+	def set(self, key: str, response: CachedResponse) -> None:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Store a response under ``key``, evicting the least recently used responses if the cache is full.
+
+		:param key:
+		:param response:
+		"""
+
+		metadata = response._asdict()
+		del metadata["content"]
+		data = json.dumps(metadata).encode("UTF-8") + b'\n' + response.content
+
+		filename = self._path(key)
+		fd, tmpfile = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+
+		try:
+			with os.fdopen(fd, "wb") as fp:
+				fp.write(data)
+
+			with self._lock:
+				try:
+					self._size -= os.stat(filename).st_size
+				except OSError:
+					pass
+
+				os.replace(tmpfile, filename)
+				self._size += len(data)
+
+				if self._size > self.max_size:
+					self._evict()
+		except BaseException:
+			if os.path.exists(tmpfile):
+				os.unlink(tmpfile)
+			raise
+
+	def store(self, key: str, response: requests.Response, ttl: float) -> CachedResponse:
+		"""
+		Store a response from the server under ``key``.
+
+		:param key:
+		:param response:
+		:param ttl: The time-to-live of the response, in seconds.
+
+		:returns: The response as it was stored.
+		"""
+
+		cached = CachedResponse(
+				url=response.url,
+				status_code=response.status_code,
+				headers={k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS},
+				content=response.content,
+				expires=time.time() + ttl,
+				)
+		self.set(key, cached)
+		return cached
+
+	def refresh(self, key: str, response: CachedResponse, ttl: float) -> CachedResponse:
+		"""
+		Mark a stored response as fresh after the server confirmed it has not changed.
+
+		:param key:
+		:param response:
+		:param ttl: The time-to-live of the response, in seconds.
+
+		:returns: The refreshed response.
+		"""
+
+		refreshed = response._replace(expires=time.time() + ttl)
+		self.set(key, refreshed)
+		return refreshed
+
+	def _evict(self) -> None:
+		# Called with the lock held.
+		entries = []
+		for entry in os.scandir(self.directory):
+			if entry.is_file() and not entry.name.startswith(".tmp"):
+				stat = entry.stat()
+				entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+		entries.sort()
+
+		for _, size, path in entries:
+			if self._size <= self.max_size:
+				break
+			try:
+				os.unlink(path)
+			except OSError:
+				continue
+			self._size -= size
+
+	def clear(self) -> None:
+		"""
+		Remove all responses from the cache.
+		"""
+
+		with self._lock:
+			for entry in os.scandir(self.directory):
+				if entry.is_file():
+					os.unlink(entry.path)
+			self._size = 0
+
+	def __len__(self) -> int:
+		return sum(1 for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.startswith(".tmp"))
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}({self.directory!r})"
+
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class TTLCache(Generic[_K, _V]):
+	"""
+	Thread-safe, size-bounded, in-memory cache whose entries expire after a fixed time.
+
+	When the cache is full the least recently used entry is discarded.
+
+	:param ttl: How long entries are kept for.
+	:param max_size: The maximum number of entries to keep.
+	"""
+
+	def __init__(self, ttl: timedelta = timedelta(days=7), max_size: int = 100_000):
+
+		#: How long entries are kept for.
+		self.ttl: timedelta = ttl
+
+		#: The maximum number of entries to keep.
+		self.max_size: int = max_size
+
+		self._lock = threading.Lock()
+		self._entries: "OrderedDict[_K, Tuple[float, _V]]" = OrderedDict()
+
+	def get(self, key: _K) -> Optional[_V]:
+		"""
+		Returns the value for ``key``, or :py:obj:`None` if it is not in the cache or has expired.
+
+		:param key:
+		"""
+
+		with self._lock:
+			entry = self._entries.get(key)
+
+			if entry is None:
+				return None
+
+			if entry[0] <= time.monotonic():
+				del self._entries[key]
+				return None
+
+			self._entries.move_to_end(key)
+			return entry[1]
+
+	def set(self, key: _K, value: _V) -> None:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Store a value in the cache.
+
+		:param key:
+		:param value:
+		"""
+
+		expires = time.monotonic() + self.ttl.total_seconds()
+
+		with self._lock:
+			self._entries[key] = (expires, value)
+			self._entries.move_to_end(key)
+
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
+
+	def clear(self) -> None:
+		"""
+		Remove all entries from the cache.
+		"""
+
+		with self._lock:
+			self._entries.clear()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}(ttl={self.ttl!r}, max_size={self.max_size!r})"
+
+
+def _is_past(timestamp: str) -> bool:
+	try:
+		value = from_iso_zulu(timestamp)
+	except ValueError:
+		return False
+
+	if value is None:
+		return False
+
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=timezone.utc)
+
+	return value < datetime.now(timezone.utc)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+#
+#  catalogue.py
+"""
+An in-memory index of the products and tariffs available from the API.
+
+.. code-block:: python
+
+	catalogue = ProductCatalogue(api)
+
+	entry = catalogue.find_tariff("E-1R-VAR-17-01-11-A")
+	print(entry.product.display_name, entry.region, entry.payment_method)
+
+	for entry in catalogue.tariffs_for_region(Region.London):
+		...
+
+The catalogue is loaded on first use, and can be brought up to date with :meth:`ProductCatalogue.refresh`.
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.doctools import prettify_docstrings
+from typing_extensions import Literal
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.products import DetailedProduct, Tariff
+from octo_api.utils import Region
+
+__all__ = ["CatalogueEntry", "ProductCatalogue", "REGISTER_TYPES"]
+
+#: The kinds of tariff a :class:`~octo_api.products.DetailedProduct` may have,
+#: named after its ``*_tariffs`` attributes.
+REGISTER_TYPES: Tuple[str, ...] = (
+		"single_register_electricity",
+		"dual_register_electricity",
+		"single_register_gas",
+		)
+
+
+@prettify_docstrings
+class CatalogueEntry(NamedTuple):
+	"""
+	The location of a tariff within the :class:`~.ProductCatalogue`.
+
+	:param product: The product the tariff belongs to.
+	:param region: The GSP region the tariff applies to, e.g. :py:attr:`Region.Eastern <octo_api.utils.Region.Eastern>`.
+	:param payment_method: The payment method the tariff applies to, e.g. ``direct_debit_monthly``.
+	:param register_type: The kind of tariff; one of :py:data:`~.REGISTER_TYPES`.
+	:param tariff: The tariff itself.
+	"""
+
+	product: DetailedProduct
+	region: str
+	payment_method: str
+	register_type: Literal["single_register_electricity", "dual_register_electricity", "single_register_gas"]
+	tariff: Tariff
+
+
+class _Index(NamedTuple):
+	products: Dict[str, DetailedProduct]
+	tariffs: Dict[str, CatalogueEntry]
+	regions: Dict[str, List[CatalogueEntry]]
+
+
+class ProductCatalogue:
+	"""
+	Loads every product, and the details of its tariffs, and indexes them for lookup without further requests.
+
+	:param api: The client to load the products with.
+	:param max_workers: The maximum number of products to load at once.
+	:param is_business: Whether to load business products rather than domestic ones.
+	:param available_at: Load products available for new agreements on the given datetime.
+		Defaults to the current datetime.
+	:no-default available_at:
+	"""
+
+	def __init__(
+			self,
+			api: OctoAPI,
+			max_workers: int = 8,
+			is_business: bool = False,
+			available_at: Optional[datetime] = None,
+			):
+		self.api: OctoAPI = api
+		self.max_workers: int = max_workers
+		self.is_business: bool = is_business
+		self.available_at: Optional[datetime] = available_at
+
+		self._index: Optional[_Index] = None
+		self._lock = threading.Lock()
+
+	def refresh(self) -> None:
+		"""
+		Reload the products from the API, replacing the indexes once loading has finished.
+
+		Lookups made while refreshing see the previous contents of the catalogue.
+		If loading fails the previous contents are kept.
+		"""
+
+		with self._lock:
+			self._index = self._load()
+
+	def _load(self) -> _Index:
+		listing = self.api.get_products(is_business=self.is_business, available_at=self.available_at)
+		codes = [product.code for product in listing]
+
+		if self.max_workers > 1 and len(codes) > 1:
+			with ThreadPoolExecutor(max_workers=min(self.max_workers, len(codes))) as executor:
+				details = list(executor.map(self.api.get_product_info, codes))
+		else:
+			details = list(map(self.api.get_product_info, codes))
+
+		products: Dict[str, DetailedProduct] = {}
+		tariffs: Dict[str, CatalogueEntry] = {}
+		regions: Dict[str, List[CatalogueEntry]] = {}
+
+		for product in details:
+			products[product.code] = product
+
+			for register_type in REGISTER_TYPES:
+				regional_tariffs = getattr(product, f"{register_type}_tariffs")
+
+				for region, payment_methods in regional_tariffs.items():
+					for payment_method, tariff in payment_methods.items():
+						entry = CatalogueEntry(product, region, payment_method, register_type, tariff)  # type: ignore[arg-type]
+						tariffs[tariff.code] = entry
+						regions.setdefault(region, []).append(entry)
+
+		return _Index(products, tariffs, regions)
+
+	def _get_index(self) -> _Index:
+		index = self._index
+
+		if index is None:
+			with self._lock:
+				if self._index is None:
+					self._index = self._load()
+				index = self._index
+
+		return index
+
+	@property
+	def products(self) -> Mapping[str, DetailedProduct]:
+		"""
+		Mapping of product codes to products.
+		"""
+
+		return self._get_index().products
+
+	def get_product(self, product_code: str) -> DetailedProduct:
+		"""
+		Returns the product with the given code.
+
+		:param product_code: The code of the product, for example ``VAR-17-01-11``.
+
+		:raises: :exc:`KeyError` if the product is not in the catalogue.
+		"""
+
+		return self._get_index().products[product_code]
+
+	def find_tariff(self, tariff_code: str) -> CatalogueEntry:
+		"""
+		Returns the product, region, payment method and register type of the tariff with the given code.
+
+		:param tariff_code: The code of the tariff, for example ``E-1R-VAR-17-01-11-A``.
+
+		:raises: :exc:`KeyError` if the tariff is not in the catalogue.
+		"""
+
+		return self._get_index().tariffs[tariff_code]
+
+	def tariffs_for_region(self, region: Union[Region, str]) -> List[CatalogueEntry]:
+		"""
+		Returns the tariffs available in the given region.
+
+		:param region: The GSP region, e.g. :py:attr:`Region.Eastern <octo_api.utils.Region.Eastern>` or ``_A``.
+		"""
+
+		return list(self._get_index().regions.get(str(region), ()))
+
+	@property
+	def regions(self) -> List[str]:
+		"""
+		The GSP regions with at least one tariff in the catalogue.
+		"""
+
+		return sorted(self._get_index().regions)
+
+	def __contains__(self, product_code: object) -> bool:
+		return product_code in self._get_index().products
+
+	def __iter__(self) -> Iterator[DetailedProduct]:
+		return iter(list(self._get_index().products.values()))
+
+	def __len__(self) -> int:
+		return len(self._get_index().products)
+
+	def __repr__(self) -> str:
+		if self._index is None:
+			return f"<{self.__class__.__name__} (not loaded)>"
+
+		return f"<{self.__class__.__name__} of {len(self._index.products)} products, {len(self._index.tariffs)} tariffs>"
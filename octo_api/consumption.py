@@ -28,16 +28,20 @@ Class to represent consumption data.
 
 # stdlib
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
 
 # 3rd party
 import attr
 from attr_utils.serialise import serde
 from domdf_python_tools.doctools import prettify_docstrings
+from typing_extensions import Literal
 
 # this package
-from octo_api.utils import add_repr, from_iso_zulu
+from octo_api.utils import _from_columns, add_repr, from_iso_zulu, parse_iso_zulu_batch
 
-__all__ = ["Consumption"]
+__all__ = ["Consumption", "ConsumptionResult", "ConsumptionRow", "Meter"]
 
 
 @serde
@@ -57,3 +61,97 @@ class Consumption:
 
 	#: The end of the time period.
 	interval_end: datetime = attr.ib(converter=from_iso_zulu)
+
+	@classmethod
+	def _from_rows(cls, rows: Sequence[Dict[str, Any]]) -> List["Consumption"]:
+		"""
+		Construct :class:`~.Consumption` objects from a page of results from the API,
+		bypassing the per-object converters.
+
+		:param rows:
+		"""  # noqa: D400
+
+		return _from_columns(
+				cls,
+				len(rows),
+				{
+						"consumption": map(itemgetter("consumption"), rows),
+						"interval_start": parse_iso_zulu_batch(list(map(itemgetter("interval_start"), rows))),
+						"interval_end": parse_iso_zulu_batch(list(map(itemgetter("interval_end"), rows))),
+						},
+				)
+
+
+@prettify_docstrings
+class ConsumptionRow(NamedTuple):
+	"""
+	Lightweight representation of the consumption for a given period of time.
+
+	This has the same fields as :class:`~.Consumption`, but is considerably cheaper to construct.
+
+	:param consumption: The consumption.
+	:param interval_start: The start of the time period.
+	:param interval_end: The end of the time period.
+	"""
+
+	consumption: float
+	interval_start: datetime
+	interval_end: datetime
+
+	@classmethod
+	def _from_dict(cls, octopus_dict: Dict[str, Any]) -> "ConsumptionRow":
+		return cls(
+				octopus_dict["consumption"],
+				from_iso_zulu(octopus_dict["interval_start"]),  # type: ignore[arg-type]
+				from_iso_zulu(octopus_dict["interval_end"]),  # type: ignore[arg-type]
+				)
+
+	@classmethod
+	def _from_rows(cls, rows: Sequence[Dict[str, Any]]) -> List["ConsumptionRow"]:
+		columns = zip(
+				map(itemgetter("consumption"), rows),
+				parse_iso_zulu_batch(list(map(itemgetter("interval_start"), rows))),
+				parse_iso_zulu_batch(list(map(itemgetter("interval_end"), rows))),
+				)
+		return list(map(tuple.__new__, repeat(cls), columns))  # type: ignore[arg-type]
+
+
+@prettify_docstrings
+class Meter(NamedTuple):
+	"""
+	Identifies a single meter, for which consumption can be retrieved.
+
+	The fields are in the same order as the arguments to :meth:`OctoAPI.get_consumption <.OctoAPI.get_consumption>`.
+
+	:param mpan: The electricity meter-point's MPAN or gas meter-point's MPRN.
+	:param serial_number: The meter's serial number.
+	:param fuel:
+	"""
+
+	mpan: str
+	serial_number: str
+	fuel: Literal["electricity", "gas"]
+
+
+@prettify_docstrings
+class ConsumptionResult(NamedTuple):
+	"""
+	The outcome of fetching the consumption for one meter with
+	:meth:`OctoAPI.get_consumption_many <.OctoAPI.get_consumption_many>`.
+
+	:param meter: The meter the consumption is for.
+	:param consumption: The consumption, or :py:obj:`None` if it could not be retrieved.
+	:param error: The exception raised while retrieving the consumption, if any.
+	"""  # noqa: D400
+
+	meter: Meter
+	consumption: Optional[List[Any]]
+	error: Optional[Exception]
+
+	@property
+	def ok(self) -> bool:
+		"""
+		Returns whether the consumption was retrieved successfully.
+		"""
+
+		return self.error is None
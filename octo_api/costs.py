@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+#
+#  costs.py
+"""
+Calculate the cost of consumption from the unit rates and standing charges of a tariff.
+
+.. code-block:: python
+
+	consumption = api.get_consumption(mpan, serial_number, "electricity", period_from=start, period_to=end)
+	unit_rates = api.get_tariff_charges(
+			product_code, tariff_code, "electricity", RateType.StandardUnitRate, period_from=start, period_to=end,
+			)
+	standing_charges = api.get_tariff_charges(
+			product_code, tariff_code, "electricity", RateType.StandingCharges, period_from=start, period_to=end,
+			)
+
+	costs = calculate_costs(consumption, unit_rates, standing_charges)
+	print(costs.total_inc_vat / 100)  # in pounds
+
+The calculation is vectorised with :mod:`numpy` if it is installed.
+It can be installed with the ``numpy`` extra:
+
+.. prompt:: bash
+
+	python -m pip install octo-api[numpy]
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import math
+from array import array
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Union
+
+# this package
+from octo_api.consumption import Consumption, ConsumptionRow
+from octo_api.products import RateInfo, RateInfoRow
+from octo_api.timeline import RateTimeline, _timestamp
+
+try:
+	# 3rd party
+	import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+	numpy = None
+
+__all__ = ["Costs", "IntervalCost", "calculate_costs"]
+
+_Reading = Union[Consumption, ConsumptionRow]
+_Rate = Union[RateInfo, RateInfoRow]
+
+
+class IntervalCost(NamedTuple):
+	"""
+	The cost of the consumption in a single period.
+
+	:param interval_start: The start of the time period.
+	:param interval_end: The end of the time period.
+	:param consumption: The consumption, in kWh.
+	:param unit_rate_exc_vat: The unit rate, in p/kWh, excluding VAT.
+	:param unit_rate_inc_vat: The unit rate, in p/kWh, including VAT.
+	:param cost_exc_vat: The cost, in pence, excluding VAT.
+	:param cost_inc_vat: The cost, in pence, including VAT.
+	"""
+
+	interval_start: datetime
+	interval_end: datetime
+	consumption: float
+	unit_rate_exc_vat: float
+	unit_rate_inc_vat: float
+	cost_exc_vat: float
+	cost_inc_vat: float
+
+
+class Costs:
+	"""
+	The cost of consumption over a period of time, as calculated by :func:`~.calculate_costs`.
+
+	The per-interval columns are ordered from the oldest period to the newest,
+	and are :class:`numpy.ndarray`\\s if :mod:`numpy` is installed,
+	or :class:`array.array`\\s otherwise.
+
+	Iterating over a :class:`~.Costs` gives an :class:`~.IntervalCost` for each period.
+	"""
+
+	#: The consumption in each period, ordered from oldest to newest.
+	readings: List[_Reading]
+
+	#: The unit rate applicable to each period, in p/kWh, excluding VAT.
+	unit_rate_exc_vat: Sequence[float]
+
+	#: The unit rate applicable to each period, in p/kWh, including VAT.
+	unit_rate_inc_vat: Sequence[float]
+
+	#: The cost of each period, in pence, excluding VAT.
+	cost_exc_vat: Sequence[float]
+
+	#: The cost of each period, in pence, including VAT.
+	cost_inc_vat: Sequence[float]
+
+	#: The days on which there was consumption, for which a standing charge applies.
+	days: List[date]
+
+	#: The total of the standing charges, in pence, excluding VAT.
+	standing_charge_exc_vat: float
+
+	#: The total of the standing charges, in pence, including VAT.
+	standing_charge_inc_vat: float
+
+	def __init__(
+			self,
+			readings: List[_Reading],
+			unit_rate_exc_vat: Sequence[float],
+			unit_rate_inc_vat: Sequence[float],
+			cost_exc_vat: Sequence[float],
+			cost_inc_vat: Sequence[float],
+			days: List[date],
+			standing_charge_exc_vat: float = 0.0,
+			standing_charge_inc_vat: float = 0.0,
+			):
+		self.readings = readings
+		self.unit_rate_exc_vat = unit_rate_exc_vat
+		self.unit_rate_inc_vat = unit_rate_inc_vat
+		self.cost_exc_vat = cost_exc_vat
+		self.cost_inc_vat = cost_inc_vat
+		self.days = days
+		self.standing_charge_exc_vat = standing_charge_exc_vat
+		self.standing_charge_inc_vat = standing_charge_inc_vat
+
+	@property
+	def consumption(self) -> float:
+		"""
+		The total consumption, in kWh.
+		"""
+
+		return math.fsum(map(attrgetter("consumption"), self.readings))
+
+	@property
+	def unit_cost_exc_vat(self) -> float:
+		"""
+		The total cost of the consumption, in pence, excluding VAT and standing charges.
+		"""
+
+		return math.fsum(self.cost_exc_vat)
+
+	@property
+	def unit_cost_inc_vat(self) -> float:
+		"""
+		The total cost of the consumption, in pence, including VAT and excluding standing charges.
+		"""
+
+		return math.fsum(self.cost_inc_vat)
+
+	@property
+	def total_exc_vat(self) -> float:
+		"""
+		The total cost, in pence, including standing charges and excluding VAT.
+		"""
+
+		return self.unit_cost_exc_vat + self.standing_charge_exc_vat
+
+	@property
+	def total_inc_vat(self) -> float:
+		"""
+		The total cost, in pence, including standing charges and VAT.
+		"""
+
+		return self.unit_cost_inc_vat + self.standing_charge_inc_vat
+
+	def __len__(self) -> int:
+		return len(self.readings)
+
+	def __iter__(self) -> Iterator[IntervalCost]:
+		for reading, rate_exc, rate_inc, cost_exc, cost_inc in zip(
+			self.readings,
+			self.unit_rate_exc_vat,
+			self.unit_rate_inc_vat,
+			self.cost_exc_vat,
+			self.cost_inc_vat,
+			):
+			yield IntervalCost(
+					reading.interval_start,
+					reading.interval_end,
+					reading.consumption,
+					float(rate_exc),
+					float(rate_inc),
+					float(cost_exc),
+					float(cost_inc),
+					)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} of {len(self)} periods: {self.total_inc_vat:.2f}p inc. VAT>"
+
+
+def calculate_costs(
+		consumption: Iterable[_Reading],
+		unit_rates: Iterable[_Rate],
+		standing_charges: Iterable[_Rate] = (),
+		) -> Costs:
+	"""
+	Calculate the cost of consumption from unit rates and standing charges.
+
+	Each period of consumption is charged at the unit rate in effect at the start of the period.
+	Where unit rates overlap, the one which came into effect most recently is used.
+	A standing charge is added for each day on which there was consumption,
+	at the rate in effect at the start of the first period of that day.
+	Days are calendar days in the timezone of the consumption's timestamps.
+
+	:param consumption: The consumption, in kWh, e.g. from :meth:`OctoAPI.get_consumption <.OctoAPI.get_consumption>`,
+		in any order.
+	:param unit_rates: The unit rates, in p/kWh, e.g. from :meth:`OctoAPI.get_tariff_charges <.OctoAPI.get_tariff_charges>`.
+	:param standing_charges: The standing charges, in p/day.
+
+	:raises: :exc:`ValueError` if there is no unit rate or standing charge in effect for any of the consumption.
+	"""
+
+	readings: List[_Reading] = list(consumption)
+	timestamps = list(map(_timestamp, map(attrgetter("interval_start"), readings)))
+
+	rates = RateTimeline(unit_rates)
+	charges = RateTimeline(standing_charges)
+
+	if numpy is not None:
+		order = numpy.argsort(numpy.asarray(timestamps, dtype=numpy.float64), kind="stable")
+		readings = [readings[i] for i in order.tolist()]
+		sorted_timestamps = numpy.asarray(timestamps, dtype=numpy.float64)[order]
+		amounts = numpy.fromiter(map(attrgetter("consumption"), readings), dtype=numpy.float64, count=len(readings))
+
+		unit_rate_exc, unit_rate_inc = rates.rates_at(sorted_timestamps)
+
+		if numpy.isnan(unit_rate_exc).any():
+			missing = readings[int(numpy.argmax(numpy.isnan(unit_rate_exc)))]
+			raise ValueError(f"No unit rate in effect for the period starting {missing.interval_start}")
+
+		cost_exc = amounts * unit_rate_exc
+		cost_inc = amounts * unit_rate_inc
+		sorted_list = sorted_timestamps.tolist()
+
+	else:
+		order_list = sorted(range(len(readings)), key=timestamps.__getitem__)
+		readings = [readings[i] for i in order_list]
+		sorted_list = [timestamps[i] for i in order_list]
+
+		unit_rate_exc, unit_rate_inc = rates.rates_at(sorted_list)
+
+		for reading, rate in zip(readings, unit_rate_exc):
+			if rate != rate:
+				raise ValueError(f"No unit rate in effect for the period starting {reading.interval_start}")
+
+		cost_exc = array('d', [reading.consumption * rate for reading, rate in zip(readings, unit_rate_exc)])
+		cost_inc = array('d', [reading.consumption * rate for reading, rate in zip(readings, unit_rate_inc)])
+
+	# Standing charges: one per day, at the rate in effect at the first period of that day.
+	days: List[date] = []
+	first_of_day: List[float] = []
+	for reading, timestamp in zip(readings, sorted_list):
+		day = reading.interval_start.date()
+		if not days or days[-1] != day:
+			days.append(day)
+			first_of_day.append(timestamp)
+
+	standing_charge_exc = standing_charge_inc = 0.0
+
+	if charges:
+		daily_exc, daily_inc = charges.rates_at(first_of_day)
+
+		for day, charge in zip(days, daily_exc):
+			if charge != charge:
+				raise ValueError(f"No standing charge in effect on {day}")
+
+		standing_charge_exc = math.fsum(daily_exc)
+		standing_charge_inc = math.fsum(daily_inc)
+
+	return Costs(
+			readings,
+			unit_rate_exc,
+			unit_rate_inc,
+			cost_exc,
+			cost_inc,
+			days,
+			standing_charge_exc,
+			standing_charge_inc,
+			)
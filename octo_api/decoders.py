@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+#
+#  decoders.py
+"""
+Decoders for the JSON bodies of responses from the API.
+
+Responses are decoded straight from the bytes of their bodies, without first decoding them to :class:`str`.
+The standard library's :mod:`json` module is used by default, but `orjson <https://github.com/ijl/orjson>`_
+is considerably faster for large responses, such as pages of half-hourly consumption.
+It can be installed with the ``orjson`` extra:
+
+.. prompt:: bash
+
+	python -m pip install octo-api[orjson]
+
+.. code-block:: python
+
+	api = OctoAPI(api_key, decoder="auto")  # orjson if it is installed, otherwise json
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+from typing import Any, Callable, Union
+
+try:
+	# 3rd party
+	import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+	orjson = None
+
+__all__ = ["Decoder", "get_decoder", "decode_json"]
+
+#: A function which decodes the body of a response, as :class:`bytes`.
+Decoder = Callable[[bytes], Any]
+
+
+def decode_json(content: bytes) -> Any:
+	"""
+	Decode a JSON response body with the standard library's :mod:`json` module.
+
+	:param content:
+	"""
+
+	return json.loads(content)
+
+
+def get_decoder(decoder: Union[str, Decoder] = "json") -> Decoder:
+	"""
+	Returns the decoder with the given name.
+
+	:param decoder: Either ``'json'`` for the standard library's :mod:`json` module,
+		``'orjson'`` for :mod:`orjson`, or ``'auto'`` for :mod:`orjson` if it is installed and :mod:`json` otherwise.
+		Callables are returned unchanged.
+
+	:raises: :exc:`ValueError` if the name is unknown, or :exc:`ImportError` if :mod:`orjson` was requested
+		but is not installed.
+	"""
+
+	if callable(decoder):
+		return decoder
+
+	if decoder == "auto":
+		decoder = "json" if orjson is None else "orjson"
+
+	if decoder == "json":
+		return decode_json
+	elif decoder == "orjson":
+		if orjson is None:
+			raise ImportError("The 'orjson' decoder requires orjson to be installed.")
+		return orjson.loads
+	else:
+		raise ValueError(f"Unknown decoder {decoder!r}")
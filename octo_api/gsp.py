@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+#
+#  gsp.py
+"""
+Persistent cache of the grid supply points of postcodes.
+
+.. code-block:: python
+
+	api = OctoAPI(api_key, gsp_cache=GSPCache("gsp.db"))
+	api.get_grid_supply_point("SW1A 1AA")  # Only requested from the API once.
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from types import TracebackType
+from typing import Optional, Type
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+# this package
+from octo_api.utils import Region
+
+__all__ = ["GSPCache", "normalise_postcode"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postcodes (
+	postcode TEXT PRIMARY KEY,
+	gsp TEXT,
+	expires REAL,
+	last_used INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS postcodes_last_used ON postcodes (last_used);
+
+CREATE TABLE IF NOT EXISTS outward_codes (
+	outward_code TEXT PRIMARY KEY,
+	gsp TEXT,
+	count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# An outward code whose postcodes disagree on their GSP has its gsp set to NULL, and is never used again.
+# New outward codes are inserted with a count of zero and then counted by the update,
+# which avoids ``INSERT ... ON CONFLICT`` (requiring SQLite 3.24).
+_OUTWARD_INSERT = "INSERT OR IGNORE INTO outward_codes (outward_code, gsp, count) VALUES (?, ?, 0)"
+
+_OUTWARD_UPDATE = """
+UPDATE outward_codes SET count = count + 1, gsp = CASE WHEN gsp = ?2 THEN gsp ELSE NULL END
+WHERE outward_code = ?1
+"""
+
+_postcode_re = re.compile(r"^([A-Z]{1,2}[0-9][A-Z0-9]?)([0-9][A-Z]{2})$")
+
+
+def normalise_postcode(postcode: str) -> str:
+	"""
+	Normalise the case and spacing of a UK postcode, e.g. ``sw1a1aa`` to ``SW1A 1AA``.
+
+	Strings which do not look like postcodes are upper-cased and stripped of whitespace.
+
+	:param postcode:
+	"""
+
+	compact = ''.join(postcode.split()).upper()
+	match = _postcode_re.match(compact)
+
+	if match is None:
+		return compact
+	else:
+		return ' '.join(match.groups())
+
+
+def _outward_code(postcode: str) -> Optional[str]:
+	outward, space, inward = postcode.partition(' ')
+	return outward if space else None
+
+
+class GSPCache:
+	"""
+	Size-bounded, least-recently-used SQLite cache of the grid supply points of postcodes.
+
+	Postcodes which cannot be mapped to a grid supply point are also remembered, for ``negative_ttl``.
+
+	Once ``outward_threshold`` postcodes sharing an outward code (e.g. ``SW1A``) have been looked up,
+	and all are in the same region, other postcodes with that outward code are answered from the cache too.
+
+	:param filename: The filename of the database. By default the database is held in memory.
+	:param max_size: The maximum number of postcodes to keep.
+	:param negative_ttl: How long to remember that a postcode cannot be mapped to a grid supply point.
+	:param outward_threshold: The number of agreeing postcodes needed before an outward code is trusted.
+
+	The cache can be used as a context manager, which closes the database on exit.
+	"""
+
+	def __init__(
+			self,
+			filename: PathLike = ":memory:",
+			max_size: int = 100_000,
+			negative_ttl: timedelta = timedelta(days=1),
+			outward_threshold: int = 3,
+			):
+
+		#: The maximum number of postcodes to keep.
+		self.max_size: int = max_size
+
+		#: How long to remember that a postcode cannot be mapped to a grid supply point.
+		self.negative_ttl: timedelta = negative_ttl
+
+		#: The number of agreeing postcodes needed before an outward code is trusted.
+		self.outward_threshold: int = outward_threshold
+
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(os.fspath(filename), check_same_thread=False)
+
+		with self._connection:
+			self._connection.executescript(_SCHEMA)
+
+		self._size, clock = self._connection.execute("SELECT COUNT(*), MAX(last_used) FROM postcodes").fetchone()
+		self._clock: int = clock or 0
+
+	def get(self, postcode: str) -> Optional[Region]:
+		"""
+		Returns the grid supply point of the given postcode, or :py:obj:`None` if it is not in the cache.
+
+		:param postcode:
+
+		:raises: :exc:`ValueError` if the postcode is known not to map to a grid supply point.
+		"""
+
+		postcode = normalise_postcode(postcode)
+
+		with self._lock, self._connection:
+			row = self._connection.execute(
+					"SELECT gsp, expires FROM postcodes WHERE postcode = ?",
+					(postcode, ),
+					).fetchone()
+
+			if row is not None and row[0] is None and row[1] <= time.time():
+				self._connection.execute("DELETE FROM postcodes WHERE postcode = ?", (postcode, ))
+				self._size -= 1
+				row = None
+
+			if row is not None:
+				self._clock += 1
+				self._connection.execute(
+						"UPDATE postcodes SET last_used = ? WHERE postcode = ?",
+						(self._clock, postcode),
+						)
+
+				if row[0] is None:
+					negative = True
+				else:
+					return Region(row[0])
+
+			else:
+				negative = False
+				outward_code = _outward_code(postcode)
+
+				if outward_code is not None:
+					row = self._connection.execute(
+							"SELECT gsp FROM outward_codes WHERE outward_code = ? AND count >= ?",
+							(outward_code, self.outward_threshold),
+							).fetchone()
+
+		# Raised outside of the transaction so the postcode is still marked as used.
+		if negative:
+			raise ValueError(f"Cannot map the postcode {postcode!r} to a GSP.")
+
+		if row is None or row[0] is None:
+			return None
+
+		return Region(row[0])
+
+	def set(self, postcode: str, gsp: Optional[Region]) -> None:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Store the grid supply point of the given postcode.
+
+		:param postcode:
+		:param gsp: The grid supply point, or :py:obj:`None` if the postcode cannot be mapped to one.
+		"""
+
+		postcode = normalise_postcode(postcode)
+		expires = None if gsp is not None else time.time() + self.negative_ttl.total_seconds()
+		value = None if gsp is None else str(gsp)
+
+		with self._lock, self._connection:
+			previous = self._connection.execute(
+					"SELECT gsp FROM postcodes WHERE postcode = ?",
+					(postcode, ),
+					).fetchone()
+
+			self._clock += 1
+			self._connection.execute(
+					"INSERT OR REPLACE INTO postcodes (postcode, gsp, expires, last_used) VALUES (?, ?, ?, ?)",
+					(postcode, value, expires, self._clock),
+					)
+
+			if previous is None:
+				self._size += 1
+
+			# Only count each postcode towards its outward code once.
+			outward_code = _outward_code(postcode)
+			if value is not None and outward_code is not None and (previous is None or previous[0] is None):
+				self._connection.execute(_OUTWARD_INSERT, (outward_code, value))
+				self._connection.execute(_OUTWARD_UPDATE, (outward_code, value))
+
+			if self._size > self.max_size:
+				excess = self._size - self.max_size
+				self._connection.execute(
+						"DELETE FROM postcodes WHERE postcode IN "
+						"(SELECT postcode FROM postcodes ORDER BY last_used LIMIT ?)",
+						(excess, ),
+						)
+				self._size -= excess
+
+	def clear(self) -> None:
+		"""
+		Remove every postcode and outward code from the cache.
+		"""
+
+		with self._lock, self._connection:
+			self._connection.execute("DELETE FROM postcodes")
+			self._connection.execute("DELETE FROM outward_codes")
+			self._size = 0
+
+	def __len__(self) -> int:
+		return self._size
+
+	def close(self) -> None:
+		"""
+		Close the database.
+		"""
+
+		self._connection.close()
+
+	def __enter__(self) -> "GSPCache":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.close()
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} of {len(self)} postcodes>"
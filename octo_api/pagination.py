@@ -27,15 +27,36 @@ Class for handling paginated API responses.
 #
 
 # stdlib
-from typing import Any, Dict, Iterable, Iterator, List, MutableMapping, Optional, Type, TypeVar, Union, overload
-from urllib.parse import parse_qs, urlparse
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+from typing import (
+		Any,
+		AsyncGenerator,
+		AsyncIterable,
+		AsyncIterator,
+		Awaitable,
+		Callable,
+		Deque,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		MutableMapping,
+		Optional,
+		Type,
+		Tuple,
+		TypeVar,
+		Union,
+		overload
+		)
 
 # 3rd party
 from apeye.slumber_url import SlumberURL
 from domdf_python_tools.doctools import prettify_docstrings
 from typing_extensions import TypedDict
 
-__all__ = ["OctoResponse", "PaginatedResponse"]
+__all__ = ["OctoResponse", "PaginatedResponse", "AsyncPaginatedResponse"]
 
 _T = TypeVar("_T")
 
@@ -56,6 +77,47 @@ class OctoResponse(TypedDict):
 	results: List[Dict[str, Any]]
 
 
+def _converter(obj_type: Type) -> Callable[[List[Dict[str, Any]]], List[Any]]:
+	"""
+	Returns a function to convert the data for the items in a page of results to ``obj_type``.
+
+	:param obj_type:
+	"""
+
+	from_rows = getattr(obj_type, "_from_rows", None)
+	if from_rows is not None:
+		return from_rows
+
+	from_dict = getattr(obj_type, "_from_dict", None)
+	if from_dict is not None:
+
+		def convert(results: List[Dict[str, Any]]) -> List[Any]:
+			return list(map(from_dict, results))  # type: ignore[arg-type]
+
+	else:
+
+		def convert(results: List[Dict[str, Any]]) -> List[Any]:
+			return [obj_type(**res) for res in results]
+
+	return convert
+
+
+def _page_layout(response: OctoResponse) -> Tuple[int, int]:
+	"""
+	Returns the page size and the number of pages for a paginated response, given its first page.
+
+	:param response:
+	"""
+
+	# Every page but the last is full, so the size of the first page gives the size of every page.
+	page_size = max(len(response["results"]), 1)
+
+	if response["next"] is None:
+		return page_size, 1
+	else:
+		return page_size, max(-(-response["count"] // page_size), 1)
+
+
 @prettify_docstrings
 class PaginatedResponse(Iterable[_T]):
 	"""
@@ -67,6 +129,15 @@ class PaginatedResponse(Iterable[_T]):
 	:param query_url: The initial query URL.
 	:param query_params: The parameters to the query.
 	:param obj_type: The object to convert the response data to.
+		A ``_from_rows`` classmethod on the object is called with the data for each page,
+		or failing that a ``_from_dict`` classmethod is called with the data for each item.
+		Otherwise the data for each item is passed to the object as keyword arguments.
+	:param max_workers: The maximum number of pages to fetch concurrently when iterating.
+		If :py:obj:`None` (the default) the pages are fetched one after another.
+	:no-default max_workers:
+	:param stream: If :py:obj:`True`, pages fetched while iterating are discarded once their items have been yielded.
+		See :meth:`~.PaginatedResponse.iter_stream`.
+	:no-default stream:
 
 	.. note::
 
@@ -87,77 +158,124 @@ class PaginatedResponse(Iterable[_T]):
 		See https://www.django-rest-framework.org/api-guide/pagination/ for more information.
 	"""
 
-	_next_page: Optional[int]
-	_previous_page: Optional[int]
-	_results: List[Dict[str, Any]]
+	_pages: Dict[int, List[Dict[str, Any]]]
 
 	def __init__(
 			self,
 			query_url: SlumberURL,
 			query_params: Optional[MutableMapping[str, Any]] = None,
 			obj_type: Type = dict,
+			max_workers: Optional[int] = None,
+			stream: bool = False,
 			):
 
-		response: OctoResponse = query_url.get(**query_params)  # type: ignore[assignment,arg-type]
-
 		if query_params is None:
 			query_params = {}
 
+		response: OctoResponse = query_url.get(**query_params)  # type: ignore[assignment]
+
 		self.query_url: SlumberURL = query_url
 		self.query_params: Dict[str, Any] = dict(query_params)
 		self.obj_type = obj_type
+		self._convert: Callable[[List[Dict[str, Any]]], List[Any]] = _converter(obj_type)
+
+		#: The maximum number of pages to fetch concurrently when iterating.
+		self.max_workers: Optional[int] = max_workers
+
+		#: Whether pages fetched while iterating are discarded once their items have been yielded.
+		self.stream: bool = stream
 
 		self._count: int = response["count"]
+		self._page_size, self._num_pages = _page_layout(response)
 
-		self._results = response["results"]
+		# Sparse mapping of (1-based) page numbers to the results on that page.
+		self._pages = {1: response["results"]}
 
-		self._next_page = None
-		self._previous_page = None
-		self._parse_pages(response)
+	def _fetch_page(self, page: int) -> OctoResponse:
+		return self.query_url.get(page=page, **self.query_params)  # type: ignore[return-value]
 
-	def _parse_pages(self, response: OctoResponse) -> None:
-		if response["next"] is not None:
-			query = parse_qs(urlparse(response["next"]).query)
-			page = query.get("page", [])
-			if page:
-				self._next_page = int(page[0])
-			else:
-				self._next_page = None
-		else:
-			self._next_page = None
+	def _get_page(self, page: int) -> List[Dict[str, Any]]:
+		"""
+		Returns the results on the given page, fetching the page if it has not been retrieved already.
+
+		:param page: The (1-based) page number.
+		"""
+
+		if page not in self._pages:
+			self._pages[page] = self._fetch_page(page)["results"]
 
-		if response["previous"] is not None:
-			query = parse_qs(urlparse(response["previous"]).query)
-			page = query.get("page", [])
-			if page:
-				self._previous_page = int(page[0])
+		return self._pages[page]
+
+	def _iter_pages(self, pages: Iterable[int]) -> Iterator[OctoResponse]:
+		"""
+		Fetch the given pages, yielding the responses in the order the pages were given.
+
+		If :attr:`~.max_workers` is greater than one the pages are fetched concurrently,
+		with no more than :attr:`~.max_workers` requests in flight at once.
+
+		:param pages: The page numbers to fetch.
+		"""
+
+		if not self.max_workers or self.max_workers <= 1:
+			for page in pages:
+				yield self._fetch_page(page)
+			return
+
+		pending: Deque["Future[OctoResponse]"] = deque()
+
+		with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+			try:
+				for page in pages:
+					pending.append(executor.submit(self._fetch_page, page))
+					if len(pending) > self.max_workers:
+						yield pending.popleft().result()
+
+				while pending:
+					yield pending.popleft().result()
+
+			finally:
+				for future in pending:
+					future.cancel()
+
+	def _iter_page_results(self, retain: bool = True) -> Iterator[List[Dict[str, Any]]]:
+		"""
+		Iterate over the results on each page, in order, fetching any pages which have not been retrieved already.
+
+		:param retain: Whether to store the fetched pages for later use.
+		"""
+
+		retrieved = set(self._pages)
+		missing = self._iter_pages(page for page in range(1, self._num_pages + 1) if page not in retrieved)
+
+		for page in range(1, self._num_pages + 1):
+			if page in retrieved:
+				yield self._pages[page]
 			else:
-				self._previous_page = None
-		else:
-			self._previous_page = None
+				results = next(missing)["results"]
+				if retain:
+					self._pages[page] = results
+				yield results
 
-	def _get_next_page(self) -> List[Dict[str, Any]]:
-		# print(f"Getting {self._next_page}")
-		response: OctoResponse = self.query_url.get(  # type: ignore[assignment]
-			page=self._next_page,
-			**self.query_params,
-			)
+	def iter_stream(self) -> Iterator[_T]:
+		"""
+		Iterate over items in the :class:`~.PaginatedResponse` without retaining the pages fetched along the way.
 
-		self._results.extend(response["results"])
-		self._parse_pages(response)
-		return response["results"]
+		Each page is discarded once its items have been yielded, so memory usage is bounded by
+		the size of a page (or :attr:`~.max_workers` pages when fetching concurrently)
+		regardless of the total number of items.
+		Subsequent iterations will fetch those pages again.
+		"""
+
+		for results in self._iter_page_results(retain=False):
+			yield from self._convert(results)
 
 	def __iter__(self) -> Iterator[_T]:
 		"""
 		Iterate over items in the :class:`~.PaginatedResponse`.
 		"""
 
-		for res in self._results:
-			yield self.obj_type(**res)
-
-		while self._next_page:
-			for res in self._get_next_page():
-				yield self.obj_type(**res)
+		for results in self._iter_page_results(retain=not self.stream):
+			yield from self._convert(results)
 
 	def __eq__(self, other) -> bool:  # noqa: MAN001
 		if isinstance(other, Iterable):
@@ -185,24 +303,154 @@ class PaginatedResponse(Iterable[_T]):
 		"""
 		Returns the item or items in the :class:`~.PaginatedResponse`, as given by the index or slice.
 
+		Only the pages containing the requested items are fetched.
+		Slices follow the same semantics as for a :class:`list`.
+
 		:param item:
 		"""
 
 		if isinstance(item, int):
-			if item >= len(self):
+			if item < 0:
+				item += len(self)
+			if not 0 <= item < len(self):
 				raise IndexError("index out of range")
-			else:
-				while item >= len(self._results):
-					# print(item, len(self._results))
-					self._get_next_page()
 
-				return self.obj_type(**self._results[item])
+			page, offset = divmod(item, self._page_size)
+			return self._convert([self._get_page(page + 1)[offset]])[0]
 
 		elif isinstance(item, slice):
-			max_idx = item.stop + 1
-			if max_idx >= len(self):
-				max_idx = len(self)
-			return [self[idx] for idx in range(item.start or 0, max_idx, item.step or 1)]
+			indices = range(*item.indices(len(self)))
+			page_size = self._page_size
+
+			pages = {idx // page_size + 1 for idx in indices}
+			missing = sorted(page for page in pages if page not in self._pages)
+			for page, response in zip(missing, self._iter_pages(missing)):
+				self._pages[page] = response["results"]
+
+			return self._convert([self._pages[idx // page_size + 1][idx % page_size] for idx in indices])
 
 		else:
 			return NotImplemented
+
+
+@prettify_docstrings
+class AsyncPaginatedResponse(AsyncIterable[_T]):
+	"""
+	Represents a multi-page response from a REST API, for use with :mod:`asyncio`.
+
+	The items within the response can be iterated over with ``async for``,
+	and the total number of items can be accessed with :func:`len(response) <len>`.
+	The remaining pages are fetched concurrently while iterating.
+
+	Instances should be created with :meth:`~.AsyncPaginatedResponse.fetch`,
+	which retrieves the first page of results.
+
+	:param get: Coroutine function which performs a GET request for the query,
+		taking the query parameters as keyword arguments and returning the decoded JSON response.
+	:param response: The first page of results.
+	:param query_params: The parameters to the query.
+	:param obj_type: The object to convert the response data to.
+	:param max_workers: The maximum number of pages to fetch concurrently.
+
+	See :class:`~.PaginatedResponse` for the expected format of the responses.
+	"""
+
+	_pages: Dict[int, List[Dict[str, Any]]]
+
+	def __init__(
+			self,
+			get: Callable[..., Awaitable[OctoResponse]],
+			response: OctoResponse,
+			query_params: Optional[MutableMapping[str, Any]] = None,
+			obj_type: Type = dict,
+			max_workers: int = 4,
+			):
+
+		if query_params is None:
+			query_params = {}
+
+		self._get = get
+		self.query_params: Dict[str, Any] = dict(query_params)
+		self.obj_type = obj_type
+		self._convert: Callable[[List[Dict[str, Any]]], List[Any]] = _converter(obj_type)
+
+		#: The maximum number of pages to fetch concurrently.
+		self.max_workers: int = max_workers
+
+		self._count: int = response["count"]
+		self._page_size, self._num_pages = _page_layout(response)
+		self._pages = {1: response["results"]}
+
+	@classmethod
+	async def fetch(
+			cls,
+			get: Callable[..., Awaitable[OctoResponse]],
+			query_params: Optional[MutableMapping[str, Any]] = None,
+			obj_type: Type = dict,
+			max_workers: int = 4,
+			) -> "AsyncPaginatedResponse":
+		"""
+		Fetch the first page of results and construct an :class:`~.AsyncPaginatedResponse`.
+
+		:param get: Coroutine function which performs a GET request for the query,
+			taking the query parameters as keyword arguments and returning the decoded JSON response.
+		:param query_params: The parameters to the query.
+		:param obj_type: The object to convert the response data to.
+		:param max_workers: The maximum number of pages to fetch concurrently.
+		"""
+
+		response = await get(**(query_params or {}))
+		return cls(get, response, query_params=query_params, obj_type=obj_type, max_workers=max_workers)
+
+	async def _fetch_page(self, page: int) -> OctoResponse:
+		return await self._get(page=page, **self.query_params)
+
+	async def _iter_pages(self, pages: Iterable[int]) -> AsyncGenerator[OctoResponse, None]:
+		"""
+		Fetch the given pages, yielding the responses in the order the pages were given.
+
+		No more than :attr:`~.max_workers` requests are in flight at once.
+
+		:param pages: The page numbers to fetch.
+		"""
+
+		pending: Deque["asyncio.Future[OctoResponse]"] = deque()
+
+		try:
+			for page in pages:
+				pending.append(asyncio.ensure_future(self._fetch_page(page)))
+				if len(pending) >= max(self.max_workers, 1):
+					yield await pending.popleft()
+
+			while pending:
+				yield await pending.popleft()
+
+		finally:
+			for future in pending:
+				future.cancel()
+
+	async def __aiter__(self) -> AsyncIterator[_T]:
+		"""
+		Iterate over items in the :class:`~.AsyncPaginatedResponse`.
+		"""
+
+		retrieved = set(self._pages)
+		missing = self._iter_pages(page for page in range(1, self._num_pages + 1) if page not in retrieved)
+
+		try:
+			for page in range(1, self._num_pages + 1):
+				if page not in retrieved:
+					self._pages[page] = (await missing.__anext__())["results"]
+
+				for obj in self._convert(self._pages[page]):
+					yield obj
+
+		finally:
+			await missing.aclose()
+
+	def __len__(self) -> int:
+		"""
+		Returns the number of items in the :class:`~.AsyncPaginatedResponse`.
+		"""
+
+		return self._count
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+#
+#  planner.py
+"""
+Split long consumption and tariff-charge queries into independent sub-ranges which are fetched concurrently.
+
+The API limits the size of each page of results, and the pages of a single
+:class:`~octo_api.pagination.PaginatedResponse` are linked one after another.
+A :class:`~.QueryPlanner` instead divides the requested period into sub-ranges which each fit into a single page
+of the maximum size, requests them in parallel, and stitches the results back together.
+
+.. code-block:: python
+
+	planner = QueryPlanner(api, max_workers=8)
+	consumption = planner.get_consumption(
+			mpan, serial_number, "electricity",
+			period_from=datetime(2018, 1, 1),
+			period_to=datetime(2021, 1, 1),
+			)
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 3rd party
+from typing_extensions import Literal
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.utils import RateType, from_iso_zulu
+
+__all__ = ["QueryPlanner", "split_period"]
+
+_HALF_HOUR = timedelta(minutes=30)
+
+# The shortest possible length of each grouping of consumption.
+_GROUP_LENGTHS = {
+		None: _HALF_HOUR,
+		"hour": timedelta(hours=1),
+		"day": timedelta(days=1),
+		"week": timedelta(days=7),
+		"month": timedelta(days=28),
+		"quarter": timedelta(days=89),
+		}
+
+# Used in place of a missing start, e.g. for a charge which has always applied.
+_EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
+
+_MAX_CONSUMPTION_PAGE = 25000
+_MAX_TARIFF_CHARGES_PAGE = 1500
+
+
+def split_period(
+		period_from: datetime,
+		period_to: datetime,
+		interval: timedelta,
+		max_items: int,
+		) -> List[Tuple[datetime, datetime]]:
+	"""
+	Split the period between ``period_from`` and ``period_to`` into consecutive sub-ranges,
+	each of which contains at most ``max_items`` items of length ``interval``.
+
+	The sub-ranges are shortened by two items, to allow for partial items overlapping either end.
+
+	:param period_from:
+	:param period_to:
+	:param interval: The length of each item.
+	:param max_items: The maximum number of items in each sub-range.
+	"""  # noqa: D400
+
+	if max_items < 3:
+		raise ValueError("'max_items' must be at least 3")
+
+	step = interval * (max_items - 2)
+	ranges = []
+
+	start = period_from
+	while start < period_to:
+		end = min(start + step, period_to)
+		ranges.append((start, end))
+		start = end
+
+	return ranges
+
+
+class QueryPlanner:
+	"""
+	Fetches long periods of consumption or tariff charges as concurrent, independent sub-range queries.
+
+	:param api:
+	:param max_workers: The maximum number of sub-ranges to fetch concurrently.
+	"""
+
+	def __init__(self, api: OctoAPI, max_workers: int = 4):
+
+		#: The interface to the Octopus Energy API.
+		self.api: OctoAPI = api
+
+		#: The maximum number of sub-ranges to fetch concurrently.
+		self.max_workers: int = max_workers
+
+	def _run(
+			self,
+			ranges: List[Tuple[datetime, datetime]],
+			fetch: Callable[[datetime, datetime], Iterable[Any]],
+			key: Callable[[Any], datetime],
+			) -> List[Any]:
+		"""
+		Fetch each of the sub-ranges, and stitch the results together in order, removing duplicates.
+
+		:param ranges:
+		:param fetch: Function which returns the results for a sub-range.
+		:param key: Function which returns the start of the period an item covers.
+		"""
+
+		def fetch_all(period: Tuple[datetime, datetime]) -> List[Any]:
+			return list(fetch(*period))
+
+		if self.max_workers > 1 and len(ranges) > 1:
+			with ThreadPoolExecutor(max_workers=min(self.max_workers, len(ranges))) as executor:
+				results = list(executor.map(fetch_all, ranges))
+		else:
+			results = list(map(fetch_all, ranges))
+
+		by_start: Dict[datetime, Any] = {}
+		for item in chain.from_iterable(results):
+			by_start.setdefault(key(item), item)
+
+		return [by_start[start] for start in sorted(by_start)]
+
+	def get_consumption(
+			self,
+			mpan: str,
+			serial_number: str,
+			fuel: Literal["electricity", "gas"],
+			period_from: datetime,
+			period_to: Optional[datetime] = None,
+			group_by: Optional[str] = None,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> List[Any]:
+		"""
+		Return the consumption between ``period_from`` and ``period_to`` for a given meter-point and meter,
+		ordered from oldest to newest.
+
+		The arguments are the same as for :meth:`OctoAPI.get_consumption <.OctoAPI.get_consumption>`.
+
+		:param mpan: The electricity meter-point's MPAN or gas meter-point's MPRN.
+		:param serial_number: The meter's serial number.
+		:param fuel:
+		:param period_from: Show consumption for periods which start at or after the given datetime.
+		:param period_to: Show consumption for periods which start at or before the given datetime.
+			Defaults to the current time.
+		:param group_by: The grouping of the consumption data.
+		:param rows: The representation of each period in the results.
+		"""  # noqa: D400
+
+		if group_by not in _GROUP_LENGTHS:
+			raise ValueError(f"Unknown grouping {group_by!r}")
+
+		ranges = split_period(
+				period_from,
+				_now(period_from) if period_to is None else period_to,
+				_GROUP_LENGTHS[group_by],
+				_MAX_CONSUMPTION_PAGE,
+				)
+
+		def fetch(start: datetime, end: datetime) -> Iterable[Any]:
+			return self.api.get_consumption(
+					mpan,
+					serial_number,
+					fuel,
+					period_from=start,
+					period_to=end,
+					page_size=_MAX_CONSUMPTION_PAGE,
+					group_by=group_by,
+					stream=True,
+					rows=rows,
+					)
+
+		return self._run(ranges, fetch, _key("interval_start", rows))
+
+	def get_tariff_charges(
+			self,
+			product_code: str,
+			tariff_code: str,
+			fuel: Literal["electricity", "gas"],
+			rate_type: RateType,
+			period_from: datetime,
+			period_to: Optional[datetime] = None,
+			rows: Literal["object", "tuple", "dict"] = "object",
+			) -> List[Any]:
+		"""
+		Returns the unit rates or standing charges between ``period_from`` and ``period_to``,
+		ordered from oldest to newest.
+
+		The arguments are the same as for :meth:`OctoAPI.get_tariff_charges <.OctoAPI.get_tariff_charges>`.
+		The sub-ranges are sized to fit a month of half-hourly prices, such as for the Agile Octopus product,
+		into each page.
+
+		:param product_code: The code of the product to be retrieved, for example ``VAR-17-01-11``.
+		:param tariff_code: The code of the tariff to be retrieved, for example ``E-1R-VAR-17-01-11-A``.
+		:param fuel:
+		:param rate_type:
+		:param period_from: Show charges active from the given datetime (inclusive).
+		:param period_to: Show charges active up to the given datetime (exclusive).
+			Defaults to the current time.
+		:param rows: The representation of each time period in the results.
+		"""  # noqa: D400
+
+		ranges = split_period(
+				period_from,
+				_now(period_from) if period_to is None else period_to,
+				_HALF_HOUR,
+				_MAX_TARIFF_CHARGES_PAGE,
+				)
+
+		def fetch(start: datetime, end: datetime) -> Iterable[Any]:
+			return self.api.get_tariff_charges(
+					product_code,
+					tariff_code,
+					fuel,
+					rate_type,
+					period_from=start,
+					period_to=end,
+					page_size=_MAX_TARIFF_CHARGES_PAGE,
+					stream=True,
+					rows=rows,
+					)
+
+		return self._run(ranges, fetch, _key("valid_from", rows))
+
+
+def _key(field: str, rows: str) -> Callable[[Any], datetime]:
+	"""
+	Returns a function to obtain the start of the period each item in the results covers.
+
+	:param field: The name of the field containing the start of the period.
+	:param rows: The representation of the results.
+	"""
+
+	if rows == "dict":
+		return lambda item: from_iso_zulu(item[field]) or _EARLIEST
+	else:
+		return lambda item: getattr(item, field) or _EARLIEST
+
+
+def _now(like: datetime) -> datetime:
+	"""
+	Returns the current time, as an aware datetime if ``like`` is aware, or a naïve datetime in UTC otherwise.
+
+	:param like:
+	"""
+
+	now = datetime.now(timezone.utc)
+	return now if like.tzinfo is not None else now.replace(tzinfo=None)
@@ -27,9 +27,27 @@ Classes to model products and tariffs.
 #
 
 # stdlib
+import sys
+from collections.abc import ItemsView, ValuesView
 from datetime import datetime
-from itertools import chain
-from typing import Any, Dict, Iterable, List, MutableMapping, NamedTuple, Optional, TypeVar, Union
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import (
+		Any,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		MutableMapping,
+		NamedTuple,
+		Optional,
+		Sequence,
+		Tuple,
+		Type,
+		TypeVar,
+		Union
+		)
 
 # 3rd party
 import attr
@@ -39,7 +57,7 @@ from domdf_python_tools.doctools import prettify_docstrings
 from domdf_python_tools.stringlist import DelimitedList
 
 # this package
-from octo_api.utils import add_repr, from_iso_zulu
+from octo_api.utils import Region, _from_columns, add_repr, from_iso_zulu, parse_iso_zulu_batch
 
 __all__ = [
 		"BaseProduct",
@@ -47,6 +65,7 @@ __all__ = [
 		"DetailedProduct",
 		"Tariff",
 		"RateInfo",
+		"RateInfoRow",
 		"RegionalTariffs",
 		"RegionalQuotes",
 		]
@@ -65,8 +84,23 @@ def _term_converter(term: Optional[int]) -> Optional[int]:
 		return int(term)
 
 
-def _links_converter(iterable: Iterable[MutableMapping[str, Any]]) -> List[MutableMapping[str, Any]]:
-	return list(iterable)
+_INTERNED_LINK_KEYS = frozenset({"method", "rel"})
+
+
+def _links_converter(iterable: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+	"""
+	Converter function for the ``links`` of :class:`~.BaseProduct` and :class:`~.Tariff`.
+
+	The ``method`` and ``rel`` values are interned, as the API only uses a handful of them.
+
+	:param iterable:
+	"""
+
+	return list(map(_intern_link, iterable))
+
+
+def _intern_link(link: Mapping[str, Any]) -> Dict[str, Any]:
+	return {key: sys.intern(value) if key in _INTERNED_LINK_KEYS else value for key, value in link.items()}
 
 
 @serde
@@ -134,44 +168,68 @@ class Product(BaseProduct):
 	#: The direction of the product (supply to the customer or supply to the grid).
 	direction: str = attr.ib(converter=str)
 
-
-def _parse_tariffs(tariffs_dict: Dict[str, Dict[str, Dict[str, Any]]]) -> "RegionalTariffs":
+	@classmethod
+	def _from_rows(cls, rows: Sequence[Dict[str, Any]]) -> List["Product"]:
+		"""
+		Construct :class:`~.Product` objects from a page of results from the API,
+		bypassing the per-object converters.
+
+		:param rows:
+		"""  # noqa: D400
+
+		columns: Dict[str, Iterable[Any]] = {
+				name: map(itemgetter(name), rows)
+				for name in (
+						"brand",
+						"code",
+						"description",
+						"display_name",
+						"full_name",
+						"is_business",
+						"is_green",
+						"is_prepay",
+						"is_restricted",
+						"is_tracker",
+						"is_variable",
+						"term",
+						"direction",
+						)
+				}
+		columns["available_from"] = parse_iso_zulu_batch(list(map(itemgetter("available_from"), rows)))
+		columns["available_to"] = parse_iso_zulu_batch(list(map(itemgetter("available_to"), rows)))
+		columns["links"] = map(_links_converter, map(itemgetter("links"), rows))
+
+		return _from_columns(cls, len(rows), columns)
+
+
+def _parse_tariffs(tariffs_dict: Mapping[str, Dict[str, Dict[str, Any]]]) -> "RegionalTariffs":
 	"""
 	Parse tariff data for a :class:`~.DetailedProduct`.
 
+	The tariffs for each GSP are only constructed when that GSP is first accessed.
+
 	:param tariffs_dict:
 	"""
 
-	tariffs: RegionalTariffs = RegionalTariffs()
-
-	for gsp, payment_methods in tariffs_dict.items():
-		tariffs[gsp] = {}
-
-		for method, tariff in payment_methods.items():
-			tariffs[gsp][method] = Tariff(**tariff)
+	if isinstance(tariffs_dict, RegionalTariffs):
+		return tariffs_dict
 
-	return tariffs
+	return RegionalTariffs._from_raw(tariffs_dict)
 
 
-def _parse_quotes(quotes_dict: Dict[str, Dict[str, Dict[str, Any]]]) -> "RegionalQuotes":
+def _parse_quotes(quotes_dict: Mapping[str, Dict[str, Dict[str, Any]]]) -> "RegionalQuotes":
 	"""
 	Parse quote data for a :class:`~.DetailedProduct`.
 
+	The quotes for each GSP are only constructed when that GSP is first accessed.
+
 	:param quotes_dict:
 	"""
 
-	quotes: RegionalQuotes = RegionalQuotes()
-
-	for gsp, payment_methods in quotes_dict.items():
-		quotes[gsp] = {}
+	if isinstance(quotes_dict, RegionalQuotes):
+		return quotes_dict
 
-		for method, fuels in payment_methods.items():
-			quotes[gsp][method] = {}
-
-			for fuel, quote in fuels.items():
-				quotes[gsp][method][fuel] = Quote(**quote)
-
-	return quotes
+	return RegionalQuotes._from_raw(quotes_dict)
 
 
 @serde
@@ -234,7 +292,7 @@ class Tariff:
 	dual_fuel_discount_inc_vat: int = attr.ib(converter=int)
 	exit_fees_exc_vat: int = attr.ib(converter=int)
 	exit_fees_inc_vat: int = attr.ib(converter=int)
-	links: List[Dict[str, Any]] = attr.ib(converter=list)
+	links: List[Dict[str, Any]] = attr.ib(converter=_links_converter)
 
 	#: In p/kWh (pence per kilowatt hour).
 	standard_unit_rate_exc_vat: Optional[float] = attr.ib(default=None)
@@ -286,6 +344,65 @@ class RateInfo:
 	#: The date and time until which this rate is in effect, or :py:obj:`None` if this rate continues in perpetuity.
 	valid_to: Optional[datetime] = attr.ib(converter=from_iso_zulu)
 
+	@classmethod
+	def _from_rows(cls, rows: Sequence[Dict[str, Any]]) -> List["RateInfo"]:
+		"""
+		Construct :class:`~.RateInfo` objects from a page of results from the API,
+		bypassing the per-object converters.
+
+		:param rows:
+		"""  # noqa: D400
+
+		return _from_columns(
+				cls,
+				len(rows),
+				{
+						"value_exc_vat": map(float, map(itemgetter("value_exc_vat"), rows)),
+						"value_inc_vat": map(float, map(itemgetter("value_inc_vat"), rows)),
+						"valid_from": parse_iso_zulu_batch(list(map(itemgetter("valid_from"), rows))),
+						"valid_to": parse_iso_zulu_batch(list(map(itemgetter("valid_to"), rows))),
+						},
+				)
+
+
+@prettify_docstrings
+class RateInfoRow(NamedTuple):
+	"""
+	Lightweight representation of the unit rate of a tariff at a particular period in time.
+
+	This has the same fields as :class:`~.RateInfo`, but is considerably cheaper to construct.
+
+	:param value_exc_vat: In p/kWh (pence per kilowatt hour).
+	:param value_inc_vat: In p/kWh (pence per kilowatt hour).
+	:param valid_from: The date and time from which this rate is in effect.
+	:param valid_to: The date and time until which this rate is in effect,
+		or :py:obj:`None` if this rate continues in perpetuity.
+	"""
+
+	value_exc_vat: float
+	value_inc_vat: float
+	valid_from: datetime
+	valid_to: Optional[datetime]
+
+	@classmethod
+	def _from_dict(cls, octopus_dict: Dict[str, Any]) -> "RateInfoRow":
+		return cls(
+				float(octopus_dict["value_exc_vat"]),
+				float(octopus_dict["value_inc_vat"]),
+				from_iso_zulu(octopus_dict["valid_from"]),  # type: ignore[arg-type]
+				from_iso_zulu(octopus_dict["valid_to"]),
+				)
+
+	@classmethod
+	def _from_rows(cls, rows: Sequence[Dict[str, Any]]) -> List["RateInfoRow"]:
+		columns = zip(
+				map(float, map(itemgetter("value_exc_vat"), rows)),
+				map(float, map(itemgetter("value_inc_vat"), rows)),
+				parse_iso_zulu_batch(list(map(itemgetter("valid_from"), rows))),
+				parse_iso_zulu_batch(list(map(itemgetter("valid_to"), rows))),
+				)
+		return list(map(tuple.__new__, repeat(cls), columns))  # type: ignore[arg-type]
+
 
 _T = TypeVar("_T")
 
@@ -294,26 +411,153 @@ def _sortedset(iterable: Iterable[str]) -> DelimitedList:
 	return DelimitedList(sorted(set(iterable)))
 
 
+_V = TypeVar("_V")
+_L = TypeVar("_L", bound="_LazyRegional")
+
+
+class _Unparsed:
+	"""
+	The raw data for a GSP in a :class:`~._LazyRegional` mapping, which has not yet been parsed.
+	"""
+
+	__slots__ = ("value", )
+
+	def __init__(self, value: Dict[str, Any]):
+		self.value = value
+
+
+def _raw(value: Any) -> Any:
+	return value.value if type(value) is _Unparsed else value
+
+
+def _region_key(gsp: str) -> str:
+	"""
+	Returns the :class:`~octo_api.utils.Region` for the given GSP, or the interned string if it is not recognised.
+
+	:param gsp:
+	"""
+
+	try:
+		return Region(gsp)
+	except ValueError:
+		return sys.intern(gsp)
+
+
+class _LazyRegional(Dict[str, _V]):
+	"""
+	Mapping of GSP regions to values which are parsed from the data returned by the API
+	the first time each region is accessed.
+
+	Recognised regions are keyed by :class:`~octo_api.utils.Region`, which compares equal to the GSP, e.g. ``_A``.
+	"""  # noqa: D400
+
+	@classmethod
+	def _from_raw(cls: Type[_L], raw: Mapping[str, Dict[str, Any]]) -> _L:
+		self = cls()
+		for gsp, value in raw.items():
+			dict.__setitem__(self, _region_key(gsp), _Unparsed(value))
+		return self
+
+	def _parse_region(self, value: Dict[str, Any]) -> _V:
+		raise NotImplementedError
+
+	def __getitem__(self, gsp: str) -> _V:
+		value: Any = dict.__getitem__(self, gsp)
+
+		if type(value) is _Unparsed:
+			value = self._parse_region(value.value)
+			dict.__setitem__(self, gsp, value)
+
+		return value
+
+	# Overriding __iter__ stops dict() and ** from copying the unparsed values directly.
+	def __iter__(self) -> Iterator[str]:
+		return dict.__iter__(self)
+
+	def get(self, gsp: str, default: Any = None) -> Any:
+		return self[gsp] if gsp in self else default
+
+	def values(self) -> "ValuesView[_V]":  # type: ignore[override]
+		return ValuesView(self)
+
+	def items(self) -> "ItemsView[str, _V]":  # type: ignore[override]
+		return ItemsView(self)
+
+	def pop(self, gsp: str, *default: Any) -> Any:
+		if gsp not in self:
+			return dict.pop(self, gsp, *default)
+
+		value = self[gsp]
+		dict.__delitem__(self, gsp)
+		return value
+
+	def popitem(self) -> Tuple[str, _V]:
+		if not self:
+			raise KeyError("popitem(): dictionary is empty")
+
+		# reversed() only supports dictionaries from Python 3.8.
+		gsp = list(dict.keys(self))[-1]
+		return gsp, self.pop(gsp)
+
+	def setdefault(self, gsp: str, default: Any = None) -> Any:
+		if gsp not in self:
+			self[gsp] = default
+		return self[gsp]
+
+	def copy(self: _L) -> _L:
+		new = type(self)()
+		for gsp, value in dict.items(self):
+			dict.__setitem__(new, gsp, value)
+		return new
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, _LazyRegional):
+			other = dict(other.items())
+		return dict(self.items()) == other
+
+	def __ne__(self, other: object) -> bool:
+		return not self == other
+
+	def __repr__(self) -> str:
+		return repr({str(gsp): value for gsp, value in self.items()})
+
+	def __reduce__(self) -> Tuple[Any, ...]:
+		return self.__class__, (), None, None, iter(self.items())
+
+
 @prettify_docstrings
-class RegionalTariffs(Dict[str, Dict[str, Tariff]]):
+class RegionalTariffs(_LazyRegional[Dict[str, Tariff]]):
 	"""
 	Mapping of GSP regions to a mapping of payment methods to :class:`Tariffs <.Tariff>`.
+
+	The :class:`~.Tariff` objects for each region are constructed when that region is first accessed.
 	"""
 
+	def _parse_region(self, value: Dict[str, Any]) -> Dict[str, Tariff]:
+		return {sys.intern(method): Tariff(**tariff) for method, tariff in value.items()}
+
 	def __str__(self) -> str:
-		payment_methods = _sortedset(chain.from_iterable(k.keys() for k in self.values()))
+		payment_methods = _sortedset(chain.from_iterable(_raw(k).keys() for k in dict.values(self)))
 		return f"{self.__class__.__name__}(['{payment_methods:, }'])"
 
 
 @prettify_docstrings
-class RegionalQuotes(Dict[str, Dict[str, Dict[str, Quote]]]):
+class RegionalQuotes(_LazyRegional[Dict[str, Dict[str, Quote]]]):
 	"""
 	Mapping of GSP regions to a mapping of payment methods to a mapping of fuel types to :class:`Quotes <.Quote>`.
+
+	The :class:`~.Quote` objects for each region are constructed when that region is first accessed.
 	"""
 
+	def _parse_region(self, value: Dict[str, Any]) -> Dict[str, Dict[str, Quote]]:
+		return {
+				sys.intern(method): {sys.intern(fuel): Quote(**quote) for fuel, quote in fuels.items()}
+				for method, fuels in value.items()
+				}
+
 	def __str__(self) -> str:
 		fuel_types = _sortedset(
-				chain.from_iterable(kk.keys() for kk in chain.from_iterable(k.values() for k in self.values()))
+				chain.from_iterable(kk.keys() for kk in chain.from_iterable(_raw(k).values() for k in dict.values(self)))
 				)
 		return f"{self.__class__.__name__}([{', '.join(fuel_types)}])"
 
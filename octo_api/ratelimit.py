@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+#
+#  ratelimit.py
+"""
+Client-wide rate limiting, and retrying of throttled or failed requests.
+
+A single :class:`~.RateLimiter` may be shared between an :class:`~octo_api.api.OctoAPI`
+and an :class:`~octo_api.async_api.AsyncOctoAPI`, and is safe to use from multiple threads and event loops.
+
+.. code-block:: python
+
+	limiter = RateLimiter(rate=20)
+	api = OctoAPI(api_key, rate_limiter=limiter)
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import asyncio
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AbstractSet, Optional
+
+__all__ = ["RateLimiter", "RETRY_STATUSES"]
+
+#: The HTTP status codes of responses which are retried by default.
+RETRY_STATUSES: AbstractSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+	"""
+	Token-bucket rate limiter, which also decides when and how long to wait before retrying a request.
+
+	:param rate: The sustained number of requests per second.
+	:param burst: The number of requests which may be made at once before being limited to ``rate``.
+		Defaults to ``rate``, rounded up.
+	:param max_retries: The maximum number of times to retry a request.
+	:param backoff_factor: The base delay, in seconds, for the exponential backoff between retries.
+		The ``n``\\th retry waits a random time of up to ``backoff_factor * 2 ** n`` seconds.
+	:param max_backoff: The maximum delay between retries, in seconds, unless the server requests a longer one.
+	:param retry_statuses: The HTTP status codes of responses which should be retried.
+	:no-default retry_statuses:
+
+	When the server responds with a ``Retry-After`` header, every request made through the limiter
+	is held back until that time has passed, not just the request which received it.
+	"""
+
+	def __init__(
+			self,
+			rate: float = 10,
+			burst: Optional[int] = None,
+			max_retries: int = 5,
+			backoff_factor: float = 0.5,
+			max_backoff: float = 60,
+			retry_statuses: AbstractSet[int] = RETRY_STATUSES,
+			):
+
+		if rate <= 0:
+			raise ValueError("'rate' must be greater than zero")
+
+		#: The sustained number of requests per second.
+		self.rate: float = rate
+
+		#: The number of requests which may be made at once before being limited to :attr:`~.RateLimiter.rate`.
+		self.burst: int = max(1, math.ceil(rate)) if burst is None else burst
+
+		#: The maximum number of times to retry a request.
+		self.max_retries: int = max_retries
+
+		#: The base delay, in seconds, for the exponential backoff between retries.
+		self.backoff_factor: float = backoff_factor
+
+		#: The maximum delay between retries, in seconds, unless the server requests a longer one.
+		self.max_backoff: float = max_backoff
+
+		#: The HTTP status codes of responses which should be retried.
+		self.retry_statuses: AbstractSet[int] = retry_statuses
+
+		self._lock = threading.Lock()
+		self._tokens: float = self.burst
+		self._updated = time.monotonic()
+		self._paused_until = 0.0
+
+	def _reserve(self) -> float:
+		"""
+		Take a token from the bucket, and return how long the caller must wait before using it.
+		"""
+
+		with self._lock:
+			now = time.monotonic()
+			self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+			self._updated = now
+
+			# The bucket may go into debt, which reserves the next token for this caller.
+			self._tokens -= 1
+			delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+			return max(delay, self._paused_until - now)
+
+	def acquire(self) -> None:
+		"""
+		Block until a request may be made.
+		"""
+
+		delay = self._reserve()
+		if delay > 0:
+			time.sleep(delay)
+
+	async def acquire_async(self) -> None:
+		"""
+		Wait, without blocking the event loop, until a request may be made.
+		"""
+
+		delay = self._reserve()
+		if delay > 0:
+			await asyncio.sleep(delay)
+
+	def should_retry(self, attempt: int, status: Optional[int] = None) -> bool:
+		"""
+		Returns whether a request should be retried.
+
+		:param attempt: The number of retries made so far.
+		:param status: The HTTP status code of the response,
+			or :py:obj:`None` if the request failed with a connection error.
+		"""
+
+		if attempt >= self.max_retries:
+			return False
+
+		return status is None or status in self.retry_statuses
+
+	def retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+		"""
+		Returns how long to wait, in seconds, before retrying a request.
+
+		If the server sent a ``Retry-After`` header all requests through the limiter are paused until then.
+		Otherwise the delay is a random time of up to ``backoff_factor * 2 ** attempt`` seconds.
+
+		:param attempt: The number of retries made so far.
+		:param retry_after: The value of the ``Retry-After`` header of the response, if any.
+		"""
+
+		delay = _parse_retry_after(retry_after)
+
+		if delay is None:
+			return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+
+		with self._lock:
+			self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+		return delay
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}(rate={self.rate!r}, burst={self.burst!r})"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+	"""
+	Parse the value of a ``Retry-After`` header, which may either be a number of seconds or a HTTP date.
+
+	:param value:
+
+	:returns: The number of seconds to wait, or :py:obj:`None` if the value is missing or invalid.
+	"""
+
+	if not value:
+		return None
+
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+
+	try:
+		retry_at = parsedate_to_datetime(value)
+	except (TypeError, ValueError, IndexError):
+		return None
+
+	if retry_at is None:
+		return None
+	if retry_at.tzinfo is None:
+		retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+	return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
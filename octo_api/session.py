@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+#
+#  session.py
+"""
+HTTP session shared by every request made through an :class:`~octo_api.api.OctoAPI`,
+and the URL class which decodes its responses.
+"""  # noqa: D400
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import time
+from typing import Any, Optional, Union
+
+# 3rd party
+import requests
+from apeye.slumber_url import SlumberURL
+from apeye.url import URL
+from requests.adapters import HTTPAdapter
+
+# this package
+from octo_api.cache import ResponseCache
+from octo_api.decoders import Decoder, decode_json
+from octo_api.ratelimit import RateLimiter
+
+__all__ = ["OctoSession", "OctoURL"]
+
+
+class OctoSession(requests.Session):
+	"""
+	A :class:`requests.Session` with a configurable pool of persistent (keep-alive) connections.
+
+	Responses are requested with ``gzip`` or ``deflate`` content encoding, and are transparently decompressed.
+
+	:param pool_connections: The number of hosts to keep connection pools for.
+	:param pool_maxsize: The maximum number of connections to keep open to each host.
+		This should be at least as large as the number of threads making requests concurrently,
+		e.g. the ``max_workers`` argument to :meth:`OctoAPI.get_consumption <.OctoAPI.get_consumption>`.
+	:param pool_block: Whether to block when no free connections are available,
+		rather than opening a connection which is discarded after use.
+	:param cache: An optional cache to serve ``GET`` requests from.
+	:param rate_limiter: An optional rate limiter to pace requests with,
+		which also retries throttled requests and transient errors.
+	"""
+
+	def __init__(
+			self,
+			pool_connections: int = 10,
+			pool_maxsize: int = 10,
+			pool_block: bool = False,
+			cache: Optional[ResponseCache] = None,
+			rate_limiter: Optional[RateLimiter] = None,
+			):
+
+		super().__init__()
+
+		#: The number of hosts to keep connection pools for.
+		self.pool_connections: int = pool_connections
+
+		#: The maximum number of connections to keep open to each host.
+		self.pool_maxsize: int = pool_maxsize
+
+		#: The cache ``GET`` requests are served from, if any.
+		self.cache: Optional[ResponseCache] = cache
+
+		#: The rate limiter requests are paced with, if any.
+		self.rate_limiter: Optional[RateLimiter] = rate_limiter
+
+		adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+		self.mount("https://", adapter)
+		self.mount("http://", adapter)
+
+		self.headers["Accept-Encoding"] = "gzip, deflate"
+		self.headers["Connection"] = "keep-alive"
+
+	def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+		"""
+		Send the given :class:`~requests.PreparedRequest`, serving it from the :attr:`~.OctoSession.cache` if possible.
+
+		:param request:
+		:param kwargs: Keyword arguments passed to :meth:`requests.Session.send`.
+		"""
+
+		cache = self.cache
+
+		if cache is None or request.method != "GET" or request.url is None:
+			return self._send(request, **kwargs)
+
+		ttl = cache.ttl_for(request.url)
+		if ttl is None:
+			return self._send(request, **kwargs)
+
+		key = cache.key(request.url, request.headers.get("Authorization"))
+		cached = cache.get(key)
+
+		if cached is not None:
+			if cached.fresh:
+				return cached.to_response(request)
+
+			if cached.etag:
+				request.headers["If-None-Match"] = cached.etag
+			if cached.last_modified:
+				request.headers["If-Modified-Since"] = cached.last_modified
+
+		response = self._send(request, **kwargs)
+
+		if cached is not None and response.status_code == 304:
+			response.close()
+			return cache.refresh(key, cached, ttl).to_response(request)
+
+		if response.status_code == 200 and not kwargs.get("stream", False):
+			cache.store(key, response, ttl)
+
+		return response
+
+	def _send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+		"""
+		Send the given :class:`~requests.PreparedRequest`,
+		pacing and retrying it with the :attr:`~.OctoSession.rate_limiter`.
+
+		:param request:
+		:param kwargs: Keyword arguments passed to :meth:`requests.Session.send`.
+		"""  # noqa: D400
+
+		limiter = self.rate_limiter
+
+		if limiter is None:
+			return super().send(request, **kwargs)
+
+		# Only idempotent requests are safe to retry.
+		retryable = request.method in {"GET", "HEAD", "OPTIONS"}
+		attempt = 0
+
+		while True:
+			limiter.acquire()
+
+			try:
+				response = super().send(request, **kwargs)
+			except (requests.ConnectionError, requests.Timeout):
+				if not (retryable and limiter.should_retry(attempt)):
+					raise
+				delay = limiter.retry_delay(attempt)
+			else:
+				if not (retryable and limiter.should_retry(attempt, response.status_code)):
+					return response
+				delay = limiter.retry_delay(attempt, response.headers.get("Retry-After"))
+				response.close()
+
+			time.sleep(delay)
+			attempt += 1
+
+
+class OctoURL(SlumberURL):
+	"""
+	A :class:`~apeye.slumber_url.SlumberURL` which decodes JSON responses straight from their bodies' bytes
+	using a configurable :attr:`~.OctoURL.decoder`.
+
+	:param url: The URL to construct the :class:`~.OctoURL` from.
+	:param decoder: The function used to decode JSON responses.
+
+	Other arguments are passed to :class:`~apeye.slumber_url.SlumberURL`.
+
+	The decoder is inherited by URLs constructed from this one with the ``/`` operator.
+	"""  # noqa: D400
+
+	def __init__(self, url: Union[str, URL] = '', *args: Any, decoder: Decoder = decode_json, **kwargs: Any):
+		super().__init__(url, *args, **kwargs)
+
+		#: The function used to decode JSON responses.
+		self.decoder: Decoder = decoder
+
+	def __truediv__(self, other: Any) -> Any:
+		new_obj = super().__truediv__(other)
+
+		if new_obj is not NotImplemented:
+			new_obj.decoder = self.decoder
+
+		return new_obj
+
+	def _try_to_serialize_response(self, resp: requests.Response) -> Any:
+		content_type = resp.headers.get("content-type", '').split(';')[0].strip()
+
+		if resp.status_code in {204, 205} or content_type != "application/json" or not resp.content:
+			return super()._try_to_serialize_response(resp)
+
+		try:
+			return self.decoder(resp.content)
+		except ValueError:
+			# Consistent with SlumberURL, which returns the body if it cannot be decoded.
+			return resp.content
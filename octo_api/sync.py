@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+#
+#  sync.py
+"""
+Incrementally synchronise consumption data into a local SQLite database.
+
+.. code-block:: python
+
+	api = OctoAPI(api_key)
+	meter = Meter("2000024512368", "18P0123456", "electricity")
+
+	with ConsumptionStore("consumption.db") as store:
+		ConsumptionSync(api, store).sync(meter)
+		readings = store.get_consumption(meter, period_from=datetime(2021, 1, 1))
+
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from types import TracebackType
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.consumption import Consumption, ConsumptionRow, Meter
+from octo_api.utils import _from_columns
+
+__all__ = ["ConsumptionStore", "ConsumptionSync"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS consumption (
+	mpan TEXT NOT NULL,
+	serial_number TEXT NOT NULL,
+	fuel TEXT NOT NULL,
+	interval_start INTEGER NOT NULL,
+	interval_end INTEGER NOT NULL,
+	consumption REAL NOT NULL,
+	PRIMARY KEY (mpan, serial_number, fuel, interval_start)
+) WITHOUT ROWID
+"""
+
+# Insert new readings, and overwrite existing ones only if they have been corrected,
+# so that the number of changed rows reflects what actually changed.
+# This avoids ``INSERT ... ON CONFLICT``, which requires SQLite 3.24.
+_INSERT = """
+INSERT OR IGNORE INTO consumption (mpan, serial_number, fuel, interval_start, interval_end, consumption)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE = """
+UPDATE consumption SET interval_end = ?5, consumption = ?6
+WHERE mpan = ?1 AND serial_number = ?2 AND fuel = ?3 AND interval_start = ?4
+AND (interval_end != ?5 OR consumption != ?6)
+"""
+
+_METER = "mpan = ? AND serial_number = ? AND fuel = ?"
+
+
+class ConsumptionStore:
+	"""
+	Local SQLite database of half-hourly consumption, keyed by meter and the start of each period.
+
+	Timestamps are stored as seconds since the Unix epoch, and are returned in UTC.
+
+	:param filename: The filename of the database. By default the database is held in memory.
+
+	The store can be used as a context manager, which closes the database on exit.
+	"""
+
+	def __init__(self, filename: PathLike = ":memory:"):
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(os.fspath(filename), check_same_thread=False)
+
+		with self._connection:
+			self._connection.execute(_SCHEMA)
+
+	def merge(self, meter: Meter, readings: Iterable[Union[Consumption, ConsumptionRow]]) -> int:
+		"""
+		Merge consumption readings for the given meter into the store.
+
+		Readings which are already stored are left untouched, unless their values have changed.
+
+		:param meter:
+		:param readings:
+
+		:returns: The number of readings which were added or updated.
+		"""
+
+		mpan, serial_number, fuel = meter
+
+		# Read every reading before taking the lock, as ``readings`` may be downloading pages from the API.
+		rows = [(
+				mpan,
+				serial_number,
+				fuel,
+				_to_timestamp(reading.interval_start),
+				_to_timestamp(reading.interval_end),
+				reading.consumption,
+				) for reading in readings]
+
+		with self._lock, self._connection:
+			before = self._connection.total_changes
+			self._connection.executemany(_INSERT, rows)
+			self._connection.executemany(_UPDATE, rows)
+			return self._connection.total_changes - before
+
+	def latest(self, meter: Meter) -> Optional[datetime]:
+		"""
+		Returns the end of the most recent period stored for the given meter,
+		or :py:obj:`None` if there are no readings for that meter.
+
+		:param meter:
+		"""  # noqa: D400
+
+		with self._lock:
+			row = self._connection.execute(
+					f"SELECT interval_end FROM consumption WHERE {_METER} ORDER BY interval_start DESC LIMIT 1",
+					tuple(meter),
+					).fetchone()
+
+		if row is None:
+			return None
+		else:
+			return _from_timestamp(row[0])
+
+	def get_consumption(
+			self,
+			meter: Meter,
+			period_from: Optional[datetime] = None,
+			period_to: Optional[datetime] = None,
+			) -> List[Consumption]:
+		"""
+		Returns the stored consumption for the given meter, ordered from oldest to newest.
+
+		:param meter:
+		:param period_from: Show consumption for periods which start at or after the given datetime.
+		:param period_to: Show consumption for periods which start before the given datetime.
+		"""
+
+		query = f"SELECT consumption, interval_start, interval_end FROM consumption WHERE {_METER}"
+		parameters: List[Union[str, int]] = list(meter)
+
+		if period_from is not None:
+			query += " AND interval_start >= ?"
+			parameters.append(_to_timestamp(period_from))
+		if period_to is not None:
+			query += " AND interval_start < ?"
+			parameters.append(_to_timestamp(period_to))
+
+		with self._lock:
+			rows = self._connection.execute(f"{query} ORDER BY interval_start", parameters).fetchall()
+
+		return _from_columns(
+				Consumption,
+				len(rows),
+				{
+						"consumption": map(itemgetter(0), rows),
+						"interval_start": map(_from_timestamp, map(itemgetter(1), rows)),
+						"interval_end": map(_from_timestamp, map(itemgetter(2), rows)),
+						},
+				)
+
+	def meters(self) -> List[Meter]:
+		"""
+		Returns the meters for which consumption is stored.
+		"""
+
+		with self._lock:
+			rows = self._connection.execute("SELECT DISTINCT mpan, serial_number, fuel FROM consumption").fetchall()
+
+		return [Meter(*row) for row in rows]
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._connection.execute("SELECT COUNT(*) FROM consumption").fetchone()[0]
+
+	def close(self) -> None:
+		"""
+		Close the database.
+		"""
+
+		self._connection.close()
+
+	def __enter__(self) -> "ConsumptionStore":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.close()
+
+
+class ConsumptionSync:
+	"""
+	Keeps a :class:`~.ConsumptionStore` up to date with the consumption reported by the API.
+
+	Each call to :meth:`~.ConsumptionSync.sync` only requests the periods after the most recent one
+	already stored for that meter, less a look-back window in which late-arriving corrections are picked up.
+
+	:param api:
+	:param store:
+	:param lookback: How far before the most recent stored reading to request consumption from.
+	:param page_size: The page size used to request consumption.
+	:param max_workers: The maximum number of pages to fetch concurrently.
+		By default the pages are fetched one after another.
+	"""
+
+	def __init__(
+			self,
+			api: OctoAPI,
+			store: ConsumptionStore,
+			lookback: timedelta = timedelta(days=2),
+			page_size: int = 25000,
+			max_workers: Optional[int] = None,
+			):
+
+		#: The interface to the Octopus Energy API.
+		self.api: OctoAPI = api
+
+		#: The store to merge consumption into.
+		self.store: ConsumptionStore = store
+
+		#: How far before the most recent stored reading to request consumption from.
+		self.lookback: timedelta = lookback
+
+		#: The page size used to request consumption.
+		self.page_size: int = page_size
+
+		#: The maximum number of pages to fetch concurrently.
+		self.max_workers: Optional[int] = max_workers
+
+	def sync(self, meter: Meter, period_from: Optional[datetime] = None) -> int:
+		"""
+		Fetch new consumption for the given meter and merge it into the store.
+
+		:param meter:
+		:param period_from: Where to start from if there is no consumption stored for the meter yet.
+			By default the meter's entire history is requested.
+
+		:returns: The number of readings which were added or updated.
+		"""
+
+		latest = self.store.latest(meter)
+		if latest is not None:
+			period_from = latest - self.lookback
+
+		readings = self.api.get_consumption(
+				*meter,
+				period_from=period_from,
+				page_size=self.page_size,
+				reverse=True,
+				max_workers=self.max_workers,
+				stream=True,
+				rows="tuple",
+				)
+
+		return self.store.merge(meter, readings)
+
+	def sync_all(self, meters: Iterable[Meter]) -> Dict[Meter, int]:
+		"""
+		Synchronise each of the given meters in turn.
+
+		:param meters:
+
+		:returns: Mapping of meters to the number of readings which were added or updated.
+		"""
+
+		return {meter: self.sync(meter) for meter in meters}
+
+
+def _to_timestamp(value: datetime) -> int:
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=timezone.utc)
+	return int(value.timestamp())
+
+
+def _from_timestamp(value: int) -> datetime:
+	return datetime.fromtimestamp(value, timezone.utc)
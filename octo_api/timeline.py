@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+#
+#  timeline.py
+"""
+Fast lookup of the rate of a tariff in effect at a point in time.
+
+.. code-block:: python
+
+	unit_rates = api.get_tariff_charges(product_code, tariff_code, "electricity", RateType.StandardUnitRate)
+	timeline = RateTimeline(unit_rates)
+
+	timeline.rate_at(datetime.now(timezone.utc))
+	exc_vat, inc_vat = timeline.rates_at(half_hours)
+
+Lookups for many instants at once are vectorised with :mod:`numpy` if it is installed.
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# this package
+from octo_api.products import RateInfo, RateInfoRow
+
+try:
+	# 3rd party
+	import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+	numpy = None
+
+__all__ = ["RateTimeline"]
+
+_Rate = Union[RateInfo, RateInfoRow]
+_Instant = Union[datetime, float]
+
+_NAN = float("nan")
+
+# Used in place of a missing start, e.g. for a charge which has always applied.
+_EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class RateTimeline:
+	"""
+	The rates of a tariff over time, as consecutive, non-overlapping segments.
+
+	Where rates overlap, the one which came into effect most recently takes precedence.
+	Rates with a ``valid_from`` of :py:obj:`None` have always applied,
+	and rates with a ``valid_to`` of :py:obj:`None` continue until superseded.
+
+	:param rates: The rates, e.g. from :meth:`OctoAPI.get_tariff_charges <.OctoAPI.get_tariff_charges>`,
+		in any order.
+
+	Instants may be given as :class:`datetime.datetime` objects or as Unix timestamps.
+	Naive :class:`~datetime.datetime` objects are assumed to be in UTC.
+	"""
+
+	__slots__ = ("starts", "values_exc_vat", "values_inc_vat")
+
+	#: The start of each segment, as a Unix timestamp, in ascending order.
+	#: Each segment lasts until the start of the next, and the last segment continues indefinitely.
+	starts: Sequence[float]
+
+	#: The rate in effect during each segment, excluding VAT, or ``nan`` if no rate is in effect.
+	values_exc_vat: Sequence[float]
+
+	#: The rate in effect during each segment, including VAT, or ``nan`` if no rate is in effect.
+	values_inc_vat: Sequence[float]
+
+	def __init__(self, rates: Iterable[_Rate]):
+		starts, values_exc, values_inc = _flatten_rates(rates)
+		self.starts = array('d', starts)
+		self.values_exc_vat = array('d', values_exc)
+		self.values_inc_vat = array('d', values_inc)
+
+	def _segment(self, idx: int) -> Optional[RateInfoRow]:
+		if idx < 0 or self.values_exc_vat[idx] != self.values_exc_vat[idx]:
+			return None
+
+		valid_to = _from_timestamp(self.starts[idx + 1]) if idx + 1 < len(self.starts) else None
+		return RateInfoRow(
+				self.values_exc_vat[idx],
+				self.values_inc_vat[idx],
+				_from_timestamp(self.starts[idx]),
+				valid_to,
+				)
+
+	def rate_at(self, instant: _Instant) -> Optional[RateInfoRow]:
+		"""
+		Returns the rate in effect at the given instant.
+
+		The ``valid_from`` and ``valid_to`` of the result are those of the segment containing the instant,
+		which may be narrower than those of the original rate if it was partly superseded by another.
+		A rate which has always applied has a ``valid_from`` of :py:obj:`datetime.min <datetime.datetime.min>` (in UTC).
+
+		:param instant:
+
+		:returns: The rate, or :py:obj:`None` if no rate is in effect.
+		"""
+
+		return self._segment(bisect_right(self.starts, _timestamp(instant)) - 1)
+
+	def rates_at(self, instants: Iterable[_Instant]) -> Tuple[Sequence[float], Sequence[float]]:
+		"""
+		Returns the rates in effect at each of the given instants.
+
+		:param instants: The instants, in any order.
+			A :class:`numpy.ndarray` of Unix timestamps is used without conversion.
+
+		:returns: The rates excluding and including VAT, with ``nan`` where no rate is in effect.
+			These are :class:`numpy.ndarray`\\s if :mod:`numpy` is installed, or :class:`array.array`\\s otherwise.
+		"""
+
+		if numpy is not None:
+			if isinstance(instants, numpy.ndarray) and instants.dtype.kind in "fiu":
+				timestamps = instants.astype(numpy.float64, copy=False)
+			else:
+				timestamps = numpy.fromiter(map(_timestamp, instants), dtype=numpy.float64)
+
+			if not self.starts:
+				nans = numpy.full(len(timestamps), _NAN)
+				return nans, nans.copy()
+
+			# Instants before the first segment get an index of -1, which is masked out.
+			indices = numpy.searchsorted(numpy.frombuffer(self.starts), timestamps, side="right") - 1
+			before = indices < 0
+			values_exc = numpy.frombuffer(self.values_exc_vat)[indices]
+			values_inc = numpy.frombuffer(self.values_inc_vat)[indices]
+			values_exc[before] = _NAN
+			values_inc[before] = _NAN
+			return values_exc, values_inc
+
+		starts, all_exc, all_inc = self.starts, self.values_exc_vat, self.values_inc_vat
+		values_exc, values_inc = array('d'), array('d')
+
+		for timestamp in map(_timestamp, instants):
+			idx = bisect_right(starts, timestamp) - 1
+			if idx < 0:
+				values_exc.append(_NAN)
+				values_inc.append(_NAN)
+			else:
+				values_exc.append(all_exc[idx])
+				values_inc.append(all_inc[idx])
+
+		return values_exc, values_inc
+
+	def between(self, period_from: _Instant, period_to: Optional[_Instant] = None) -> List[RateInfoRow]:
+		"""
+		Returns the rates in effect at any time between the given instants, oldest first.
+
+		:param period_from: The start of the range (inclusive).
+		:param period_to: The end of the range (exclusive).
+			If :py:obj:`None` the range continues indefinitely.
+
+		:returns: The segments overlapping the range, as in :meth:`~.RateTimeline.rate_at`.
+			These are not truncated to the range.
+		"""
+
+		lo = max(0, bisect_right(self.starts, _timestamp(period_from)) - 1)
+		hi = len(self.starts) if period_to is None else bisect_left(self.starts, _timestamp(period_to))
+
+		return [segment for segment in map(self._segment, range(lo, hi)) if segment is not None]
+
+	def __iter__(self) -> Iterator[RateInfoRow]:
+		for segment in map(self._segment, range(len(self.starts))):
+			if segment is not None:
+				yield segment
+
+	def __len__(self) -> int:
+		"""
+		Returns the number of segments in which a rate is in effect.
+		"""
+
+		return sum(value == value for value in self.values_exc_vat)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__name__} of {len(self)} rates>"
+
+
+def _timestamp(value: _Instant) -> float:
+	if not isinstance(value, datetime):
+		return float(value)
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=timezone.utc)
+	return value.timestamp()
+
+
+def _from_timestamp(value: float) -> datetime:
+	if value == -math.inf:
+		return _EARLIEST
+	return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _flatten_rates(rates: Iterable[_Rate]) -> Tuple[List[float], List[float], List[float]]:
+	"""
+	Flatten possibly overlapping rates into consecutive, non-overlapping segments.
+
+	Where rates overlap, the one which came into effect most recently takes precedence.
+
+	:param rates:
+
+	:returns: The start of each segment as a Unix timestamp, and the rates excluding and including VAT
+		which apply from then until the start of the next segment. Gaps between rates have a value of ``nan``.
+	"""
+
+	parsed = []
+	for idx, rate in enumerate(rates):
+		valid_from = -math.inf if rate.valid_from is None else _timestamp(rate.valid_from)
+		valid_to = math.inf if rate.valid_to is None else _timestamp(rate.valid_to)
+		parsed.append((valid_from, valid_to, idx, rate.value_exc_vat, rate.value_inc_vat))
+
+	parsed.sort()
+	boundaries = sorted({b for rate in parsed for b in rate[:2] if b != math.inf})
+
+	starts: List[float] = []
+	values_exc: List[float] = []
+	values_inc: List[float] = []
+
+	# Heap of (-valid_from, -idx, valid_to, exc, inc) for the rates in effect; expired rates are dropped lazily.
+	active: List[Tuple[float, int, float, float, float]] = []
+	position = 0
+
+	for boundary in boundaries:
+		while position < len(parsed) and parsed[position][0] <= boundary:
+			valid_from, valid_to, idx, exc, inc = parsed[position]
+			heapq.heappush(active, (-valid_from, -idx, valid_to, exc, inc))
+			position += 1
+
+		while active and active[0][2] <= boundary:
+			heapq.heappop(active)
+
+		exc, inc = (active[0][3], active[0][4]) if active else (_NAN, _NAN)
+
+		if values_exc and _same(values_exc[-1], exc) and _same(values_inc[-1], inc):
+			continue
+
+		starts.append(boundary)
+		values_exc.append(exc)
+		values_inc.append(inc)
+
+	return starts, values_exc, values_inc
+
+
+def _same(a: float, b: float) -> bool:
+	return a == b or (a != a and b != b)
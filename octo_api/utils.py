@@ -27,9 +27,13 @@ Utility functions.
 #
 
 # stdlib
+import functools
+import re
 import sys
 import textwrap
-from typing import Any, Dict, NamedTuple, Optional, Type, Union
+from collections import deque
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Type, TypeVar, Union, overload
 
 # 3rd party
 import attr
@@ -37,12 +41,15 @@ import prettyprinter  # type: ignore[import]
 from domdf_python_tools.doctools import prettify_docstrings
 from domdf_python_tools.stringlist import StringList
 from enum_tools import StrEnum
+from typing_extensions import Literal
 
 __all__ = [
 		"from_iso_zulu",
+		"parse_iso_zulu_batch",
 		"RateType",
 		"Region",
 		"MeterPointDetails",
+		"TariffCode",
 		"add_repr",
 		]
 
@@ -80,7 +87,98 @@ def from_iso_zulu(the_datetime: Union[str, datetime, None]) -> Optional[datetime
 	elif isinstance(the_datetime, datetime):
 		return the_datetime
 	else:
-		return datetime.fromisoformat(the_datetime.replace('Z', "+00:00"))  # type: ignore[attr-defined]
+		return _parse_iso_zulu(the_datetime)
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_iso_zulu(the_datetime: str) -> datetime:
+	"""
+	Memoised implementation of :func:`~.from_iso_zulu` for strings.
+
+	The same timestamps (e.g. the half-hour boundaries) appear repeatedly in the responses from the API,
+	so caching the parsed values means each appears in memory only once.
+	:class:`datetime.datetime` objects are immutable, so sharing them between callers is safe.
+	The cache lookup is not faster than :meth:`datetime.datetime.fromisoformat` itself for a single value;
+	use :func:`~.parse_iso_zulu_batch` to parse many timestamps quickly.
+	The cache is large enough for several years of half-hourly timestamps.
+
+	:param the_datetime:
+	"""
+
+	if the_datetime[-1:] == 'Z':
+		the_datetime = the_datetime[:-1] + "+00:00"
+
+	return datetime.fromisoformat(the_datetime)  # type: ignore[attr-defined]
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_iso_zulu_epoch(the_datetime: str) -> float:
+	"""
+	Memoised conversion of an ISO 8601 format string to the number of seconds since the Unix epoch.
+
+	:param the_datetime:
+	"""
+
+	return _parse_iso_zulu(the_datetime).timestamp()
+
+
+@overload
+def parse_iso_zulu_batch(
+		timestamps: Iterable[Union[str, datetime, None]],
+		epoch: Literal[False] = ...,
+		) -> List[Optional[datetime]]: ...
+
+
+@overload
+def parse_iso_zulu_batch(
+		timestamps: Iterable[Union[str, datetime, None]],
+		epoch: Literal[True],
+		) -> List[Optional[float]]: ...
+
+
+def parse_iso_zulu_batch(
+		timestamps: Iterable[Union[str, datetime, None]],
+		epoch: bool = False,
+		) -> Union[List[Optional[datetime]], List[Optional[float]]]:
+	"""
+	Parse many `ISO 8601 <https://en.wikipedia.org/wiki/ISO_8601>`_ format strings at once,
+	such as the timestamps in a page of results from the API.
+
+	As with :func:`~.from_iso_zulu`, the character ``Z`` is understood as meaning Zulu time (GMT/UTC),
+	and :class:`datetime.datetime` objects and :py:obj:`None` are passed through unchanged.
+	Repeated timestamps are only parsed once, and share the same :class:`datetime.datetime` object.
+
+	:param timestamps:
+	:param epoch: If :py:obj:`True`, return the number of seconds since the Unix epoch
+		(as given by :meth:`datetime.datetime.timestamp`) rather than :class:`datetime.datetime` objects.
+	"""  # noqa: D400
+
+	if not isinstance(timestamps, (list, tuple)):
+		timestamps = list(timestamps)
+
+	parse: Callable[[str], Any]
+	if epoch:
+		parse = _parse_iso_zulu_epoch
+	else:
+		parse = _parse_iso_zulu
+
+	try:
+		# Fast path for when every timestamp is a string.
+		return list(map(parse, timestamps))
+	except TypeError:
+		pass
+
+	parsed: List[Any] = []
+
+	for timestamp in timestamps:
+		if timestamp is None:
+			parsed.append(None)
+		elif isinstance(timestamp, datetime):
+			parsed.append(timestamp.timestamp() if epoch else timestamp)
+		else:
+			parsed.append(parse(timestamp))
+
+	return parsed
 
 
 class RateType(StrEnum):
@@ -158,6 +256,100 @@ class MeterPointDetails(NamedTuple):
 				)
 
 
+_tariff_code_re = re.compile(r"^([EG])-([12])R-(.+)-([A-Z])$")
+_fuels = {'E': "electricity", 'G': "gas"}
+
+
+@prettify_docstrings
+class TariffCode(NamedTuple):
+	"""
+	The parts of a tariff code, such as ``E-1R-VAR-17-01-11-A``.
+
+	Tariff codes are made up of the fuel (``E`` or ``G``), the number of registers (``1R`` or ``2R``),
+	the code of the product, and the letter of the grid supply point, separated by hyphens.
+
+	:param fuel:
+	:param register_count: The number of registers, either ``1`` (single rate) or ``2`` (e.g. Economy 7).
+	:param product_code: The code of the product the tariff belongs to, for example ``VAR-17-01-11``.
+	:param region: The grid supply point/region the tariff applies to.
+
+	.. code-block:: python
+
+		>>> TariffCode.parse("E-1R-VAR-17-01-11-A")
+		TariffCode(fuel='electricity', register_count=1, product_code='VAR-17-01-11', region=<Region.Eastern: '_A'>)
+		>>> str(TariffCode("gas", 1, "VAR-17-01-11", Region.London))
+		'G-1R-VAR-17-01-11-C'
+	"""
+
+	fuel: Literal["electricity", "gas"]
+	register_count: int
+	product_code: str
+	region: Region
+
+	@classmethod
+	def parse(cls, tariff_code: str) -> "TariffCode":
+		"""
+		Parse a tariff code into its parts.
+
+		:param tariff_code:
+
+		:raises: :exc:`ValueError` if the tariff code is not in the expected format.
+		"""
+
+		return _parse_tariff_code(tariff_code)
+
+	@classmethod
+	def for_all_regions(
+			cls,
+			product_code: str,
+			fuel: Literal["electricity", "gas"] = "electricity",
+			register_count: int = 1,
+			) -> List["TariffCode"]:
+		"""
+		Returns the tariff codes of a product in each of the 14 regions.
+
+		:param product_code: The code of the product, for example ``VAR-17-01-11``.
+		:param fuel:
+		:param register_count: The number of registers, either ``1`` (single rate) or ``2`` (e.g. Economy 7).
+		"""
+
+		return [cls(fuel, register_count, product_code, region) for region in Region]
+
+	@property
+	def register_type(self) -> str:
+		"""
+		The kind of tariff, named after the corresponding ``*_tariffs`` attribute
+		of :class:`~octo_api.products.DetailedProduct`, e.g. ``single_register_electricity``.
+		"""  # noqa: D400
+
+		return f"{'single' if self.register_count == 1 else 'dual'}_register_{self.fuel}"
+
+	def __str__(self) -> str:
+		return f"{self.fuel[0].upper()}-{self.register_count}R-{self.product_code}-{str(self.region)[1:]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_tariff_code(tariff_code: str) -> TariffCode:
+	"""
+	Memoised implementation of :meth:`TariffCode.parse`.
+
+	:param tariff_code:
+	"""
+
+	match = _tariff_code_re.match(tariff_code)
+	if match is None:
+		raise ValueError(f"Invalid tariff code {tariff_code!r}")
+
+	fuel, register_count, product_code, region = match.groups()
+
+	try:
+		gsp = Region(f"_{region}")
+	except ValueError:
+		raise ValueError(f"Invalid tariff code {tariff_code!r}: unknown region {region!r}") from None
+
+	return TariffCode(_fuels[fuel], int(register_count), product_code, gsp)  # type: ignore[arg-type]
+
+
 #: The British Summer Time timezone (UTC+1).
 bst = timezone(timedelta(seconds=3600))
 
@@ -167,6 +359,31 @@ gmt = timezone.utc
 utc = gmt
 
 
+_T = TypeVar("_T")
+
+
+def _from_columns(cls: Type[_T], count: int, columns: Mapping[str, Iterable[Any]]) -> List[_T]:
+	"""
+	Construct ``count`` instances of the slotted attrs class ``cls`` from columns of already-converted values.
+
+	This bypasses the class' ``__init__`` method (and therefore its converters and validators),
+	and sets the slots directly, which is several times faster for large pages of results from the API.
+	``columns`` must contain a value for every field of ``cls``.
+
+	:param cls:
+	:param count: The number of instances to construct.
+	:param columns: Mapping of field names to the values of that field for each instance.
+	"""
+
+	objects = list(map(object.__new__, repeat(cls, count)))
+
+	for name, values in columns.items():
+		# Frozen attrs classes block __setattr__, but the slot descriptors can still be used directly.
+		deque(map(getattr(cls, name).__set__, objects, values), maxlen=0)
+
+	return objects
+
+
 def add_repr(cls: Type) -> Type:
 	"""
 	Add a pretty-printed ``__repr__`` function to the decorated attrs class.
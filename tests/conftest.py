@@ -1,21 +1,28 @@
 # stdlib
+import asyncio
+import datetime
 import json
 import os
 import pathlib
-from typing import Any, Callable, Dict, Iterator, Tuple
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple, TypeVar
 from urllib.parse import quote
 
 # 3rd party
 import pytest
-from apeye.slumber_url import SlumberURL
 from pytest_httpserver import HTTPServer
 from pytest_httpserver.pytest_plugin import Plugin, PluginHTTPServer, get_httpserver_listen_address
+from werkzeug import Response
 
 # this package
 import octo_api.api
+import octo_api.costs
+import octo_api.timeline
 
 pytest_plugins = ("coincidence", )
 
+_T = TypeVar("_T")
+
 
 @pytest.fixture(scope="session")
 def httpserver_listen_address() -> Tuple[str, int]:
@@ -43,9 +50,91 @@ def httpserver(httpserver_listen_address: Tuple[str, int]) -> Iterator[PluginHTT
 responses = pathlib.Path(__file__).parent / "responses"
 
 
+def run_async(coro: Awaitable[_T]) -> _T:
+	"""
+	Run the coroutine to completion in a new event loop.
+
+	This stands in for :func:`asyncio.run`, which requires Python 3.7.
+	"""
+
+	loop = asyncio.new_event_loop()
+
+	try:
+		return loop.run_until_complete(coro)
+	finally:
+		loop.close()
+
+
+def zulu(value: datetime.datetime) -> str:
+	"""
+	Format a UTC datetime the way the API does, e.g. ``2021-01-01T00:00:00Z``.
+	"""
+
+	return value.isoformat().replace("+00:00", 'Z')
+
+
+def paginated_response(results: List[Any]) -> Response:
+	"""
+	Returns a single-page response from a paginated endpoint with the given results.
+	"""
+
+	return Response(
+			json.dumps({"count": len(results), "next": None, "previous": None, "results": results}),
+			content_type="application/json",
+			)
+
+
+@pytest.fixture()
+def prefix(request) -> str:
+	"""
+	A URL prefix unique to the test, in place of ``/v1``, so its handlers do not clash with those of other tests.
+	"""
+
+	module = request.module.__name__.rpartition('.')[2]
+	return f"/{module}-{re.sub(r'[^A-Za-z0-9_]', '_', request.node.name)}/v1"
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch) -> str:
+	"""
+	Run the test with and without :mod:`numpy`, returning the name of the implementation in use.
+	"""
+
+	if request.param == "numpy":
+		pytest.importorskip("numpy")
+	else:
+		monkeypatch.setattr(octo_api.costs, "numpy", None)
+		monkeypatch.setattr(octo_api.timeline, "numpy", None)
+
+	return request.param
+
+
+def synthetic_consumption(count: int, page_size: int) -> List[Dict[str, Any]]:
+	"""
+	Generate the pages of a consumption response with ``count`` half-hourly readings, most recent first.
+	"""
+
+	end = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+	half_hour = datetime.timedelta(minutes=30)
+
+	results = [{
+			"consumption": round(idx * 0.001, 3),
+			"interval_start": zulu(end - (idx + 1) * half_hour),
+			"interval_end": zulu(end - idx * half_hour),
+			} for idx in range(count)]
+
+	pages = [results[idx:idx + page_size] for idx in range(0, count, page_size)]
+	return [{
+			"count": count,
+			"next": f"https://api.example.org/?page={page_number + 1}" if page_number < len(pages) else None,
+			"previous": f"https://api.example.org/?page={page_number - 1}" if page_number > 1 else None,
+			"results": page,
+			} for page_number, page in enumerate(pages, start=1)]
+
+
 @pytest.fixture(scope="session")
 def api(httpserver: HTTPServer) -> octo_api.api.OctoAPI:
-	a = octo_api.api.OctoAPI("token")
+	a = octo_api.api.OctoAPI("token", base_url=httpserver.url_for("/v1"))
 	assert a.API_KEY is not None
 	assert a.API_KEY.value == "token"
 
@@ -170,7 +259,16 @@ def api(httpserver: HTTPServer) -> octo_api.api.OctoAPI:
 			group_by="week",
 			)
 
-	a.API_BASE = SlumberURL(httpserver.url_for("/v1"), auth=('', ''))
+	# Synthetic, fully paginated data
+	synthetic_endpoint = "/v1/electricity-meter-points/1000000000000/meters/SYNTHETIC/consumption"
+	synthetic_pages = synthetic_consumption(count=95, page_size=10)
+	httpserver.expect_request(
+			f"{synthetic_endpoint}/", query_string="page_size=10"
+			).respond_with_json(synthetic_pages[0])
+	for page_number, page in enumerate(synthetic_pages, start=1):
+		httpserver.expect_request(
+				f"{synthetic_endpoint}/", query_string=f"page={page_number}&page_size=10"
+				).respond_with_json(page)
 
 	return a
 
@@ -0,0 +1,97 @@
+# stdlib
+from datetime import datetime, timedelta, timezone
+
+# 3rd party
+import pytest
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.archive import ConsumptionArchive, ConsumptionSequence, archive_filename
+from octo_api.consumption import Consumption, ConsumptionRow, Meter
+
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+HALF_HOUR = timedelta(minutes=30)
+
+
+def readings(count: int, offset: int = 0):
+	return [
+			ConsumptionRow(idx * 0.25, START + idx * HALF_HOUR, START + (idx + 1) * HALF_HOUR)
+			for idx in range(offset, offset + count)
+			]
+
+
+def test_archive_filename():
+	meter = Meter("2000024512368", "18P0123456", "electricity")
+	assert archive_filename(meter) == "electricity-2000024512368-18P0123456.oca"
+
+
+@pytest.mark.parametrize("typecode", ['f', 'd'])
+def test_round_trip(tmp_path, typecode):
+	filename = tmp_path / "meter.oca"
+	assert ConsumptionArchive.write(filename, reversed(readings(10)), typecode=typecode) == 10
+
+	with ConsumptionArchive(filename) as archive:
+		assert len(archive) == 10
+		assert archive.typecode == typecode
+		assert list(archive.values) == [idx * 0.25 for idx in range(10)]
+		assert archive.slots[0] == (START - datetime(1970, 1, 1, tzinfo=timezone.utc)) // HALF_HOUR
+		assert list(archive) == [Consumption(*row) for row in readings(10)]
+		assert archive[-1] == Consumption(2.25, START + 9 * HALF_HOUR, START + 10 * HALF_HOUR)
+
+		window = archive[2:4]
+		assert isinstance(window, ConsumptionSequence)
+		assert [c.consumption for c in window] == [0.5, 0.75]
+
+
+def test_between(tmp_path):
+	filename = tmp_path / "meter.oca"
+	ConsumptionArchive.write(filename, readings(48))
+
+	with ConsumptionArchive(filename) as archive:
+		assert len(archive.between()) == 48
+		assert len(archive.between(START + 10 * HALF_HOUR)) == 38
+		assert len(archive.between(period_to=START + 10 * HALF_HOUR)) == 10
+
+		window = archive.between(START + 10 * HALF_HOUR + timedelta(minutes=1), START + 12 * HALF_HOUR)
+		assert [c.interval_start for c in window] == [START + 11 * HALF_HOUR]
+
+		assert len(archive.between(datetime(2021, 1, 1, 5), datetime(2021, 1, 1, 6))) == 2
+		assert len(archive.between(START + 20 * HALF_HOUR, START)) == 0
+		assert len(archive.between(datetime(2022, 1, 1))) == 0
+
+
+def test_merge(tmp_path):
+	filename = tmp_path / "meter.oca"
+	ConsumptionArchive.write(filename, readings(10))
+
+	corrected = [ConsumptionRow(5.0, START + 9 * HALF_HOUR, START + 10 * HALF_HOUR)]
+	assert ConsumptionArchive.write(filename, corrected + readings(5, offset=10)) == 15
+
+	with ConsumptionArchive(filename) as archive:
+		assert archive[9].consumption == 5.0
+		assert archive[14].interval_start == START + 14 * HALF_HOUR
+
+	assert ConsumptionArchive.write(filename, readings(2), merge=False) == 2
+
+
+def test_invalid(tmp_path):
+	with pytest.raises(ValueError, match="is not the start of a half-hour period"):
+		ConsumptionArchive.write(tmp_path / "meter.oca", [ConsumptionRow(1, START + timedelta(minutes=1), START)])
+
+	with pytest.raises(ValueError, match="'typecode' must be one of 'f' or 'd'"):
+		ConsumptionArchive.write(tmp_path / "meter.oca", readings(1), typecode='i')  # type: ignore
+
+	(tmp_path / "other.oca").write_bytes(b'\0' * 64)
+	with pytest.raises(ValueError, match="is not a consumption archive"):
+		ConsumptionArchive(tmp_path / "other.oca")
+
+
+def test_from_api(api: OctoAPI, tmp_path):
+	consumption = api.get_consumption("1000000000000", "SYNTHETIC", fuel="electricity", page_size=10, rows="tuple")
+	filename = tmp_path / "meter.oca"
+	assert ConsumptionArchive.write(filename, consumption) == 95
+
+	with ConsumptionArchive(filename) as archive:
+		assert list(reversed(archive)) == [
+				Consumption(row.consumption, row.interval_start, row.interval_end) for row in consumption
+				]
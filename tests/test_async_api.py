@@ -0,0 +1,149 @@
+# stdlib
+import datetime
+from typing import Any, Awaitable, Callable, List, TypeVar
+
+# 3rd party
+import pytest
+from apeye.slumber_url import HttpNotFoundError
+from pytest_httpserver import HTTPServer
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.consumption import Meter
+from octo_api.utils import MeterPointDetails, RateType, Region, bst
+from tests.conftest import run_async
+
+pytest.importorskip("aiohttp")
+
+# this package
+from octo_api.async_api import AsyncOctoAPI  # noqa: E402
+from octo_api.pagination import AsyncPaginatedResponse  # noqa: E402
+
+_T = TypeVar("_T")
+
+
+def run(httpserver: HTTPServer, coro: Callable[[AsyncOctoAPI], Awaitable[_T]]) -> _T:
+
+	async def main() -> _T:
+		async with AsyncOctoAPI("token", base_url=httpserver.url_for("/v1")) as async_api:
+			return await coro(async_api)
+
+	return run_async(main())
+
+
+async def collect(response: AsyncPaginatedResponse) -> List[Any]:
+	return [item async for item in response]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_consumption(api: OctoAPI, httpserver: HTTPServer, max_workers: int):
+
+	async def coro(async_api: AsyncOctoAPI) -> List[Any]:
+		consumption = await async_api.get_consumption(
+				mpan="1000000000000",
+				serial_number="SYNTHETIC",
+				fuel="electricity",
+				page_size=10,
+				max_workers=max_workers,
+				)
+		assert len(consumption) == 95
+		return await collect(consumption)
+
+	expected = list(api.get_consumption("1000000000000", "SYNTHETIC", fuel="electricity", page_size=10))
+	assert run(httpserver, coro) == expected
+
+
+def test_get_consumption_for_period(api: OctoAPI, httpserver: HTTPServer):
+	kwargs = dict(
+			mpan="2000024512368",
+			serial_number="-------------",
+			fuel="electricity",
+			period_from=datetime.datetime(2020, 8, 3, 0, 0, 0, tzinfo=bst),
+			period_to=datetime.datetime(2020, 9, 3, 0, 0, 0, tzinfo=bst),
+			)
+
+	async def coro(async_api: AsyncOctoAPI) -> int:
+		consumption = await async_api.get_consumption(**kwargs)  # type: ignore[call-overload]
+		return len(consumption)
+
+	assert run(httpserver, coro) == len(api.get_consumption(**kwargs)) == 1058  # type: ignore[call-overload]
+
+
+def test_get_products(api: OctoAPI, httpserver: HTTPServer):
+
+	async def coro(async_api: AsyncOctoAPI) -> List[Any]:
+		return await collect(await async_api.get_products(is_green=True))
+
+	assert run(httpserver, coro) == list(api.get_products(is_green=True))
+
+
+def test_get_product_info(api: OctoAPI, httpserver: HTTPServer):
+
+	async def coro(async_api: AsyncOctoAPI) -> Any:
+		return await async_api.get_product_info("VAR-17-01-11")
+
+	assert run(httpserver, coro) == api.get_product_info("VAR-17-01-11")
+
+
+def test_get_tariff_charges(api: OctoAPI, httpserver: HTTPServer):
+
+	async def coro(async_api: AsyncOctoAPI) -> List[Any]:
+		return await collect(
+				await async_api.get_tariff_charges(
+						product_code="VAR-17-01-11",
+						tariff_code="E-1R-VAR-17-01-11-A",
+						fuel="electricity",
+						rate_type=RateType.StandardUnitRate,
+						)
+				)
+
+	assert len(run(httpserver, coro)) == 6
+
+
+def test_get_meter_point_details(api: OctoAPI, httpserver: HTTPServer):
+
+	async def coro(async_api: AsyncOctoAPI) -> MeterPointDetails:
+		return await async_api.get_meter_point_details("2000024512368")
+
+	assert run(httpserver, coro) == MeterPointDetails(mpan="2000024512368", gsp=Region.Southern, profile_class=1)
+
+
+def test_get_grid_supply_point(api: OctoAPI, httpserver: HTTPServer):
+
+	async def coro(async_api: AsyncOctoAPI) -> Region:
+		assert await async_api.get_grid_supply_point("SW1A 1AA") == Region.London
+
+		with pytest.raises(ValueError, match="Cannot map the postcode '12345' to a GSP."):
+			await async_api.get_grid_supply_point("12345")
+
+		return Region.London
+
+	run(httpserver, coro)
+
+
+def test_not_found(api: OctoAPI, httpserver: HTTPServer):
+	httpserver.expect_request("/v1/electricity-meter-points/0000000000000/").respond_with_json(
+			{"detail": "Not found."},
+			status=404,
+			)
+
+	async def coro(async_api: AsyncOctoAPI) -> None:
+		with pytest.raises(HttpNotFoundError):
+			await async_api.get_meter_point_details("0000000000000")
+
+	run(httpserver, coro)
+
+
+def test_get_consumption_many(api: OctoAPI, httpserver: HTTPServer):
+	meters = [Meter("1000000000000", "SYNTHETIC", "electricity"), Meter("1000000000000", "MISSING", "electricity")] * 3
+
+	async def coro(async_api: AsyncOctoAPI) -> List[Any]:
+		return [result async for result in async_api.get_consumption_many(meters, page_size=10, max_workers=2)]
+
+	results = run(httpserver, coro)
+	expected = list(api.get_consumption("1000000000000", "SYNTHETIC", fuel="electricity", page_size=10))
+
+	assert sorted(result.meter.serial_number for result in results) == ["MISSING"] * 3 + ["SYNTHETIC"] * 3
+	for result in results:
+		assert result.ok is (result.meter.serial_number == "SYNTHETIC")
+		assert result.consumption == (expected if result.ok else None)
@@ -0,0 +1,212 @@
+# stdlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+# 3rd party
+import pytest
+import requests
+from pytest_httpserver import HTTPServer
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.cache import CachedResponse, ResponseCache, TTLCache
+from octo_api.utils import MeterPointDetails, Region
+
+PRODUCT: Dict[str, Any] = {
+		"code": "CACHE-TEST",
+		"full_name": "Cache Test",
+		"display_name": "Cache Test",
+		"description": "A product for testing the response cache",
+		"is_variable": True,
+		"is_green": False,
+		"is_tracker": False,
+		"is_prepay": False,
+		"is_business": False,
+		"is_restricted": False,
+		"term": None,
+		"brand": "OCTOPUS_ENERGY",
+		"available_from": "2020-01-01T00:00:00Z",
+		"available_to": None,
+		"tariffs_active_at": "2020-10-30T00:00:00Z",
+		"single_register_electricity_tariffs": {},
+		"dual_register_electricity_tariffs": {},
+		"single_register_gas_tariffs": {},
+		"sample_quotes": {},
+		"sample_consumption": {},
+		"links": [],
+		}
+
+
+def requests_to(httpserver: HTTPServer, path: str) -> int:
+	return sum(1 for request, _ in httpserver.log if request.path == path)
+
+
+def cached_api(httpserver: HTTPServer, cache: ResponseCache) -> OctoAPI:
+	return OctoAPI("token", base_url=httpserver.url_for("/v1"), cache=cache)
+
+
+def test_served_from_cache(httpserver: HTTPServer, tmp_path):
+	path = "/v1/products/CACHE-TEST/"
+	httpserver.expect_request(path).respond_with_json(PRODUCT)
+
+	with cached_api(httpserver, ResponseCache(tmp_path)) as api:
+		before = requests_to(httpserver, path)
+		assert api.get_product_info("CACHE-TEST").code == "CACHE-TEST"
+		assert api.get_product_info("CACHE-TEST").code == "CACHE-TEST"
+		assert requests_to(httpserver, path) == before + 1
+
+	# A new process would start with the same cache directory.
+	with cached_api(httpserver, ResponseCache(tmp_path)) as api:
+		assert api.get_product_info("CACHE-TEST").display_name == "Cache Test"
+		assert requests_to(httpserver, path) == before + 1
+
+
+def test_keyed_by_parameters(httpserver: HTTPServer, tmp_path):
+	path = "/v1/products/CACHE-TEST-PARAMS/"
+	httpserver.expect_request(path).respond_with_json({**PRODUCT, "code": "CACHE-TEST-PARAMS"})
+
+	with cached_api(httpserver, ResponseCache(tmp_path)) as api:
+		before = requests_to(httpserver, path)
+		api.get_product_info("CACHE-TEST-PARAMS")
+		api.get_product_info("CACHE-TEST-PARAMS", tariffs_active_at=datetime(2020, 10, 30))
+		api.get_product_info("CACHE-TEST-PARAMS", tariffs_active_at=datetime(2020, 10, 30))
+		assert requests_to(httpserver, path) == before + 2
+
+	with OctoAPI("other-token", base_url=httpserver.url_for("/v1"), cache=ResponseCache(tmp_path)) as api:
+		api.get_product_info("CACHE-TEST-PARAMS")
+		assert requests_to(httpserver, path) == before + 3
+
+
+def test_revalidation(httpserver: HTTPServer, tmp_path):
+	path = "/v1/products/CACHE-TEST-ETAG/"
+	body = {**PRODUCT, "code": "CACHE-TEST-ETAG"}
+	httpserver.expect_request(path, headers={"If-None-Match": '"v1"'}).respond_with_data(status=304)
+	httpserver.expect_request(path).respond_with_json(body, headers={"ETag": '"v1"'})
+
+	cache = ResponseCache(tmp_path, ttls={"*/products/*/": 0})
+
+	with cached_api(httpserver, cache) as api:
+		before = requests_to(httpserver, path)
+		assert api.get_product_info("CACHE-TEST-ETAG").code == "CACHE-TEST-ETAG"
+		assert api.get_product_info("CACHE-TEST-ETAG").code == "CACHE-TEST-ETAG"
+		assert requests_to(httpserver, path) == before + 2
+
+	statuses = [response.status_code for request, response in httpserver.log if request.path == path]
+	assert statuses[-2:] == [200, 304]
+
+
+def test_not_cached(httpserver: HTTPServer, tmp_path):
+	path = "/v1/electricity-meter-points/1800000000000/"
+	httpserver.expect_request(path).respond_with_json({"gsp": "_L", "mpan": "1800000000000", "profile_class": 1})
+
+	cache = ResponseCache(tmp_path)
+	assert cache.ttl_for(httpserver.url_for(path)) is None
+
+	with cached_api(httpserver, cache) as api:
+		before = requests_to(httpserver, path)
+		for _ in range(2):
+			assert api.get_meter_point_details("1800000000000") == MeterPointDetails(
+					mpan="1800000000000",
+					gsp=Region.SouthWestern,
+					profile_class=1,
+					)
+		assert requests_to(httpserver, path) == before + 2
+
+	assert len(cache) == 0
+
+
+def test_ttl_for(tmp_path):
+	cache = ResponseCache(tmp_path)
+	base = "https://api.octopus.energy/v1"
+
+	assert cache.ttl_for(f"{base}/products/") == 60 * 60
+	assert cache.ttl_for(f"{base}/products/VAR-17-01-11/") == 24 * 60 * 60
+	assert cache.ttl_for(f"{base}/electricity-meter-points/2000024512368/") is None
+
+	charges = f"{base}/products/VAR-17-01-11/electricity-tariffs/E-1R-VAR-17-01-11-A/standard-unit-rates/"
+	assert cache.ttl_for(charges) == 60 * 60
+	assert cache.ttl_for(f"{charges}?period_to=2020-01-01T00:00:00Z") == 30 * 24 * 60 * 60
+	assert cache.ttl_for(f"{charges}?period_to=2999-01-01T00:00:00Z") == 60 * 60
+
+	cache = ResponseCache(tmp_path, ttls={}, default_ttl=5)
+	assert cache.ttl_for(f"{base}/electricity-meter-points/2000024512368/") == 5
+
+
+def test_eviction(tmp_path):
+	cache = ResponseCache(tmp_path, max_size=1000)
+
+	for idx in range(10):
+		response = CachedResponse(f"https://example.com/{idx}", 200, {}, b'x' * 200, time.time() + 60)
+		cache.set(str(idx), response)
+		assert cache._size <= 1000
+
+	assert 0 < len(cache) < 10
+	assert cache.get('9') is not None
+	assert cache.get('0') is None
+
+	cache.clear()
+	assert len(cache) == 0
+	assert cache.get('9') is None
+
+
+def test_round_trip(tmp_path):
+	cache = ResponseCache(tmp_path)
+	response = CachedResponse(
+			"https://example.com/",
+			200,
+			{"Content-Type": "application/json", "ETag": '"abc"'},
+			json.dumps({'a': 1}).encode("UTF-8"),
+			time.time() + 60,
+			)
+	cache.set("key", response)
+
+	stored = cache.get("key")
+	assert stored == response
+	assert stored.fresh
+	assert stored.etag == '"abc"'
+	assert stored.last_modified is None
+	assert stored.to_response(requests.PreparedRequest()).json() == {'a': 1}
+
+	assert not cache.refresh("key", stored, 0).fresh
+	entry = cache.get("key")
+	assert entry is not None
+	assert not entry.fresh
+
+
+@pytest.mark.parametrize("authorization", [None, "Basic dG9rZW46", b"Basic dG9rZW46"])
+def test_key(authorization):
+	key = ResponseCache.key("https://example.com/?a=1", authorization)
+	assert len(key) == 64
+	assert key != ResponseCache.key("https://example.com/?a=2", authorization)
+
+
+def test_ttl_cache():
+	cache: TTLCache[str, int] = TTLCache(max_size=2)
+	assert cache.get("a") is None
+
+	cache.set("a", 1)
+	cache.set("b", 2)
+	assert cache.get("a") == 1
+
+	# "b" is the least recently used.
+	cache.set("c", 3)
+	assert len(cache) == 2
+	assert cache.get("b") is None
+	assert cache.get("a") == 1
+	assert cache.get("c") == 3
+
+	cache.clear()
+	assert len(cache) == 0
+	assert repr(cache) == f"TTLCache(ttl={timedelta(days=7)!r}, max_size=2)"
+
+
+def test_ttl_cache_expiry():
+	cache: TTLCache[str, int] = TTLCache(ttl=timedelta(seconds=0.05))
+	cache.set("a", 1)
+	assert cache.get("a") == 1
+
+	time.sleep(0.06)
+	assert cache.get("a") is None
+	assert len(cache) == 0
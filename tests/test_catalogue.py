@@ -0,0 +1,116 @@
+# stdlib
+import json
+import pathlib
+from typing import List
+
+# 3rd party
+import pytest
+from apeye.slumber_url import HttpServerError
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.catalogue import CatalogueEntry, ProductCatalogue
+from octo_api.products import DetailedProduct
+from octo_api.utils import Region
+from tests.conftest import paginated_response
+
+responses = pathlib.Path(__file__).parent / "responses"
+
+
+class FakeProducts:
+	"""
+	Serves a listing of the given products, and their details based on ``VAR-17-01-11``.
+	"""
+
+	def __init__(self, *codes: str):
+		self.codes = list(codes)
+		self.template = (responses / "products_VAR-17-01-11.json").read_text()
+		self.requested: List[str] = []
+		self.base_url = ''
+
+	def __call__(self, request: Request) -> Response:
+		code = request.path.rstrip('/').rpartition('/')[2]
+
+		if code == "products":
+			row = json.loads((responses / "products_business_false.json").read_text())["results"][0]
+			return paginated_response([dict(row, code=code) for code in self.codes])
+
+		self.requested.append(code)
+		return Response(self.template.replace("VAR-17-01-11", code), content_type="application/json")
+
+
+@pytest.fixture()
+def fake(httpserver: HTTPServer, prefix: str) -> FakeProducts:
+	fake = FakeProducts("CAT-1", "CAT-2", "CAT-3")
+	httpserver.expect_request(f"{prefix}/products/").respond_with_handler(fake)
+	for code in fake.codes + ["CAT-4"]:
+		httpserver.expect_request(f"{prefix}/products/{code}/").respond_with_handler(fake)
+
+	fake.base_url = httpserver.url_for(prefix)
+	return fake
+
+
+def test_catalogue(fake: FakeProducts):
+	with OctoAPI("token", base_url=fake.base_url) as api:
+		catalogue = ProductCatalogue(api, max_workers=3)
+		assert repr(catalogue) == "<ProductCatalogue (not loaded)>"
+
+		assert len(catalogue) == 3
+		assert sorted(fake.requested) == ["CAT-1", "CAT-2", "CAT-3"]
+		assert "CAT-2" in catalogue
+		assert "VAR-17-01-11" not in catalogue
+		assert [product.code for product in catalogue] == ["CAT-1", "CAT-2", "CAT-3"]
+
+		product = catalogue.get_product("CAT-2")
+		assert isinstance(product, DetailedProduct)
+		assert catalogue.products["CAT-2"] is product
+
+		entry = catalogue.find_tariff("E-1R-CAT-2-A")
+		assert isinstance(entry, CatalogueEntry)
+		assert entry.product is product
+		assert entry.region == "_A"
+		assert entry.payment_method == "direct_debit_monthly"
+		assert entry.register_type == "single_register_electricity"
+		assert entry.tariff is product.single_register_electricity_tariffs["_A"]["direct_debit_monthly"]
+
+		assert catalogue.find_tariff("G-1R-CAT-3-C").register_type == "single_register_gas"
+		assert catalogue.find_tariff("E-2R-CAT-1-P").region == "_P"
+
+		with pytest.raises(KeyError):
+			catalogue.find_tariff("E-1R-VAR-17-01-11-A")
+		with pytest.raises(KeyError):
+			catalogue.get_product("CAT-4")
+
+		london = catalogue.tariffs_for_region(Region.London)
+		assert london == catalogue.tariffs_for_region("_C")
+		assert len(london) == 9
+		assert {entry.tariff.code for entry in london} >= {"E-1R-CAT-1-C", "E-2R-CAT-2-C", "G-1R-CAT-3-C"}
+		assert catalogue.tariffs_for_region("_Z") == []
+		assert "_A" in catalogue.regions
+
+		# No further requests are made for lookups.
+		assert len(fake.requested) == 3
+		assert repr(catalogue) == "<ProductCatalogue of 3 products, 126 tariffs>"
+
+
+def test_refresh(fake: FakeProducts):
+	with OctoAPI("token", base_url=fake.base_url) as api:
+		catalogue = ProductCatalogue(api, max_workers=1)
+		catalogue.refresh()
+		assert len(catalogue) == 3
+
+		fake.codes = ["CAT-2", "CAT-4"]
+		catalogue.refresh()
+		assert list(catalogue.products) == ["CAT-2", "CAT-4"]
+		assert catalogue.find_tariff("E-1R-CAT-4-A").product.code == "CAT-4"
+
+		with pytest.raises(KeyError):
+			catalogue.find_tariff("E-1R-CAT-1-A")
+
+		# A failed refresh keeps the previous contents.
+		fake.codes = ["CAT-5"]
+		with pytest.raises(HttpServerError):
+			catalogue.refresh()
+		assert list(catalogue.products) == ["CAT-2", "CAT-4"]
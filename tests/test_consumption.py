@@ -1,13 +1,16 @@
 # stdlib
 import datetime
-from typing import Any
+from typing import Any, List, Tuple, Union
 
 # 3rd party
+import attr
 import pytest
+from apeye.slumber_url import HttpServerError
+from typing_extensions import Literal
 
 # this package
 from octo_api.api import OctoAPI
-from octo_api.consumption import Consumption
+from octo_api.consumption import Consumption, ConsumptionResult, ConsumptionRow, Meter
 from octo_api.pagination import PaginatedResponse
 from octo_api.utils import bst
 
@@ -32,7 +35,7 @@ def test_get_consumption(api: OctoAPI):
 			interval_end="2020-09-30T15:00:00+01:00",
 			)
 
-	assert consumption[115:116] == [
+	assert consumption[115:117] == [
 			Consumption(
 					consumption=0.409,
 					interval_start="2020-09-30T14:30:00+01:00",
@@ -147,3 +150,62 @@ def test_get_consumption_grouping(api: OctoAPI):
 			interval_start="2020-08-24T00:00:00+01:00",
 			interval_end="2020-08-31T00:00:00+01:00",
 			)
+
+
+def test_get_consumption_rows(api: OctoAPI):
+	kwargs = dict(mpan="2000024512368", serial_number="-------------", fuel="electricity")
+
+	consumption = api.get_consumption(**kwargs)  # type: ignore[call-overload]
+	tuples = api.get_consumption(**kwargs, rows="tuple")  # type: ignore[call-overload]
+	dicts = api.get_consumption(**kwargs, rows="dict")  # type: ignore[call-overload]
+
+	assert tuples[115] == ConsumptionRow(
+			consumption=0.409,
+			interval_start=datetime.datetime(2020, 9, 30, 14, 30, tzinfo=bst),
+			interval_end=datetime.datetime(2020, 9, 30, 15, 0, tzinfo=bst),
+			)
+	assert dicts[115] == {
+			"consumption": 0.409,
+			"interval_start": "2020-09-30T14:30:00+01:00",
+			"interval_end": "2020-09-30T15:00:00+01:00",
+			}
+
+	for obj, row in zip(consumption[100:120], tuples[100:120]):
+		assert row == ConsumptionRow(*attr.astuple(obj))
+
+	with pytest.raises(ValueError, match="'rows' must be one of 'object', 'tuple' or 'dict', not 'list'"):
+		api.get_consumption(**kwargs, rows="list")  # type: ignore[call-overload]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_consumption_many(api: OctoAPI, max_workers: int):
+	good = Meter("1000000000000", "SYNTHETIC", "electricity")
+	bad = Meter("1000000000000", "MISSING", "electricity")
+	meters: List[Union[Meter, Tuple[str, str, Literal["electricity", "gas"]]]] = [
+			good,
+			("1000000000000", "MISSING", "electricity"),
+			good,
+			good,
+			]
+
+	results = list(api.get_consumption_many(iter(meters), page_size=10, max_workers=max_workers, rows="tuple"))
+	assert len(results) == 4
+	assert all(isinstance(result, ConsumptionResult) for result in results)
+
+	failures = [result for result in results if not result.ok]
+	assert len(failures) == 1
+	assert failures[0].meter == bad
+	assert failures[0].consumption is None
+	assert isinstance(failures[0].error, HttpServerError)
+
+	expected = list(api.get_consumption(*good, page_size=10, rows="tuple"))
+	for result in results:
+		if result.ok:
+			assert result.meter == good
+			assert result.error is None
+			assert result.consumption == expected
+
+
+def test_get_consumption_many_invalid(api: OctoAPI):
+	with pytest.raises(ValueError, match="'page_size' may not be greater than 25,000"):
+		api.get_consumption_many([], page_size=30000)
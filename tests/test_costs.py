@@ -0,0 +1,123 @@
+# stdlib
+import math
+from datetime import date, datetime, timedelta, timezone
+
+# 3rd party
+import pytest
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.consumption import ConsumptionRow
+from octo_api.costs import Costs, IntervalCost, calculate_costs
+from octo_api.products import RateInfo, RateInfoRow
+from octo_api.utils import RateType
+
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+HALF_HOUR = timedelta(minutes=30)
+
+
+def readings(count: int, value: float = 1.0):
+	return [ConsumptionRow(value, START + idx * HALF_HOUR, START + (idx + 1) * HALF_HOUR) for idx in range(count)]
+
+
+def test_costs(engine):
+	# Half-hourly rates for the first two hours, then a flat rate.
+	unit_rates = [
+			RateInfoRow(float(idx), float(idx) * 1.05, START + idx * HALF_HOUR, START + (idx + 1) * HALF_HOUR)
+			for idx in range(4)
+			]
+	unit_rates.append(RateInfoRow(10.0, 10.5, START + 2 * timedelta(hours=1), None))
+	standing_charges = [RateInfoRow(20.0, 21.0, START - timedelta(days=30), None)]
+
+	# Given newest first, as returned by the API by default.
+	consumption = list(reversed(readings(100, value=2)))
+	costs = calculate_costs(consumption, reversed(unit_rates), standing_charges)
+
+	assert isinstance(costs, Costs)
+	assert len(costs) == 100
+	assert costs.readings == readings(100, value=2)
+	assert list(costs.unit_rate_exc_vat[:6]) == [0, 1, 2, 3, 10, 10]
+	assert list(costs.cost_exc_vat[:6]) == [0, 2, 4, 6, 20, 20]
+	assert costs.consumption == 200
+
+	assert costs.unit_cost_exc_vat == 2 * (0 + 1 + 2 + 3) + 96 * 20
+	assert costs.unit_cost_inc_vat == pytest.approx(costs.unit_cost_exc_vat * 1.05)
+
+	# 100 half hours spans three days.
+	assert costs.days == [date(2021, 1, 1), date(2021, 1, 2), date(2021, 1, 3)]
+	assert costs.standing_charge_exc_vat == 60
+	assert costs.standing_charge_inc_vat == 63
+	assert costs.total_exc_vat == costs.unit_cost_exc_vat + 60
+	assert costs.total_inc_vat == pytest.approx(costs.unit_cost_inc_vat + 63)
+
+	first = next(iter(costs))
+	assert isinstance(first, IntervalCost)
+	assert first == IntervalCost(START, START + HALF_HOUR, 2, 0.0, 0.0, 0.0, 0.0)
+	assert repr(costs).startswith("<Costs of 100 periods: ")
+
+
+def test_overlapping_rates(engine):
+	unit_rates = [
+			RateInfoRow(10.0, 10.5, START, None),
+			# A later rate, superseded for an hour by a temporary one.
+			RateInfoRow(20.0, 21.0, START + 2 * HALF_HOUR, None),
+			RateInfoRow(5.0, 5.25, START + 4 * HALF_HOUR, START + 6 * HALF_HOUR),
+			]
+
+	costs = calculate_costs(readings(8), unit_rates)
+	assert list(costs.unit_rate_exc_vat) == [10, 10, 20, 20, 5, 5, 20, 20]
+	assert costs.standing_charge_exc_vat == 0
+	assert costs.days == [date(2021, 1, 1)]
+
+
+def test_missing_rates(engine):
+	unit_rates = [RateInfoRow(10.0, 10.5, START + HALF_HOUR, START + 2 * HALF_HOUR)]
+
+	with pytest.raises(ValueError, match="No unit rate in effect for the period starting 2021-01-01 00:00:00"):
+		calculate_costs(readings(1), unit_rates)
+
+	with pytest.raises(ValueError, match="No unit rate in effect for the period starting 2021-01-01 01:00:00"):
+		calculate_costs(readings(3)[1:], unit_rates)
+
+	with pytest.raises(ValueError, match="No standing charge in effect on 2021-01-01"):
+		calculate_costs(readings(2)[1:], unit_rates, [RateInfoRow(1.0, 1.0, START + timedelta(days=1), None)])
+
+
+def test_open_start_standing_charge(engine):
+	unit_rates = [RateInfoRow(10.0, 10.5, START, None)]
+	standing_charges = [RateInfo(20, 21, None, None)]
+
+	costs = calculate_costs(readings(96), unit_rates, standing_charges)
+	assert costs.standing_charge_exc_vat == 40
+	assert costs.standing_charge_inc_vat == 42
+
+
+def test_empty(engine):
+	costs = calculate_costs([], [])
+	assert len(costs) == 0
+	assert costs.total_inc_vat == 0
+	assert costs.days == []
+
+
+def test_from_api(api: OctoAPI, engine):
+	consumption = api.get_consumption("1000000000000", "SYNTHETIC", fuel="electricity", page_size=10)
+	unit_rates = api.get_tariff_charges(
+			"VAR-17-01-11",
+			"E-1R-VAR-17-01-11-A",
+			fuel="electricity",
+			rate_type=RateType.StandardUnitRate,
+			)
+
+	costs = calculate_costs(consumption, unit_rates)
+	assert len(costs) == 95
+
+	expected = 0.0
+	for reading in consumption:
+		rate = next(
+				rate for rate in unit_rates
+				if rate.valid_from <= reading.interval_start and (rate.valid_to is None or reading.interval_start < rate.valid_to)
+				)
+		expected += reading.consumption * rate.value_inc_vat
+
+	assert math.isclose(costs.unit_cost_inc_vat, expected)
+	assert isinstance(list(unit_rates)[0], RateInfo)
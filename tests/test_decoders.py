@@ -0,0 +1,97 @@
+# stdlib
+import json
+from typing import Any, List
+
+# 3rd party
+import pytest
+from pytest_httpserver import HTTPServer
+
+# this package
+import octo_api.decoders
+from octo_api.api import OctoAPI
+from octo_api.decoders import decode_json, get_decoder
+from octo_api.session import OctoURL
+from octo_api.utils import MeterPointDetails, Region
+from tests.conftest import run_async
+
+EXPECTED = MeterPointDetails(mpan="1500000000000", gsp=Region.Midlands, profile_class=1)
+
+
+class RecordingDecoder:
+
+	def __init__(self):
+		self.calls: List[Any] = []
+
+	def __call__(self, content: bytes) -> Any:
+		self.calls.append(content)
+		return json.loads(content)
+
+
+@pytest.fixture(scope="module")
+def base_url(httpserver: HTTPServer) -> str:
+	httpserver.expect_request("/decoders/v1/electricity-meter-points/1500000000000/").respond_with_json({
+			"gsp": "_E", "mpan": "1500000000000", "profile_class": 1
+			})
+	httpserver.expect_request("/decoders/v1/products/").respond_with_json({
+			"count": 0, "next": None, "previous": None, "results": []
+			})
+	return httpserver.url_for("/decoders/v1")
+
+
+def test_get_decoder(monkeypatch):
+	assert get_decoder() is decode_json
+	assert get_decoder("json") is decode_json
+	assert get_decoder(len) is len
+	assert decode_json(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+
+	with pytest.raises(ValueError, match="Unknown decoder 'yaml'"):
+		get_decoder("yaml")
+
+	monkeypatch.setattr(octo_api.decoders, "orjson", None)
+	assert get_decoder("auto") is decode_json
+
+	with pytest.raises(ImportError, match="The 'orjson' decoder requires orjson to be installed."):
+		get_decoder("orjson")
+
+
+def test_orjson():
+	orjson = pytest.importorskip("orjson")
+
+	assert get_decoder("orjson") is orjson.loads
+	assert get_decoder("auto") is orjson.loads
+
+
+def test_custom_decoder(base_url: str):
+	decoder = RecordingDecoder()
+
+	with OctoAPI("token", base_url=base_url, decoder=decoder) as api:
+		assert isinstance(api.API_BASE, OctoURL)
+		assert api.get_meter_point_details("1500000000000") == EXPECTED
+		assert len(api.get_products()) == 0
+
+	# Decoded straight from the bytes of the body, and inherited by child URLs.
+	assert len(decoder.calls) == 2
+	assert all(isinstance(content, bytes) for content in decoder.calls)
+
+
+@pytest.mark.parametrize("decoder", ["json", "auto"])
+def test_decoders(base_url: str, decoder: str):
+	with OctoAPI("token", base_url=base_url, decoder=decoder) as api:
+		assert api.get_meter_point_details("1500000000000") == EXPECTED
+
+
+def test_async_custom_decoder(base_url: str):
+	pytest.importorskip("aiohttp")
+
+	# this package
+	from octo_api.async_api import AsyncOctoAPI
+
+	decoder = RecordingDecoder()
+
+	async def main():
+		async with AsyncOctoAPI("token", base_url=base_url, decoder=decoder) as api:
+			return await api.get_meter_point_details("1500000000000")
+
+	assert run_async(main()) == EXPECTED
+	assert len(decoder.calls) == 1
+	assert isinstance(decoder.calls[0], bytes)
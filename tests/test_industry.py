@@ -1,9 +1,18 @@
+# stdlib
+import pathlib
+from datetime import timedelta
+from typing import Dict, Tuple
+
 # 3rd party
 import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
 
 # this package
 from octo_api.api import OctoAPI
+from octo_api.gsp import GSPCache, normalise_postcode
 from octo_api.utils import Region
+from tests.conftest import paginated_response
 
 
 def test_get_grid_supply_point(api: OctoAPI):
@@ -13,3 +22,132 @@ def test_get_grid_supply_point(api: OctoAPI):
 
 	with pytest.raises(ValueError, match="Cannot map the postcode '12345' to a GSP."):
 		api.get_grid_supply_point("12345")
+
+
+class FakeGridSupplyPoints:
+	"""
+	Maps postcodes to grid supply points by their outward code, counting the requests for each postcode.
+	"""
+
+	regions = {"SW1A": "_C", "SW1P": "_C", "CB1": "_A", "EH1": "_N"}
+
+	def __init__(self):
+		self.requests: Dict[str, int] = {}
+
+	def __call__(self, request: Request) -> Response:
+		postcode = request.args["postcode"]
+		self.requests[postcode] = self.requests.get(postcode, 0) + 1
+
+		region = self.regions.get(postcode.split(' ')[0])
+		results = [{"group_id": region}] if region else []
+		return paginated_response(results)
+
+
+@pytest.fixture()
+def fake_gsp(httpserver: HTTPServer, prefix: str) -> Tuple[FakeGridSupplyPoints, str]:
+	fake = FakeGridSupplyPoints()
+	httpserver.expect_request(f"{prefix}/industry/grid-supply-points/").respond_with_handler(fake)
+	return fake, httpserver.url_for(prefix)
+
+
+@pytest.mark.parametrize(
+		"postcode, expected",
+		[
+				("SW1A 1AA", "SW1A 1AA"),
+				("sw1a1aa", "SW1A 1AA"),
+				("  Sw1A  1aA ", "SW1A 1AA"),
+				("cb11aa", "CB1 1AA"),
+				("M1 1AE", "M1 1AE"),
+				("12345", "12345"),
+				(" not a postcode", "NOTAPOSTCODE"),
+				]
+		)
+def test_normalise_postcode(postcode: str, expected: str):
+	assert normalise_postcode(postcode) == expected
+
+
+def test_gsp_cache(fake_gsp: Tuple[FakeGridSupplyPoints, str]):
+	fake, base_url = fake_gsp
+
+	with OctoAPI("token", base_url=base_url, gsp_cache=GSPCache()) as api:
+		assert api.get_grid_supply_point("SW1A 1AA") == Region.London
+		assert api.get_grid_supply_point("sw1a1aa") == Region.London
+		assert fake.requests == {"SW1A 1AA": 1}
+
+		# Unmappable postcodes are remembered.
+		for _ in range(2):
+			with pytest.raises(ValueError, match="Cannot map the postcode 'XX1 1AA' to a GSP."):
+				api.get_grid_supply_point("xx1 1aa")
+		assert fake.requests["XX1 1AA"] == 1
+
+		assert len(api.gsp_cache) == 2  # type: ignore[arg-type]
+
+
+def test_gsp_cache_negative_ttl():
+	cache = GSPCache(negative_ttl=timedelta(0))
+	cache.set("XX1 1AA", None)
+	assert cache.get("XX1 1AA") is None
+	assert len(cache) == 0
+
+
+def test_gsp_cache_outward_codes():
+	cache = GSPCache(outward_threshold=2)
+
+	cache.set("SW1A 1AA", Region.London)
+	assert cache.get("SW1A 2AA") is None
+	cache.set("SW1A 1AA", Region.London)
+	assert cache.get("SW1A 2AA") is None
+
+	cache.set("SW1A 2AA", Region.London)
+	assert cache.get("SW1A 9ZZ") == Region.London
+	assert cache.get("SW1B 9ZZ") is None
+
+	# Outward codes spanning more than one region are not used.
+	cache.set("CB1 1AA", Region.Eastern)
+	cache.set("CB1 2AA", Region.EastMidlands)
+	cache.set("CB1 3AA", Region.Eastern)
+	assert cache.get("CB1 9ZZ") is None
+	assert cache.get("CB1 3AA") == Region.Eastern
+
+
+def test_gsp_cache_lru(tmp_path: pathlib.Path):
+	filename = tmp_path / "gsp.db"
+
+	with GSPCache(filename, max_size=2) as cache:
+		cache.set("SW1A 1AA", Region.London)
+		cache.set("CB1 1AA", Region.Eastern)
+		assert cache.get("SW1A 1AA") == Region.London
+		cache.set("EH1 1AA", Region.SouthScotland)
+
+		assert len(cache) == 2
+		assert cache.get("CB1 1AA") is None
+
+	# The cache persists between instances.
+	with GSPCache(filename, max_size=2) as cache:
+		assert len(cache) == 2
+		assert repr(cache) == "<GSPCache of 2 postcodes>"
+		assert cache.get("SW1A 1AA") == Region.London
+		assert cache.get("EH1 1AA") == Region.SouthScotland
+
+		cache.clear()
+		assert len(cache) == 0
+		assert cache.get("SW1A 1AA") is None
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_get_grid_supply_points(fake_gsp: Tuple[FakeGridSupplyPoints, str], cached: bool):
+	fake, base_url = fake_gsp
+	postcodes = ["SW1A 1AA", "sw1a1aa", "CB1 1AA", "EH1 1AA", "XX1 1AA", "SW1P 3AA"]
+
+	with OctoAPI("token", base_url=base_url, gsp_cache=GSPCache() if cached else None) as api:
+		assert api.get_grid_supply_points(postcodes, max_workers=3) == {
+				"SW1A 1AA": Region.London,
+				"sw1a1aa": Region.London,
+				"CB1 1AA": Region.Eastern,
+				"EH1 1AA": Region.SouthScotland,
+				"XX1 1AA": None,
+				"SW1P 3AA": Region.London,
+				}
+
+	assert sorted(fake.requests) == ["CB1 1AA", "EH1 1AA", "SW1A 1AA", "SW1P 3AA", "XX1 1AA"]
+	assert set(fake.requests.values()) == {1}
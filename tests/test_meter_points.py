@@ -1,5 +1,14 @@
+# stdlib
+import json
+from typing import Dict
+
+# 3rd party
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
 # this package
 from octo_api.api import OctoAPI
+from octo_api.cache import TTLCache
 from octo_api.utils import MeterPointDetails, Region
 
 
@@ -12,3 +21,66 @@ def test_get_meter_point_details(api: OctoAPI):
 			)
 
 	assert isinstance(api.get_meter_point_details("2000024512368"), MeterPointDetails)
+
+
+class FakeMeterPoints:
+	"""
+	Serves meter-point details for MPANs not ending in ``0``, counting the requests for each MPAN.
+	"""
+
+	def __init__(self):
+		self.requests: Dict[str, int] = {}
+
+	def __call__(self, request: Request) -> Response:
+		mpan = request.path.rstrip('/').rpartition('/')[2]
+		self.requests[mpan] = self.requests.get(mpan, 0) + 1
+
+		if mpan.endswith('0'):
+			return Response('{"detail": "Not found."}', status=404, content_type="application/json")
+
+		return Response(
+				json.dumps({"gsp": "_A", "mpan": mpan, "profile_class": int(mpan[-1])}),
+				content_type="application/json",
+				)
+
+
+def serve(httpserver: HTTPServer, prefix: str, fake: FakeMeterPoints, *mpans: str) -> str:
+	for mpan in mpans:
+		httpserver.expect_request(f"{prefix}/electricity-meter-points/{mpan}/").respond_with_handler(fake)
+	return httpserver.url_for(prefix)
+
+
+def test_meter_point_cache(httpserver: HTTPServer, prefix: str):
+	fake = FakeMeterPoints()
+	base_url = serve(httpserver, prefix, fake, "1400000000001")
+
+	with OctoAPI("token", base_url=base_url, meter_point_cache=TTLCache()) as api:
+		for _ in range(3):
+			details = api.get_meter_point_details("1400000000001")
+			assert details == MeterPointDetails("1400000000001", Region.Eastern, 1)
+
+	assert fake.requests == {"1400000000001": 1}
+
+
+def test_get_meter_point_details_many(httpserver: HTTPServer, prefix: str):
+	fake = FakeMeterPoints()
+	mpans = [f"14000000000{idx:02d}" for idx in range(1, 21)]
+	base_url = serve(httpserver, prefix, fake, *mpans)
+	cache: TTLCache[str, MeterPointDetails] = TTLCache()
+
+	with OctoAPI("token", base_url=base_url, meter_point_cache=cache) as api:
+		api.get_meter_point_details("1400000000001")
+
+		details = api.get_meter_point_details_many(mpans + mpans[::-1], max_workers=4)
+		assert list(details) == mpans
+		assert details["1400000000003"] == MeterPointDetails("1400000000003", Region.Eastern, 3)
+		assert details["1400000000010"] is None
+		assert [mpan for mpan, value in details.items() if value is None] == ["1400000000010", "1400000000020"]
+
+		# Every MPAN was requested exactly once, and found ones were cached.
+		assert set(fake.requests) == set(mpans)
+		assert set(fake.requests.values()) == {1}
+		assert len(cache) == 18
+
+		api.get_meter_point_details_many(mpans[:9])
+		assert set(fake.requests.values()) == {1}
@@ -0,0 +1,138 @@
+# 3rd party
+import pytest
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.consumption import Consumption
+from octo_api.pagination import PaginatedResponse
+
+
+def synthetic(api: OctoAPI, **kwargs) -> PaginatedResponse[Consumption]:
+	return api.get_consumption(
+			mpan="1000000000000",
+			serial_number="SYNTHETIC",
+			fuel="electricity",
+			page_size=10,
+			**kwargs,
+			)
+
+
+def test_page_count(api: OctoAPI):
+	consumption = synthetic(api)
+	assert len(consumption) == 95
+	assert consumption._page_size == 10
+	assert consumption._num_pages == 10
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 2, 4, 16])
+def test_concurrent_iteration(api: OctoAPI, max_workers: int):
+	expected = list(synthetic(api))
+	assert len(expected) == 95
+
+	consumption = synthetic(api, max_workers=max_workers)
+	assert list(consumption) == expected
+	assert set(consumption._pages) == set(range(1, 11))
+
+	# The pages have been retained, so a second iteration does not need the network.
+	assert list(consumption) == expected
+
+
+def test_concurrent_iteration_in_order(api: OctoAPI):
+	consumption = synthetic(api, max_workers=4)
+	interval_starts = [reading.interval_start for reading in consumption]
+	assert interval_starts == sorted(interval_starts, reverse=True)
+
+
+def test_concurrent_iteration_partial(api: OctoAPI):
+	consumption = synthetic(api, max_workers=4)
+
+	for idx, _ in enumerate(consumption):
+		if idx == 25:
+			break
+
+	# The remaining pages are fetched on the next iteration.
+	assert len(list(consumption)) == 95
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_iter_stream(api: OctoAPI, max_workers: int):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api, max_workers=max_workers)
+	assert list(consumption.iter_stream()) == expected
+	assert set(consumption._pages) == {1}
+
+	# Pages are fetched again on the next iteration.
+	assert list(consumption.iter_stream()) == expected
+	assert set(consumption._pages) == {1}
+
+
+def test_stream(api: OctoAPI):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api, stream=True)
+	assert list(consumption) == expected
+	assert set(consumption._pages) == {1}
+
+
+def test_getitem_fetches_single_page(api: OctoAPI):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api)
+	assert consumption[92] == expected[92]
+	assert set(consumption._pages) == {1, 10}
+
+	assert consumption[45] == expected[45]
+	assert set(consumption._pages) == {1, 5, 10}
+
+	# The gaps are filled in when iterating.
+	assert list(consumption) == expected
+	assert set(consumption._pages) == set(range(1, 11))
+
+
+def test_getitem_negative(api: OctoAPI):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api)
+	assert consumption[-1] == expected[-1]
+	assert consumption[-95] == expected[0]
+	assert set(consumption._pages) == {1, 10}
+
+	with pytest.raises(IndexError, match="index out of range"):
+		consumption[-96]
+
+
+@pytest.mark.parametrize(
+		"item",
+		[
+				slice(None),
+				slice(5, 15),
+				slice(15, 5),
+				slice(None, 25),
+				slice(80, None),
+				slice(-12, -2),
+				slice(-2, None),
+				slice(None, None, -1),
+				slice(90, 10, -7),
+				slice(3, 94, 30),
+				slice(100, 200),
+				slice(-200, 3),
+				]
+		)
+def test_slicing(api: OctoAPI, item: slice):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api)
+	assert consumption[item] == expected[item]
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_slicing_fetches_only_needed_pages(api: OctoAPI, max_workers: int):
+	expected = list(synthetic(api))
+
+	consumption = synthetic(api, max_workers=max_workers)
+	assert consumption[52:71] == expected[52:71]
+	assert set(consumption._pages) == {1, 6, 7, 8}
+
+	assert consumption[5:95:40] == expected[5:95:40]
+	assert set(consumption._pages) == {1, 5, 6, 7, 8, 9}
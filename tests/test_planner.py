@@ -0,0 +1,137 @@
+# stdlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+# 3rd party
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+# this package
+import octo_api.planner
+from octo_api.api import OctoAPI
+from octo_api.consumption import Consumption, ConsumptionRow
+from octo_api.planner import QueryPlanner, split_period
+from octo_api.products import RateInfo
+from octo_api.utils import RateType, from_iso_zulu
+from tests.conftest import paginated_response, zulu
+
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+HALF_HOUR = timedelta(minutes=30)
+
+
+class FakeEndpoint:
+	"""
+	Serves half-hourly results between ``period_from`` and ``period_to``, most recent first,
+	recording the range of each request.
+	"""  # noqa: D400
+
+	def __init__(self, count: int, make_result, inclusive: bool):
+		self.results = [make_result(START + idx * HALF_HOUR) for idx in range(count)]
+		self.inclusive = inclusive
+		self.requests: List[Tuple[datetime, datetime]] = []
+
+	def __call__(self, request: Request) -> Response:
+		period_from = from_iso_zulu(request.args["period_from"])
+		period_to = from_iso_zulu(request.args["period_to"])
+		assert period_from is not None and period_to is not None
+		self.requests.append((period_from, period_to))
+
+		results = [result for result in reversed(self.results) if self.in_range(result, period_from, period_to)]
+		assert len(results) <= int(request.args["page_size"])
+
+		return paginated_response(results)
+
+	def in_range(self, result: Dict[str, Any], period_from: datetime, period_to: datetime) -> bool:
+		start = from_iso_zulu(result.get("interval_start", result.get("valid_from")))
+		assert start is not None
+
+		if self.inclusive:
+			return period_from <= start <= period_to
+		else:
+			return period_from <= start < period_to
+
+
+def consumption(start: datetime):
+	return {"consumption": 0.5, "interval_start": zulu(start), "interval_end": zulu(start + HALF_HOUR)}
+
+
+def unit_rate(start: datetime):
+	return {
+			"value_exc_vat": 10.0,
+			"value_inc_vat": 10.5,
+			"valid_from": zulu(start),
+			"valid_to": zulu(start + HALF_HOUR),
+			}
+
+
+def test_split_period():
+	assert split_period(START, START, HALF_HOUR, 10) == []
+	assert split_period(START, START + HALF_HOUR, HALF_HOUR, 10) == [(START, START + HALF_HOUR)]
+
+	ranges = split_period(START, START + 20 * HALF_HOUR, HALF_HOUR, 10)
+	assert ranges == [
+			(START, START + 8 * HALF_HOUR),
+			(START + 8 * HALF_HOUR, START + 16 * HALF_HOUR),
+			(START + 16 * HALF_HOUR, START + 20 * HALF_HOUR),
+			]
+
+	with pytest.raises(ValueError, match="'max_items' must be at least 3"):
+		split_period(START, START + HALF_HOUR, HALF_HOUR, 2)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("rows, row_type", [("object", Consumption), ("tuple", ConsumptionRow), ("dict", dict)])
+def test_consumption(httpserver: HTTPServer, prefix: str, monkeypatch, max_workers: int, rows, row_type):
+	fake = FakeEndpoint(100, consumption, inclusive=True)
+	url = f"{prefix}/electricity-meter-points/1200000000000/meters/PLANNER/consumption/"
+	httpserver.expect_request(url).respond_with_handler(fake)
+	monkeypatch.setattr(octo_api.planner, "_MAX_CONSUMPTION_PAGE", 12)
+
+	with OctoAPI("token", base_url=httpserver.url_for(prefix)) as api:
+		planner = QueryPlanner(api, max_workers=max_workers)
+		results = planner.get_consumption(
+				"1200000000000",
+				"PLANNER",
+				"electricity",
+				period_from=START,
+				period_to=START + 99 * HALF_HOUR,
+				rows=rows,
+				)
+
+	assert len(fake.requests) == 10
+	assert len(results) == 100
+	assert all(isinstance(result, row_type) for result in results)
+
+	if rows == "dict":
+		assert results == fake.results
+	else:
+		first = results[0]
+		assert (first.consumption, first.interval_start, first.interval_end) == (0.5, START, START + HALF_HOUR)
+		assert [r.interval_start for r in results] == [START + idx * HALF_HOUR for idx in range(100)]
+
+
+def test_tariff_charges(httpserver: HTTPServer, prefix: str, monkeypatch):
+	fake = FakeEndpoint(100, unit_rate, inclusive=False)
+	httpserver.expect_request(
+			f"{prefix}/products/PLANNER/electricity-tariffs/E-1R-PLANNER-A/standard-unit-rates/"
+			).respond_with_handler(fake)
+	monkeypatch.setattr(octo_api.planner, "_MAX_TARIFF_CHARGES_PAGE", 22)
+
+	with OctoAPI("token", base_url=httpserver.url_for(prefix)) as api:
+		results = QueryPlanner(api).get_tariff_charges(
+				"PLANNER",
+				"E-1R-PLANNER-A",
+				"electricity",
+				RateType.StandardUnitRate,
+				period_from=START,
+				period_to=START + 100 * HALF_HOUR,
+				)
+
+	assert len(fake.requests) == 5
+	assert results == [RateInfo(**result) for result in fake.results]
+
+
+def test_unknown_grouping(api: OctoAPI):
+	with pytest.raises(ValueError, match="Unknown grouping 'fortnight'"):
+		QueryPlanner(api).get_consumption("1", "2", "gas", START, group_by="fortnight")
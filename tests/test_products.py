@@ -1,14 +1,30 @@
 # stdlib
 import json
-from typing import Dict
+import pathlib
+import pickle
+from typing import Dict, Type
 
 # 3rd party
+import attr
+import pytest
 from coincidence.regressions import AdvancedFileRegressionFixture
 
 # this package
 from octo_api.api import OctoAPI
 from octo_api.pagination import PaginatedResponse
-from octo_api.products import DetailedProduct, Product, RegionalTariffs, Tariff, _parse_tariffs
+from octo_api.consumption import Consumption
+from octo_api.products import (
+		DetailedProduct,
+		Product,
+		Quote,
+		RateInfo,
+		RegionalQuotes,
+		RegionalTariffs,
+		Tariff,
+		_parse_quotes,
+		_parse_tariffs
+		)
+from octo_api.utils import Region
 
 
 def test_get_products(api: OctoAPI):
@@ -138,3 +154,112 @@ def test_parse_tariffs(advanced_file_regression: AdvancedFileRegressionFixture,
 
 	assert repr(_parse_tariffs(single_register_electricity_tariffs)) == str(tariffs)
 	assert repr(_parse_tariffs(single_register_electricity_tariffs)) == repr(tariffs)
+
+
+@pytest.mark.parametrize(
+		"obj_type, filename",
+		[
+				(Product, "products_business_false.json"),
+				(Product, "products_green.json"),
+				(RateInfo, "agile_unit_rates.json"),
+				(RateInfo, "standard_unit_rates.json"),
+				(Consumption, "consumption.json"),
+				(Consumption, "consumption_weekly.json"),
+				]
+		)
+def test_from_rows(obj_type: Type, filename: str):
+	rows = json.loads((pathlib.Path(__file__).parent / "responses" / filename).read_text())["results"]
+
+	objects = obj_type._from_rows(rows)
+	expected = [obj_type(**row) for row in rows]
+	assert objects == expected
+
+	for obj, expected_obj in zip(objects, expected):
+		assert type(obj) is obj_type
+		assert attr.astuple(obj, recurse=False) == attr.astuple(expected_obj, recurse=False)
+
+		with pytest.raises(attr.exceptions.FrozenInstanceError):
+			obj.links = []
+
+
+def test_regional_tariffs_lazy(datadir):  # noqa: MAN001
+	raw = json.loads((datadir / "single_register_electricity_tariffs.json").read_text())
+	tariffs = _parse_tariffs(raw)
+
+	assert len(tariffs) == 14
+	assert str(tariffs) == "RegionalTariffs(['direct_debit_monthly'])"
+	assert not any(isinstance(value, dict) for value in dict.values(tariffs))
+
+	# Only the region which is accessed is parsed, and it is only parsed once.
+	tariff = tariffs["_A"]["direct_debit_monthly"]
+	assert tariff == Tariff(**raw["_A"]["direct_debit_monthly"])
+	assert tariffs["_A"]["direct_debit_monthly"] is tariff
+	assert sum(isinstance(value, dict) for value in dict.values(tariffs)) == 1
+
+	assert tariffs.get("_Z") is None
+	assert tariffs.get("_C") == {"direct_debit_monthly": Tariff(**raw["_C"]["direct_debit_monthly"])}
+
+	expected = {gsp: {"direct_debit_monthly": Tariff(**value["direct_debit_monthly"])} for gsp, value in raw.items()}
+	assert dict(tariffs) == expected
+	assert {**tariffs.copy()} == expected
+	assert dict(tariffs.items()) == expected
+	assert list(tariffs.values()) == list(expected.values())
+	assert tariffs == _parse_tariffs(raw)
+	assert tariffs != {}
+
+	unpickled = pickle.loads(pickle.dumps(_parse_tariffs(raw)))  # nosec: B301
+	assert isinstance(unpickled, RegionalTariffs)
+	assert unpickled == expected
+
+	assert tariffs.pop("_A") == expected["_A"]
+	assert "_A" not in tariffs
+
+	last = list(expected)[-1]
+	assert tariffs.popitem() == (last, expected[last])
+	assert last not in tariffs
+
+	with pytest.raises(KeyError, match="popitem"):
+		RegionalTariffs().popitem()
+
+
+def test_regional_quotes_lazy(datadir):  # noqa: MAN001
+	raw = json.loads((datadir / "get_product_info_sample_quotes.json").read_text())
+	quotes = _parse_quotes(raw)
+
+	assert isinstance(quotes, RegionalQuotes)
+	assert str(quotes).startswith("RegionalQuotes([dual_fuel_dual_rate, ")
+
+	quote = quotes["_A"]["direct_debit_monthly"]["electricity_single_rate"]
+	assert quote == Quote(**raw["_A"]["direct_debit_monthly"]["electricity_single_rate"])
+	assert sum(isinstance(value, dict) for value in dict.values(quotes)) == 1
+
+
+def test_links_round_trip(api: OctoAPI):
+	product = api.get_products()[0]
+	raw = json.loads((pathlib.Path(__file__).parent / "responses" / "products_business_false.json").read_text())
+
+	assert product.links == raw["results"][0]["links"]
+
+	# to_dict and from_dict are added by attr_utils' @serde decorator, which mypy cannot see.
+	data = json.loads(json.dumps(product.to_dict(), default=str))  # type: ignore[attr-defined]
+	assert Product.from_dict(data).links == product.links  # type: ignore[attr-defined]
+
+
+def test_compact_tariffs(datadir):  # noqa: MAN001
+	raw = json.loads((datadir / "single_register_electricity_tariffs.json").read_text())
+	tariffs = _parse_tariffs(raw)
+
+	assert all(isinstance(gsp, Region) for gsp in tariffs)
+	assert tariffs[Region.Eastern] is tariffs["_A"]
+	assert str(next(iter(tariffs))) == "_A"
+
+	eastern = tariffs[Region.Eastern]["direct_debit_monthly"]
+	london = tariffs[Region.London]["direct_debit_monthly"]
+
+	assert eastern.links == raw["_A"]["direct_debit_monthly"]["links"]
+	assert eastern.links[0]["rel"] is london.links[0]["rel"]
+	assert eastern.links[0]["method"] is london.links[0]["method"]
+
+	# Unrecognised regions are kept as strings.
+	assert list(_parse_tariffs({"_Z": {}})) == ["_Z"]
+	assert not isinstance(next(iter(_parse_tariffs({"_Z": {}}))), Region)
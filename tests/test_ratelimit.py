@@ -0,0 +1,136 @@
+# stdlib
+import asyncio
+import time
+from email.utils import formatdate
+
+# 3rd party
+import pytest
+from apeye.slumber_url import HttpServerError
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.ratelimit import RateLimiter
+from octo_api.utils import MeterPointDetails, Region
+from tests.conftest import run_async
+
+
+class Flaky:
+	"""
+	Responds with each of the given statuses in turn, then with a meter point.
+	"""
+
+	def __init__(self, *statuses: int, retry_after: str = ''):
+		self.statuses = list(statuses)
+		self.retry_after = retry_after
+		self.calls = 0
+
+	def __call__(self, request: Request) -> Response:
+		self.calls += 1
+
+		if self.statuses:
+			headers = {"Retry-After": self.retry_after} if self.retry_after else {}
+			return Response("{}", status=self.statuses.pop(0), headers=headers, content_type="application/json")
+
+		return Response(
+				'{"gsp": "_A", "mpan": "1300000000000", "profile_class": 1}',
+				content_type="application/json",
+				)
+
+
+EXPECTED = MeterPointDetails(mpan="1300000000000", gsp=Region.Eastern, profile_class=1)
+
+
+def test_token_bucket():
+	limiter = RateLimiter(rate=50, burst=2)
+	assert limiter.burst == 2
+	assert RateLimiter(rate=2.5).burst == 3
+
+	start = time.perf_counter()
+	for _ in range(7):
+		limiter.acquire()
+
+	# The first two are immediate, then the remaining five are paced at 50 per second.
+	assert time.perf_counter() - start >= 0.09
+
+
+def test_token_bucket_async():
+	limiter = RateLimiter(rate=50, burst=1)
+
+	async def main():
+		start = time.perf_counter()
+		await asyncio.gather(*(limiter.acquire_async() for _ in range(6)))
+		return time.perf_counter() - start
+
+	assert run_async(main()) >= 0.09
+
+
+def test_retry_delay():
+	limiter = RateLimiter(backoff_factor=1, max_backoff=5)
+
+	assert limiter.retry_delay(0, "2") == 2
+	assert limiter._reserve() > 1
+
+	assert 0 <= limiter.retry_delay(1) <= 2
+	assert all(0 <= limiter.retry_delay(10) <= 5 for _ in range(20))
+	assert 0 <= limiter.retry_delay(0, "not a date") <= 1
+
+	assert 8 < RateLimiter().retry_delay(0, formatdate(time.time() + 10, usegmt=True)) <= 10
+	assert RateLimiter().retry_delay(0, formatdate(time.time() - 10, usegmt=True)) == 0
+
+
+def test_should_retry():
+	limiter = RateLimiter(max_retries=2)
+	assert limiter.should_retry(0)
+	assert limiter.should_retry(0, 429)
+	assert limiter.should_retry(1, 503)
+	assert not limiter.should_retry(2, 503)
+	assert not limiter.should_retry(0, 404)
+
+	with pytest.raises(ValueError, match="'rate' must be greater than zero"):
+		RateLimiter(rate=0)
+
+
+@pytest.mark.parametrize("statuses", [(429, ), (503, 502)])
+def test_retried(httpserver: HTTPServer, statuses):
+	flaky = Flaky(*statuses, retry_after='0')
+	mpan = f"13000000000{len(statuses):02d}"
+	httpserver.expect_request(f"/v1/electricity-meter-points/{mpan}/").respond_with_handler(flaky)
+
+	limiter = RateLimiter(backoff_factor=0)
+	with OctoAPI("token", base_url=httpserver.url_for("/v1"), rate_limiter=limiter) as api:
+		assert api.session.rate_limiter is limiter
+		assert api.get_meter_point_details(mpan) == EXPECTED
+
+	assert flaky.calls == len(statuses) + 1
+
+
+def test_retries_exhausted(httpserver: HTTPServer):
+	flaky = Flaky(503, 503, 503)
+	httpserver.expect_request("/v1/electricity-meter-points/1300000000099/").respond_with_handler(flaky)
+
+	limiter = RateLimiter(max_retries=2, backoff_factor=0)
+	with OctoAPI("token", base_url=httpserver.url_for("/v1"), rate_limiter=limiter) as api:
+		with pytest.raises(HttpServerError):
+			api.get_meter_point_details("1300000000099")
+
+	assert flaky.calls == 3
+
+
+def test_async_retried(httpserver: HTTPServer):
+	pytest.importorskip("aiohttp")
+
+	# this package
+	from octo_api.async_api import AsyncOctoAPI
+
+	flaky = Flaky(429, 500, retry_after='0')
+	httpserver.expect_request("/v1/electricity-meter-points/1300000000000/").respond_with_handler(flaky)
+
+	async def main():
+		limiter = RateLimiter(backoff_factor=0)
+		async with AsyncOctoAPI("token", base_url=httpserver.url_for("/v1"), rate_limiter=limiter) as api:
+			return await api.get_meter_point_details("1300000000000")
+
+	assert run_async(main()) == EXPECTED
+	assert flaky.calls == 3
@@ -0,0 +1,50 @@
+# stdlib
+import gzip
+import json
+
+# 3rd party
+from pytest_httpserver import HTTPServer
+from requests.adapters import HTTPAdapter
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.session import OctoSession
+from octo_api.utils import MeterPointDetails, Region
+
+
+def test_session_shared(api: OctoAPI):
+	assert isinstance(api.session, OctoSession)
+	assert api.API_BASE.session is api.session
+	assert (api.API_BASE / "products" / "VAR-17-01-11").session is api.session
+
+	consumption = api.get_consumption("1000000000000", "SYNTHETIC", fuel="electricity", page_size=10)
+	assert consumption.query_url.session is api.session
+
+
+def test_pool_configuration():
+	with OctoAPI("token", pool_connections=2, pool_maxsize=32) as api:
+		adapter = api.session.get_adapter("https://api.octopus.energy/v1/")
+		assert isinstance(adapter, HTTPAdapter)
+		assert api.session.pool_connections == 2
+		assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+		assert adapter.poolmanager.connection_pool_kw["block"] is False
+
+		assert "gzip" in api.session.headers["Accept-Encoding"]
+		assert "deflate" in api.session.headers["Accept-Encoding"]
+		assert api.session.headers["Connection"] == "keep-alive"
+
+
+def test_compressed_response(httpserver: HTTPServer):
+	body = gzip.compress(json.dumps({"gsp": "_M", "mpan": "1900000000000", "profile_class": 3}).encode("UTF-8"))
+	httpserver.expect_request("/v1/electricity-meter-points/1900000000000/").respond_with_data(
+			body,
+			headers={"Content-Encoding": "gzip"},
+			content_type="application/json",
+			)
+
+	with OctoAPI("token", base_url=httpserver.url_for("/v1")) as api:
+		assert api.get_meter_point_details("1900000000000") == MeterPointDetails(
+				mpan="1900000000000",
+				gsp=Region.Yorkshire,
+				profile_class=3,
+				)
@@ -0,0 +1,113 @@
+# stdlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+# 3rd party
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.consumption import Consumption, ConsumptionRow, Meter
+from octo_api.sync import ConsumptionStore, ConsumptionSync
+from octo_api.utils import from_iso_zulu
+from tests.conftest import paginated_response, zulu
+
+METER = Meter("1100000000000", "SYNC", "electricity")
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+HALF_HOUR = timedelta(minutes=30)
+
+
+class FakeMeter:
+	"""
+	Serves consumption for a meter, recording the ``period_from`` of each request.
+	"""
+
+	def __init__(self, count: int):
+		self.readings: Dict[datetime, float] = {START + idx * HALF_HOUR: 0.1 for idx in range(count)}
+		self.requested_from: List[Optional[str]] = []
+
+	def __call__(self, request: Request) -> Response:
+		period_from = request.args.get("period_from")
+		self.requested_from.append(period_from)
+		assert request.args["order_by"] == "period"
+		since = from_iso_zulu(period_from)
+
+		results = [{
+				"consumption": value,
+				"interval_start": zulu(start),
+				"interval_end": zulu(start + HALF_HOUR),
+				} for start, value in sorted(self.readings.items())
+					if since is None or start >= since]
+
+		return paginated_response(results)
+
+
+def test_sync(httpserver: HTTPServer, prefix: str):
+	fake = FakeMeter(48)
+	url = f"{prefix}/electricity-meter-points/1100000000000/meters/SYNC/consumption/"
+	httpserver.expect_request(url).respond_with_handler(fake)
+
+	with OctoAPI("token", base_url=httpserver.url_for(prefix)) as api, ConsumptionStore() as store:
+		sync = ConsumptionSync(api, store, lookback=timedelta(hours=2))
+
+		assert store.latest(METER) is None
+		assert sync.sync(METER) == 48
+		assert fake.requested_from == [None]
+		assert store.latest(METER) == START + 48 * HALF_HOUR
+		assert len(store) == 48
+
+		# Nothing new; only the look-back window is requested, and nothing changes.
+		assert sync.sync(METER) == 0
+		assert fake.requested_from[-1] == (START + 44 * HALF_HOUR).isoformat()
+
+		# New readings arrive, along with a late correction inside the look-back window.
+		fake.readings[START + 46 * HALF_HOUR] = 0.5
+		fake.readings[START + 48 * HALF_HOUR] = 0.2
+		fake.readings[START + 49 * HALF_HOUR] = 0.3
+		assert sync.sync_all([METER]) == {METER: 3}
+		assert len(store) == 50
+
+		readings = store.get_consumption(METER, period_from=START + 46 * HALF_HOUR)
+		assert [r.consumption for r in readings] == [0.5, 0.1, 0.2, 0.3]
+		assert all(isinstance(r, Consumption) for r in readings)
+		assert readings[0].interval_start == START + 46 * HALF_HOUR
+		assert readings[-1].interval_end == START + 50 * HALF_HOUR
+
+		assert store.meters() == [METER]
+
+
+def test_store(tmp_path):
+	other = Meter("1100000000000", "OTHER", "electricity")
+	readings = [
+			ConsumptionRow(0.1, START, START + HALF_HOUR),
+			ConsumptionRow(0.2, START + HALF_HOUR, START + 2 * HALF_HOUR),
+			]
+
+	with ConsumptionStore(tmp_path / "consumption.db") as store:
+		assert store.merge(METER, readings) == 2
+		assert store.merge(METER, readings) == 0
+		assert store.merge(other, readings[:1]) == 1
+
+	with ConsumptionStore(tmp_path / "consumption.db") as store:
+		assert len(store) == 3
+		assert sorted(store.meters()) == sorted([METER, other])
+		assert store.latest(other) == START + HALF_HOUR
+		assert store.get_consumption(METER, period_to=START + HALF_HOUR) == [Consumption(0.1, START, START + HALF_HOUR)]
+		assert store.get_consumption(Meter("1", "2", "gas")) == []
+
+
+def test_merge_reads_before_locking():
+	store = ConsumptionStore()
+
+	def readings() -> Iterator[ConsumptionRow]:
+		# The store must stay usable by other threads while the readings are being downloaded.
+		thread = threading.Thread(target=store.latest, args=(METER, ), daemon=True)
+		thread.start()
+		thread.join(timeout=5)
+		assert not thread.is_alive()
+
+		yield ConsumptionRow(0.1, START, START + HALF_HOUR)
+
+	assert store.merge(METER, readings()) == 1
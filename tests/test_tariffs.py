@@ -6,8 +6,8 @@ import pytest
 
 # this package
 from octo_api.api import OctoAPI
-from octo_api.products import RateInfo
-from octo_api.utils import RateType
+from octo_api.products import RateInfo, RateInfoRow
+from octo_api.utils import RateType, TariffCode
 
 
 def test_get_tariff_charges(api: OctoAPI):
@@ -69,6 +69,17 @@ def test_get_tariff_charges(api: OctoAPI):
 				)
 
 
+def test_get_tariff_charges_tariff_code(api: OctoAPI):
+	tariff_code = TariffCode.parse("E-1R-VAR-17-01-11-A")
+	charges = api.get_tariff_charges(
+			product_code=tariff_code.product_code,
+			tariff_code=tariff_code,
+			fuel=tariff_code.fuel,
+			rate_type=RateType.StandardUnitRate,
+			)
+	assert len(charges) == 6
+
+
 def test_get_agile_tariff_charges(api: OctoAPI):
 	charges = api.get_tariff_charges(
 			product_code="AGILE-18-02-21",
@@ -78,11 +89,42 @@ def test_get_agile_tariff_charges(api: OctoAPI):
 			)
 
 	assert len(charges) == 65611
-	assert len(charges._results) == 100
+	assert set(charges._pages) == {1}
 	assert charges[100] == RateInfo(
 			value_exc_vat=9.76,
 			value_inc_vat=10.248,
 			valid_from=datetime(2020, 9, 26, 19, 30, tzinfo=timezone.utc),
 			valid_to=datetime(2020, 9, 26, 20, 0, tzinfo=timezone.utc),
 			)
-	assert len(charges._results) == 200
+	assert set(charges._pages) == {1, 2}
+
+
+def test_get_tariff_charges_rows(api: OctoAPI):
+	kwargs = dict(
+			product_code="VAR-17-01-11",
+			tariff_code="E-1R-VAR-17-01-11-A",
+			fuel="electricity",
+			rate_type=RateType.StandardUnitRate,
+			)
+
+	assert api.get_tariff_charges(**kwargs, rows="tuple")[:2] == [  # type: ignore[call-overload]
+			RateInfoRow(
+					value_exc_vat=15.51,
+					value_inc_vat=16.2855,
+					valid_from=datetime(2020, 11, 1, tzinfo=timezone.utc),
+					valid_to=None,
+					),
+			RateInfoRow(
+					value_exc_vat=14.78,
+					value_inc_vat=15.519,
+					valid_from=datetime(2020, 1, 15, tzinfo=timezone.utc),
+					valid_to=datetime(2020, 11, 1, tzinfo=timezone.utc),
+					),
+			]
+
+	assert api.get_tariff_charges(**kwargs, rows="dict")[1] == {  # type: ignore[call-overload]
+			"value_exc_vat": 14.78,
+			"value_inc_vat": 15.519,
+			"valid_from": "2020-01-15T00:00:00Z",
+			"valid_to": "2020-11-01T00:00:00Z",
+			}
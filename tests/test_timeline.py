@@ -0,0 +1,126 @@
+# stdlib
+import math
+from datetime import datetime, timedelta, timezone
+
+# 3rd party
+import pytest
+
+# this package
+from octo_api.api import OctoAPI
+from octo_api.products import RateInfo, RateInfoRow
+from octo_api.timeline import RateTimeline
+from octo_api.utils import RateType
+
+START = datetime(2021, 1, 1, tzinfo=timezone.utc)
+HALF_HOUR = timedelta(minutes=30)
+
+
+def at(half_hours: float) -> datetime:
+	return START + half_hours * HALF_HOUR
+
+
+RATES = [
+		# An open-ended rate, superseded by a later one which is itself interrupted by a temporary rate.
+		RateInfoRow(10.0, 10.5, at(0), None),
+		RateInfoRow(20.0, 21.0, at(2), None),
+		RateInfoRow(5.0, 5.25, at(4), at(6)),
+		# A rate after a gap, which ends.
+		RateInfoRow(1.0, 1.05, at(-4), at(-2)),
+		]
+
+
+def test_segments():
+	timeline = RateTimeline(reversed(RATES))
+
+	assert list(timeline.starts) == [at(n).timestamp() for n in (-4, -2, 0, 2, 4, 6)]
+	assert list(timeline) == [
+			RateInfoRow(1.0, 1.05, at(-4), at(-2)),
+			RateInfoRow(10.0, 10.5, at(0), at(2)),
+			RateInfoRow(20.0, 21.0, at(2), at(4)),
+			RateInfoRow(5.0, 5.25, at(4), at(6)),
+			RateInfoRow(20.0, 21.0, at(6), None),
+			]
+	assert len(timeline) == 5
+	assert repr(timeline) == "<RateTimeline of 5 rates>"
+
+
+def test_rate_at():
+	timeline = RateTimeline(RATES)
+
+	assert timeline.rate_at(at(-5)) is None
+	assert timeline.rate_at(at(-4)) == RateInfoRow(1.0, 1.05, at(-4), at(-2))
+	assert timeline.rate_at(at(-1)) is None
+
+	for when, expected in [(at(0), 10), (at(1.5), 10), (at(5), 5)]:
+		rate = timeline.rate_at(when)
+		assert rate is not None
+		assert rate.value_exc_vat == expected
+		assert rate.value_inc_vat == expected * 1.05
+
+	assert timeline.rate_at(at(1000)) == RateInfoRow(20.0, 21.0, at(6), None)
+
+	# Naive datetimes are UTC, and Unix timestamps are accepted.
+	rate = timeline.rate_at(at(4).replace(tzinfo=None))
+	assert rate is not None
+	assert rate.value_exc_vat == 5
+
+	rate = timeline.rate_at(at(4).timestamp())
+	assert rate is not None
+	assert rate.value_exc_vat == 5
+
+
+def test_open_start(engine):
+	earliest = datetime.min.replace(tzinfo=timezone.utc)
+	timeline = RateTimeline([RateInfo(20, 21, None, None), RateInfoRow(5.0, 5.25, at(0), at(2))])
+
+	assert timeline.rate_at(at(-1000)) == RateInfoRow(20, 21, earliest, at(0))
+	assert timeline.rate_at(at(1)) == RateInfoRow(5.0, 5.25, at(0), at(2))
+	assert timeline.rate_at(at(2)) == RateInfoRow(20, 21, at(2), None)
+	assert list(timeline.rates_at([at(-1000), at(1), at(3)])[0]) == [20, 5, 20]
+	assert timeline.between(at(-2), at(1))[0].valid_from == earliest
+
+
+def test_rates_at(engine):
+	timeline = RateTimeline(RATES)
+	instants = [at(n) for n in (5, -5, -3, 0, 2.5, 7, -1)]
+
+	values_exc, values_inc = timeline.rates_at(instants)
+	assert [None if math.isnan(v) else v for v in values_exc] == [5, None, 1, 10, 20, 20, None]
+	assert list(values_inc)[3:6] == [10.5, 21, 21]
+
+	assert list(timeline.rates_at([])[0]) == []
+	assert all(map(math.isnan, RateTimeline([]).rates_at(instants)[1]))
+
+
+def test_rates_at_numpy():
+	numpy = pytest.importorskip("numpy")
+
+	timeline = RateTimeline(RATES)
+	values_exc, _ = timeline.rates_at(numpy.array([at(1).timestamp(), at(5).timestamp()]))
+	assert isinstance(values_exc, numpy.ndarray)
+	assert values_exc.tolist() == [10, 5]
+
+
+def test_between():
+	timeline = RateTimeline(RATES)
+
+	assert [rate.value_exc_vat for rate in timeline.between(at(1), at(5))] == [10, 20, 5]
+	assert [rate.value_exc_vat for rate in timeline.between(at(2), at(4))] == [20]
+	assert [rate.value_exc_vat for rate in timeline.between(at(-10), at(1))] == [1, 10]
+	assert [rate.value_exc_vat for rate in timeline.between(at(5))] == [5, 20]
+	assert timeline.between(at(-10), at(-4)) == []
+
+
+def test_from_api(api: OctoAPI):
+	unit_rates = api.get_tariff_charges(
+			"VAR-17-01-11",
+			"E-1R-VAR-17-01-11-A",
+			fuel="electricity",
+			rate_type=RateType.StandardUnitRate,
+			)
+	timeline = RateTimeline(unit_rates)
+
+	for rate in unit_rates:
+		found = timeline.rate_at(rate.valid_from)
+		assert found is not None
+		assert found.value_inc_vat == rate.value_inc_vat
@@ -0,0 +1,92 @@
+# stdlib
+from datetime import datetime, timezone
+
+# 3rd party
+import pytest
+
+# this package
+from octo_api.utils import Region, TariffCode, bst, from_iso_zulu, parse_iso_zulu_batch
+
+
+@pytest.mark.parametrize(
+		"value, expected",
+		[
+				("2020-09-30T14:30:00Z", datetime(2020, 9, 30, 14, 30, tzinfo=timezone.utc)),
+				("2020-09-30T14:30:00+00:00", datetime(2020, 9, 30, 14, 30, tzinfo=timezone.utc)),
+				("2020-09-30T14:30:00+01:00", datetime(2020, 9, 30, 14, 30, tzinfo=bst)),
+				("2020-10-26T11:15:17.208285Z", datetime(2020, 10, 26, 11, 15, 17, 208285, tzinfo=timezone.utc)),
+				(None, None),
+				]
+		)
+def test_from_iso_zulu(value: str, expected: datetime):
+	assert from_iso_zulu(value) == expected
+
+
+def test_from_iso_zulu_datetime():
+	# Equal datetimes in different timezones must not be conflated.
+	utc_value = datetime(2020, 9, 30, 13, 30, tzinfo=timezone.utc)
+	bst_value = datetime(2020, 9, 30, 14, 30, tzinfo=bst)
+	assert from_iso_zulu(utc_value) is utc_value
+	assert from_iso_zulu(bst_value) is bst_value
+
+
+def test_parse_iso_zulu_batch():
+	timestamps = [
+			"2020-09-30T14:30:00Z",
+			"2020-09-30T15:00:00Z",
+			"2020-09-30T14:30:00Z",
+			"2020-09-30T16:00:00+01:00",
+			]
+	parsed = parse_iso_zulu_batch(timestamps)
+	assert parsed == [from_iso_zulu(timestamp) for timestamp in timestamps]
+
+	# Repeated timestamps share the same object
+	assert parsed[0] is parsed[2]
+
+	assert parse_iso_zulu_batch(timestamps, epoch=True) == [1601476200.0, 1601478000.0, 1601476200.0, 1601478000.0]
+	assert parse_iso_zulu_batch(iter(timestamps)) == parsed
+	assert parse_iso_zulu_batch([]) == []
+
+
+def test_parse_iso_zulu_batch_mixed():
+	bst_value = datetime(2020, 9, 30, 14, 30, tzinfo=bst)
+	timestamps = ["2020-09-30T14:30:00Z", None, bst_value]
+
+	assert parse_iso_zulu_batch(timestamps) == [datetime(2020, 9, 30, 14, 30, tzinfo=timezone.utc), None, bst_value]
+	assert parse_iso_zulu_batch(timestamps, epoch=True) == [1601476200.0, None, 1601472600.0]
+
+
+@pytest.mark.parametrize(
+		"code, expected",
+		[
+				("E-1R-VAR-17-01-11-A", TariffCode("electricity", 1, "VAR-17-01-11", Region.Eastern)),
+				("E-2R-AGILE-18-02-21-C", TariffCode("electricity", 2, "AGILE-18-02-21", Region.London)),
+				("G-1R-FIX-12M-20-09-21-P", TariffCode("gas", 1, "FIX-12M-20-09-21", Region.NorthScotland)),
+				]
+		)
+def test_tariff_code(code: str, expected: TariffCode):
+	assert TariffCode.parse(code) == expected
+	assert TariffCode.parse(code) is TariffCode.parse(code)
+	assert str(expected) == code
+
+
+def test_tariff_code_register_type():
+	assert TariffCode.parse("E-2R-VAR-17-01-11-A").register_type == "dual_register_electricity"
+	assert TariffCode.parse("G-1R-VAR-17-01-11-A").register_type == "single_register_gas"
+
+
+@pytest.mark.parametrize("code", ["VAR-17-01-11", "X-1R-VAR-17-01-11-A", "E-3R-VAR-17-01-11-A", "E-1R-A", "E-1R-VAR-a"])
+def test_tariff_code_invalid(code: str):
+	with pytest.raises(ValueError, match=f"Invalid tariff code '{code}'"):
+		TariffCode.parse(code)
+
+	with pytest.raises(ValueError, match="unknown region 'Z'"):
+		TariffCode.parse("E-1R-VAR-17-01-11-Z")
+
+
+def test_tariff_code_for_all_regions():
+	codes = TariffCode.for_all_regions("VAR-17-01-11", fuel="gas")
+	assert len(codes) == 14
+	assert str(codes[0]) == "G-1R-VAR-17-01-11-A"
+	assert str(codes[-1]) == "G-1R-VAR-17-01-11-P"
+	assert len({code.region for code in codes}) == 14